@@ -68,6 +68,24 @@ def create_app():
 
         return {"csrf_token": generate_csrf, "is_admin_user": is_admin_user}
 
+    # ----- Gemini gateway (client / thread pool ตัวเดียวต่อ process) -----
+    from app.services.llm_gateway import configure as configure_llm
+    configure_llm(app.config)
+
+    # ----- Scraper worker pool (import โมดูล scraper ไว้ล่วงหน้า) -----
+    if app.config.get("SCRAPER_MODE") == "worker":
+        from app.services.scrape_worker import get_worker_pool
+        get_worker_pool(app.config.get("SCRAPER_WORKERS", 4)).start(warm_up=True)
+
+    # ----- Search job queue worker (เธรดใน process เว็บ; opt-in — ปกติรัน scripts/search_worker.py แยก) -----
+    # debug reloader: process แม่แค่คอย restart ไม่ได้เสิร์ฟ request → ให้เฉพาะ process ลูกรัน worker
+    reloader_parent = (
+        os.getenv("FLASK_DEBUG", "").lower() in ("1", "true") and os.getenv("WERKZEUG_RUN_MAIN") != "true"
+    )
+    if app.config.get("SEARCH_INLINE_WORKER") and not reloader_parent:
+        from app.services.search_queue import get_search_worker
+        get_search_worker(app.config).start()
+
     # ----- Blueprints -----
     from app.routes.auth import bp as auth_bp
     app.register_blueprint(auth_bp, url_prefix="/auth")
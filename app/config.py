@@ -42,6 +42,69 @@ def load_config(app):
     app.config["SCRAPER_TIMEOUT_SEC"] = int(
         os.getenv("SCRAPER_TIMEOUT_SEC") or os.getenv("SCRAPER_TIMEOUT") or "480"
     )
+    # timeout ราย source (override ค่าด้านบน) เช่น "kaidee=300,carsome=240"
+    app.config["SCRAPER_SOURCE_TIMEOUTS"] = os.getenv("SCRAPER_SOURCE_TIMEOUTS", "")
+
+    # worker = รัน scraper ใน worker pool ของ process เว็บ (ไม่ spawn python ใหม่), subprocess = แบบเดิม
+    app.config["SCRAPER_MODE"] = os.getenv("SCRAPER_MODE", "worker").lower()
+    app.config["SCRAPER_WORKERS"] = int(os.getenv("SCRAPER_WORKERS", "4"))
+
+    # Chrome ที่เปิดค้างไว้ให้ worker ยืม (0 = ปิด, แต่ละงานเปิด/ปิด Chrome เองแบบเดิม)
+    # เปิดล่วงหน้าเฉพาะใน process ที่รัน SearchWorker (inline worker หรือ scripts/search_worker.py)
+    app.config["SCRAPER_DRIVER_POOL_SIZE"] = int(os.getenv("SCRAPER_DRIVER_POOL_SIZE", "2"))
+    app.config["SCRAPER_DRIVER_POOL_MAX"] = int(os.getenv("SCRAPER_DRIVER_POOL_MAX", "8"))
+    # ใช้ครบกี่งานแล้วปิดเปิดใหม่ (กัน memory leak ของ Chrome)
+    app.config["SCRAPER_DRIVER_MAX_USES"] = int(os.getenv("SCRAPER_DRIVER_MAX_USES", "20"))
+
+    # เปิดหน้าประกาศพร้อมกันกี่ browser ต่อ 1 เว็บ (แต่ละเว็บมี cap ของตัวเองใน DETAIL_MAX_CONCURRENCY)
+    app.config["SCRAPER_DETAIL_WORKERS"] = int(os.getenv("SCRAPER_DETAIL_WORKERS", "3"))
+
+    # auto = หน้าที่ server render (ดู FETCH_BACKENDS ในแต่ละ scraper) ดึงด้วย HTTP ก่อน, selenium = ใช้ Chrome ทุกหน้า
+    app.config["SCRAPER_FETCH_BACKEND"] = os.getenv("SCRAPER_FETCH_BACKEND", "auto").lower()
+
+    # จำนวน scraper ของเว็บเดียวกันที่รันพร้อมกันได้ (ต่อ worker process) เช่น "one2car=1,kaidee=3"
+    app.config["SCRAPER_SOURCE_CONCURRENCY"] = os.getenv("SCRAPER_SOURCE_CONCURRENCY", "")
+    app.config["SCRAPER_SOURCE_CONCURRENCY_DEFAULT"] = int(os.getenv("SCRAPER_SOURCE_CONCURRENCY_DEFAULT", "2"))
+
+    # true = ประกาศที่ชื่อ/ราคาบนหน้า list ไม่เปลี่ยนจากที่เก็บไว้ ไม่ต้องเปิดหน้า detail ซ้ำ (แค่ต่ออายุ)
+    app.config["SCRAPER_INCREMENTAL"] = os.getenv("SCRAPER_INCREMENTAL", "true").lower() == "true"
+
+    # cache ผล scrape ระดับ query (app/services/scrape_cache.py): อายุ run + ความกว้างช่วงงบที่ใช้ run ร่วมกันได้
+    app.config["SCRAPE_CACHE_TTL_SEC"] = int(os.getenv("SCRAPE_CACHE_TTL_SEC", "1800"))
+    app.config["SCRAPE_CACHE_PRICE_BUCKET"] = int(os.getenv("SCRAPE_CACHE_PRICE_BUCKET", "50000"))
+
+    # ===== Search job queue (app/services/search_queue.py) =====
+    # true = รัน worker เป็นเธรดใน process เว็บด้วย (dev / เครื่องเดียว), false = ใช้ python scripts/search_worker.py แยก
+    # ปิดเป็นค่าเริ่มต้น: ทุกสคริปต์ที่เรียก create_app (seed / topup / ...) จะได้ไม่ไปแย่งงานค้นหาของผู้ใช้แล้วจบกลางทาง
+    app.config["SEARCH_INLINE_WORKER"] = os.getenv("SEARCH_INLINE_WORKER", "false").lower() == "true"
+    # ค้นหาพร้อมกันได้กี่งานต่อ worker process
+    app.config["SEARCH_WORKER_CONCURRENCY"] = int(os.getenv("SEARCH_WORKER_CONCURRENCY", "2"))
+    app.config["SEARCH_JOB_MAX_ATTEMPTS"] = int(os.getenv("SEARCH_JOB_MAX_ATTEMPTS", "3"))
+    # retry ครั้งที่ n รอ backoff * 2^(n-1) วินาที
+    app.config["SEARCH_JOB_RETRY_BACKOFF_SEC"] = int(os.getenv("SEARCH_JOB_RETRY_BACKOFF_SEC", "30"))
+    # งาน running ที่ไม่มี heartbeat นานเกินนี้ถือว่า worker ตาย → ให้ worker อื่น claim ใหม่
+    app.config["SEARCH_JOB_STALE_SEC"] = int(os.getenv("SEARCH_JOB_STALE_SEC", "300"))
+
+    # ===== Gemini (app/services/llm_gateway.py) =====
+    # deadline ต่อคำขอของหน้าเว็บ + จำนวนคำขอพร้อมกันต่อ process
+    app.config["LLM_TIMEOUT_SEC"] = float(os.getenv("LLM_TIMEOUT_SEC", "20"))
+    app.config["LLM_MAX_CONCURRENCY"] = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+    # ===== รถแนะนำ (app/services/llm_select.py:pick_settings) =====
+    # cache คำตอบของ model ต่อชุดรถ/params/exclude (app/services/pick_cache.py)
+    app.config["PICK_CACHE_TTL_SEC"] = int(os.getenv("PICK_CACHE_TTL_SEC", str(24 * 3600)))
+    app.config["PICK_CACHE_MAX_ROWS"] = int(os.getenv("PICK_CACHE_MAX_ROWS", "20000"))
+    # งบ token ของตารางรถใน prompt (app/services/llm_prompt.py:encode_cars)
+    app.config["PROMPT_TOKEN_BUDGET"] = int(os.getenv("PROMPT_TOKEN_BUDGET", "2500"))
+    app.config["PROMPT_MAX_CARS"] = int(os.getenv("PROMPT_MAX_CARS", "40"))
+    # น้ำหนักคะแนนในเครื่อง (app/services/scoring.py) เช่น "budget=0.4,age=0.2" — key ที่ไม่ระบุใช้ค่าเริ่มต้น
+    app.config["SCORE_WEIGHTS"] = os.getenv("SCORE_WEIGHTS", "")
+    # pick chain (app/services/pick_chain.py): จำนวนคันที่ให้ model จัดอันดับล่วงหน้า
+    app.config["PICK_CHAIN_K"] = int(os.getenv("PICK_CHAIN_K", "5"))
+    # งานเบื้องหลังใน worker รอ model ได้นานกว่าหน้าเว็บ (LLM_TIMEOUT_SEC)
+    app.config["PICK_CHAIN_TIMEOUT_SEC"] = float(os.getenv("PICK_CHAIN_TIMEOUT_SEC", "60"))
+    # true = worker จัดอันดับทันทีที่งานค้นหาจบ (เสียค่า model ทุก session แม้ไม่มีใครขอ)
+    app.config["PICK_CHAIN_PRECOMPUTE"] = os.getenv("PICK_CHAIN_PRECOMPUTE", "false").lower() == "true"
 
     # Security Questions (เลือกได้จากดรอปดาวน์)
     app.config["SECURITY_QUESTIONS"] = [
@@ -27,6 +27,7 @@ import app.models.payment
 import app.models.user_package
 import app.models.car_cache
 import app.models.search      # ✅ ใช้ไฟล์นี้เท่านั้นสำหรับ SearchSession
+import app.models.pick_cache
 
 
 target_metadata = Base.metadata
@@ -0,0 +1,32 @@
+"""add car cache list fingerprint
+
+Revision ID: 2f6a8c1d3b90
+Revises: d04b7e5a9c61
+Create Date: 2026-10-17 16:32:05.418903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6a8c1d3b90'
+down_revision: Union[str, Sequence[str], None] = 'd04b7e5a9c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # แถวเดิมไม่มี fingerprint → รอบถัดไปเปิดหน้า detail ตามปกติแล้วค่อยได้ค่า
+    op.add_column('car_cache', sa.Column('list_fingerprint', sa.String(length=64), nullable=True))
+    op.add_column('car_cache', sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE car_cache SET last_seen_at = scraped_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('car_cache', 'last_seen_at')
+    op.drop_column('car_cache', 'list_fingerprint')
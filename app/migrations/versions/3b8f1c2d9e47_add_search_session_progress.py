@@ -0,0 +1,30 @@
+"""add search session progress
+
+Revision ID: 3b8f1c2d9e47
+Revises: c487ba733353
+Create Date: 2026-10-17 10:12:31.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f1c2d9e47'
+down_revision: Union[str, Sequence[str], None] = 'c487ba733353'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('search_sessions', sa.Column('progress_json', sa.JSON(), nullable=True))
+    op.add_column('search_sessions', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('search_sessions', 'updated_at')
+    op.drop_column('search_sessions', 'progress_json')
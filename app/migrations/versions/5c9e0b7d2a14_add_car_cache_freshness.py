@@ -0,0 +1,35 @@
+"""add car cache freshness
+
+Revision ID: 5c9e0b7d2a14
+Revises: 7a2d4f61c0b3
+Create Date: 2026-10-17 14:25:48.770512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9e0b7d2a14'
+down_revision: Union[str, Sequence[str], None] = '7a2d4f61c0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('car_cache', sa.Column('scraped_at', sa.DateTime(timezone=True),
+                                         server_default=sa.text('now()'), nullable=False))
+    op.add_column('car_cache', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    # แถวเดิมถูก purge/สร้างใหม่ทุกครั้งที่ค้น → ถือว่าหมดอายุทันที ให้ค้นครั้งถัดไป scrape ใหม่
+    op.execute("UPDATE car_cache SET scraped_at = created_at, expires_at = created_at")
+    op.create_index('ix_car_cache_source_expires_at', 'car_cache', ['source', 'expires_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_car_cache_source_expires_at', table_name='car_cache')
+    op.drop_column('car_cache', 'expires_at')
+    op.drop_column('car_cache', 'scraped_at')
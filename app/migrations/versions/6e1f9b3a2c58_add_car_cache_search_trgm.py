@@ -0,0 +1,33 @@
+"""add car cache search trgm
+
+Revision ID: 6e1f9b3a2c58
+Revises: 8d3c5e2f7a16
+Create Date: 2026-10-17 17:41:12.593820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1f9b3a2c58'
+down_revision: Union[str, Sequence[str], None] = '8d3c5e2f7a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # expression ต้องตรงกับ app/services/text_search.py:search_text ทุกตัวอักษร
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_car_cache_search_trgm ON car_cache USING gin "
+        "((coalesce(title, '') || ' ' || coalesce(brand, '') || ' ' || coalesce(model, '')) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ไม่ drop extension เผื่อมีตารางอื่นใช้
+    op.execute("DROP INDEX IF EXISTS ix_car_cache_search_trgm")
@@ -0,0 +1,40 @@
+"""add search job queue
+
+Revision ID: 7a2d4f61c0b3
+Revises: 3b8f1c2d9e47
+Create Date: 2026-10-17 13:40:05.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d4f61c0b3'
+down_revision: Union[str, Sequence[str], None] = '3b8f1c2d9e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('search_sessions', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('search_sessions', sa.Column('run_after', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('search_sessions', sa.Column('locked_by', sa.String(length=64), nullable=True))
+    op.add_column('search_sessions', sa.Column('last_error', sa.Text(), nullable=True))
+    # worker claims only queued/running rows; keep the index small
+    op.create_index(
+        'ix_search_sessions_queue', 'search_sessions', ['status', 'id'],
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_search_sessions_queue', table_name='search_sessions')
+    op.drop_column('search_sessions', 'last_error')
+    op.drop_column('search_sessions', 'locked_by')
+    op.drop_column('search_sessions', 'run_after')
+    op.drop_column('search_sessions', 'attempts')
@@ -0,0 +1,57 @@
+"""add car cache attr columns
+
+Revision ID: 8d3c5e2f7a16
+Revises: 2f6a8c1d3b90
+Create Date: 2026-10-17 17:05:41.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3c5e2f7a16'
+down_revision: Union[str, Sequence[str], None] = '2f6a8c1d3b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ATTR_COLUMNS = ('body_type', 'fuel_type', 'transmission', 'color')
+BATCH = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for col in ATTR_COLUMNS:
+        op.add_column('car_cache', sa.Column(col, sa.String(length=40), nullable=True))
+
+    # backfill จาก extra ด้วยตัวแปลงเดียวกับที่ CarWriter ใช้ตอน upsert (ไล่ทีละชุดตาม id)
+    from app.scrapers.normalize import attr_columns
+
+    conn = op.get_bind()
+    select_batch = sa.text(
+        "SELECT id, extra FROM car_cache WHERE id > :after AND extra IS NOT NULL ORDER BY id LIMIT :n"
+    )
+    update_row = sa.text(
+        "UPDATE car_cache SET body_type = :body_type, fuel_type = :fuel_type, "
+        "transmission = :transmission, color = :color WHERE id = :id"
+    )
+    after = 0
+    while True:
+        rows = conn.execute(select_batch, {"after": after, "n": BATCH}).all()
+        if not rows:
+            break
+        params = [{"id": car_id, **attr_columns(extra)} for car_id, extra in rows]
+        conn.execute(update_row, params)
+        after = rows[-1][0]
+
+    for col in ATTR_COLUMNS:
+        op.create_index(op.f(f'ix_car_cache_{col}'), 'car_cache', [col], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for col in reversed(ATTR_COLUMNS):
+        op.drop_index(op.f(f'ix_car_cache_{col}'), table_name='car_cache')
+        op.drop_column('car_cache', col)
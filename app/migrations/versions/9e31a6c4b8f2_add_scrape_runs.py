@@ -0,0 +1,47 @@
+"""add scrape runs
+
+Revision ID: 9e31a6c4b8f2
+Revises: 5c9e0b7d2a14
+Create Date: 2026-10-17 15:02:13.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e31a6c4b8f2'
+down_revision: Union[str, Sequence[str], None] = '5c9e0b7d2a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'scrape_runs',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('fingerprint', sa.String(length=255), nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('q_norm', sa.String(length=200), nullable=False),
+        sa.Column('price_bucket', sa.BigInteger(), nullable=False),
+        sa.Column('result_limit', sa.Integer(), nullable=False),
+        sa.Column('car_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('hits', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_scrape_runs_fingerprint'), 'scrape_runs', ['fingerprint'], unique=False)
+    op.create_index('ix_scrape_runs_lookup', 'scrape_runs', ['source', 'q_norm', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_scrape_runs_lookup', table_name='scrape_runs')
+    op.drop_index(op.f('ix_scrape_runs_fingerprint'), table_name='scrape_runs')
+    op.drop_table('scrape_runs')
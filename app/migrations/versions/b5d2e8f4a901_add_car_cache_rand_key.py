@@ -0,0 +1,31 @@
+"""add car cache rand key
+
+Revision ID: b5d2e8f4a901
+Revises: 6e1f9b3a2c58
+Create Date: 2026-10-17 18:12:37.881406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2e8f4a901'
+down_revision: Union[str, Sequence[str], None] = '6e1f9b3a2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # default เป็น volatile → Postgres เติม random() ให้ทุกแถวเดิมคนละค่าตอน add column
+    op.add_column('car_cache', sa.Column('rand_key', sa.Float(), server_default=sa.text('random()'), nullable=False))
+    op.create_index(op.f('ix_car_cache_rand_key'), 'car_cache', ['rand_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_car_cache_rand_key'), table_name='car_cache')
+    op.drop_column('car_cache', 'rand_key')
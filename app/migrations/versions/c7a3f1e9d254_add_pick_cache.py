@@ -0,0 +1,42 @@
+"""add pick cache
+
+Revision ID: c7a3f1e9d254
+Revises: b5d2e8f4a901
+Create Date: 2026-10-17 18:40:26.317052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a3f1e9d254'
+down_revision: Union[str, Sequence[str], None] = 'b5d2e8f4a901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'pick_cache',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('car_id', sa.BigInteger(), nullable=False),
+        sa.Column('reason', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('hits', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key'),
+    )
+    op.create_index(op.f('ix_pick_cache_last_used_at'), 'pick_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pick_cache_last_used_at'), table_name='pick_cache')
+    op.drop_table('pick_cache')
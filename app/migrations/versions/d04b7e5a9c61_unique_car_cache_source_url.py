@@ -0,0 +1,59 @@
+"""unique car cache source url
+
+Revision ID: d04b7e5a9c61
+Revises: 9e31a6c4b8f2
+Create Date: 2026-10-17 15:48:37.116204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd04b7e5a9c61'
+down_revision: Union[str, Sequence[str], None] = '9e31a6c4b8f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# แถวที่ซ้ำ (source, url) → เก็บแถวที่ scrape ล่าสุดไว้ตัวเดียว
+_DUPES = """
+    SELECT id, first_value(id) OVER (
+        PARTITION BY source, url ORDER BY scraped_at DESC, id DESC
+    ) AS keep_id
+    FROM car_cache
+    WHERE url IS NOT NULL
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ผลค้นหาเดิมที่ชี้ไปแถวซ้ำ → ชี้ไปแถวที่เก็บไว้แทน (ถ้า session นั้นมีแถวที่เก็บอยู่แล้วก็ลบทิ้ง)
+    op.execute(f"""
+        DELETE FROM search_session_cars s
+        USING ({_DUPES}) d
+        WHERE s.car_id = d.id AND d.id <> d.keep_id
+          AND EXISTS (
+              SELECT 1 FROM search_session_cars k
+              WHERE k.session_id = s.session_id AND k.car_id = d.keep_id
+          )
+    """)
+    op.execute(f"""
+        UPDATE search_session_cars s SET car_id = d.keep_id
+        FROM ({_DUPES}) d
+        WHERE s.car_id = d.id AND d.id <> d.keep_id
+    """)
+    op.execute(f"""
+        DELETE FROM car_cache c
+        USING ({_DUPES}) d
+        WHERE c.id = d.id AND d.id <> d.keep_id
+    """)
+    # car_ids ใน scrape_runs อาจชี้แถวที่ถูกลบ — เป็นแค่ cache ล้างทิ้งได้
+    op.execute("DELETE FROM scrape_runs")
+    op.create_index('ux_car_cache_source_url', 'car_cache', ['source', 'url'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_car_cache_source_url', table_name='car_cache')
@@ -0,0 +1,28 @@
+"""add search session picks
+
+Revision ID: d9b4e6a2f183
+Revises: c7a3f1e9d254
+Create Date: 2026-10-17 19:12:08.534917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b4e6a2f183'
+down_revision: Union[str, Sequence[str], None] = 'c7a3f1e9d254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('search_sessions', sa.Column('picks_json', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('search_sessions', 'picks_json')
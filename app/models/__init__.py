@@ -6,10 +6,12 @@ from .user_package import UserPackage
 from .car_cache import CarCache
 from .search import SearchSession, SearchSessionCar
 from .promotion import Promotion  # ✅ เพิ่ม
+from .scrape_run import ScrapeRun
+from .pick_cache import PickCache
 
 __all__ = [
     "User", "SecurityAnswer",
     "Package", "Payment", "UserPackage",
     "CarCache", "SearchSession", "SearchSessionCar",
-    "Promotion",
+    "Promotion", "ScrapeRun", "PickCache",
 ]
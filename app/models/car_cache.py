@@ -3,13 +3,20 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 
 from sqlalchemy.orm import Mapped, mapped_column, synonym
-from sqlalchemy import BigInteger, String, Integer, Numeric, DateTime, Text, func
+from sqlalchemy import BigInteger, String, Integer, Numeric, DateTime, Text, Float, Index, func
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.db import Base  # ← ต้องอิมพอร์ต Base จากที่นี่เท่านั้น ห้าม from app.models import CarCache
 
 class CarCache(Base):
     __tablename__ = "car_cache"
+    __table_args__ = (
+        Index("ix_car_cache_source_expires_at", "source", "expires_at"),
+        # ON CONFLICT (source, url) ของ app/services/car_writer.py
+        Index("ux_car_cache_source_url", "source", "url", unique=True),
+        # ค้นคำอิสระ: GIN (pg_trgm) บน title || brand || model สร้างใน migration 6e1f9b3a2c58
+        # (expression index — ดู app/services/text_search.py)
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
@@ -31,9 +38,25 @@ class CarCache(Base):
 
     extra: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB)    # เก็บ raw attributes
 
+    # ค่ามาตรฐานตัวเล็กจาก extra (app/scrapers/normalize.py:attr_columns) ให้ filter ของหน้าค้นหาทำใน SQL
+    body_type: Mapped[Optional[str]] = mapped_column(String(40), index=True)     # เช่น 'sedan', 'double cab pickup'
+    fuel_type: Mapped[Optional[str]] = mapped_column(String(40), index=True)     # เช่น 'benzine', 'diesel'
+    transmission: Mapped[Optional[str]] = mapped_column(String(40), index=True)  # 'automatic' / 'manual'
+    color: Mapped[Optional[str]] = mapped_column(String(40), index=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # listing cache แบบมี TTL (ดู app/services/listing_cache.py)
+    scraped_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # hash ของ url + ราคา + ชื่อบนการ์ดหน้า list — ตรงกับรอบก่อน = ไม่ต้องเปิดหน้า detail ซ้ำ
+    list_fingerprint: Mapped[Optional[str]] = mapped_column(String(64))
+    last_seen_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # คีย์สุ่มตอน insert (มี index) ให้ pick_cars สุ่มรถได้โดยไม่ ORDER BY random() ทั้งตาราง
+    rand_key: Mapped[float] = mapped_column(Float, server_default=func.random(), nullable=False, index=True)
 
     # ---------- ALIASES (ไม่ต้องไมเกรตฐานข้อมูลเพิ่ม) ----------
     source_site: Mapped[str] = synonym("source")
@@ -0,0 +1,26 @@
+# app/models/pick_cache.py
+from __future__ import annotations
+from datetime import datetime
+
+from sqlalchemy import BigInteger, String, Integer, Text, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class PickCache(Base):
+    """รถที่ Gemini แนะนำต่อ (ชุดรถ, params, exclude) — ดู app/services/pick_cache.py"""
+    __tablename__ = "pick_cache"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # sha256 ของ car ids ที่เรียงแล้ว + params ที่ส่งให้ model + exclude ids + ชื่อ model
+    key: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    # ไม่ผูก FK กับ car_cache: แถวรถอาจถูก prune ก่อน cache หมดอายุ (hit แล้วไม่เจอรถ = ถือว่า miss)
+    car_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    reason: Mapped[str] = mapped_column(Text, nullable=False, default="")
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # ใช้ล่าสุดเมื่อไร (สร้าง/hit) — ไล่ลบแถวที่ไม่ได้ใช้นานสุดก่อนเมื่อเกิน PICK_CACHE_MAX_ROWS
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -0,0 +1,34 @@
+# app/models/scrape_run.py
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional, List
+
+from sqlalchemy import BigInteger, String, Integer, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class ScrapeRun(Base):
+    """ผล scrape ของ 1 source ต่อ query ที่ normalize แล้ว (cache ระดับ query ดู app/services/scrape_cache.py)"""
+    __tablename__ = "scrape_runs"
+    __table_args__ = (
+        Index("ix_scrape_runs_lookup", "source", "q_norm", "expires_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # "<source>|<q_norm>|<price_bucket>|<result_limit>"
+    fingerprint: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    source: Mapped[str] = mapped_column(String(50), nullable=False)
+    q_norm: Mapped[str] = mapped_column(String(200), nullable=False, default="")
+    price_bucket: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    result_limit: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # car_cache.id ที่ run นี้ได้มา
+    car_ids: Mapped[List[int]] = mapped_column(JSONB, nullable=False, default=list)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_hit_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional, Dict, List
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, ForeignKey, DateTime, JSON, func
+from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, JSON, func
 
 from app.db import Base
 
@@ -14,7 +14,21 @@ class SearchSession(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     params_json: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
+    # queued → running → done / empty / error / no_credit (คิวงานค้นหา ดู app/services/search_queue.py)
     status: Mapped[str] = mapped_column(String(20), default="done")
+    # สถานะราย source ระหว่างค้นหา เช่น {"kaidee": "running", "carsome": "ok"}
+    progress_json: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # รถแนะนำที่ model จัดอันดับไว้ล่วงหน้าตอนค้นหาเสร็จ {"key": ..., "picks": [{"car_id", "reason"}]}
+    # (app/services/pick_chain.py)
+    picks_json: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
+
+    # ---- job queue ----
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # retry ครั้งถัดไปไม่ก่อนเวลานี้ (backoff)
+    run_after: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     user = relationship("User")
     results: Mapped[List["SearchSessionCar"]] = relationship(
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta, date
 from calendar import monthrange
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, send_file, jsonify
 from flask_login import login_required, current_user
 from sqlalchemy import select, desc, func, extract
 from sqlalchemy.orm import joinedload
@@ -827,3 +827,31 @@ def users_toggle_admin(uid: int):
         return redirect(url_for("admin.users", **request.args))
     finally:
         db.close()
+
+
+# ------------------ Scraper pool metrics ------------------
+@bp.get("/scraper-pool")
+@_admin_required
+def scraper_pool_metrics():
+    """สถานะคิวงานค้นหา + scrape cache + worker pool + Chrome driver pool ของ scraper (JSON)"""
+    from app.services.driver_pool import pool_metrics
+    from app.services.scrape_worker import get_worker_pool
+    from app.services.search_queue import get_search_worker, queue_counts
+    from app.services.scrape_cache import stats as scrape_cache_stats
+    from app.services.scrape_runner import scraper_settings
+
+    workers = get_worker_pool()
+    search_worker = get_search_worker()
+    db = SessionLocal()
+    try:
+        jobs = queue_counts(db)
+        cache = scrape_cache_stats(db, scraper_settings(current_app.config))
+    finally:
+        db.close()
+    return jsonify({
+        "search_jobs": jobs,
+        "search_worker": search_worker.metrics() if search_worker else None,
+        "scrape_cache": cache,
+        "workers": {"size": workers.workers, "queued": workers.queue_size()},
+        "driver_pools": pool_metrics(),
+    })
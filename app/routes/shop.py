@@ -1,21 +1,24 @@
 # app/routes/shop.py
 # -*- coding: utf-8 -*-
-import os, sys, uuid, json, re
+import os, uuid, json, re
 from datetime import timedelta, datetime, date
 from typing import List, Optional
 
-from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy import select, func, or_
 from sqlalchemy.orm import joinedload
 
 from app.db import SessionLocal
 from app.models import (
     Package, Payment, UserPackage,
-    CarCache, SearchSession, SearchSessionCar, Promotion
+    SearchSession, Promotion
 )
-from app.services.credits import consume_one_credit
-from app.services.llm_select import pick_best_car_with_gemini
+from app.services.search_queue import enqueue_search
+from app.services.session_cars import PAGE_SIZE, count_cars, page_cars, ranked_cars, session_cars
+from app.services.llm_select import pick_best_car_with_gemini, pick_settings
+from app.services.pick_chain import has_chain, next_pick, precompute_picks
+from app.services.scoring import best_pick, rank_scored
 
 bp = Blueprint("shop", __name__, template_folder="../templates/shop")
 
@@ -63,178 +66,6 @@ def _available_credits(db, user_id: int) -> int:
     )
     return int(db.execute(stmt).scalar() or 0)
 
-def _purge_cache_for_source(db, source: str) -> int:
-    # Support both columns source and source_site
-    car_ids = db.execute(
-        select(CarCache.id).where(or_(CarCache.source == source, CarCache.source_site == source))
-    ).scalars().all()
-    if car_ids:
-        db.query(SearchSessionCar).filter(SearchSessionCar.car_id.in_(car_ids)).delete(synchronize_session=False)
-        db.flush()
-    deleted = db.query(CarCache).filter(or_(CarCache.source == source, CarCache.source_site == source)) \
-        .delete(synchronize_session=False)
-    return deleted
-
-def _run_scraper(source: str, q: str, min_price: int, max_price: int, limit: int) -> tuple[bool, str]:
-    import subprocess
-    py = sys.executable
-
-    chromedriver = current_app.config.get("SCRAPER_CHROMEDRIVER", "") or os.getenv("CHROMEDRIVER_PATH", "")
-    headless = current_app.config.get("SCRAPER_HEADLESS", True)
-    debug_dump = current_app.config.get("SCRAPER_DEBUG_DUMP", False)
-
-    if source == "kaidee":
-        script = os.path.join(os.getcwd(), "scripts", "scrape_kaidee.py")
-    elif source == "carsome":
-        script = os.path.join(os.getcwd(), "scripts", "scrape_carsome.py")
-    elif source == "one2car":
-        script = os.path.join(os.getcwd(), "scripts", "scrape_one2car.py")
-    elif source == "roddonjai":
-        script = os.path.join(os.getcwd(), "scripts", "scrape_roddonjai.py")
-    else:
-        return False, f"unknown source: {source}"
-
-    args = [
-        py, script,
-        "--q", q or "",
-        "--min", str(min_price),
-        "--max", str(max_price),
-        "--limit", str(limit),
-    ]
-    if chromedriver:
-        args += ["--chromedriver", chromedriver]
-    if headless:
-        args.append("--headless")
-    if debug_dump:
-        args.append("--debug-dump")
-
-    # เพิ่ม debug พิเศษให้ roddonjai
-    if source == "roddonjai":
-        args.append("--debug-fuel")
-
-    print(f"DEBUG run {source} args: {args}")
-
-    try:
-        timeout_sec = int(current_app.config.get("SCRAPER_TIMEOUT_SEC", 480))
-        proc = subprocess.run(args, capture_output=True, text=True, timeout=timeout_sec)
-        stdout = (proc.stdout or "").strip()
-        stderr = (proc.stderr or "").strip()
-        ok = proc.returncode == 0
-        if not ok:
-            # log error ของ source นั้น ๆ ด้วย ถึงแม้ source อื่นจะ ok
-            print(f"[{source}] ERROR exit={proc.returncode}")
-            if stdout:
-                print(f"[{source}] STDOUT (error case):\n{stdout}")
-            if stderr:
-                print(f"[{source}] STDERR:\n{stderr}")
-            return False, f"[{source}] exit={proc.returncode}\n{stdout}\n{stderr}"
-        if stdout:
-            print(f"[{source}] STDOUT:\n{stdout}")
-        if stderr:
-            print(f"[{source}] STDERR:\n{stderr}")
-        return True, stdout[-2000:]
-    except Exception as e:
-        print(f"[{source}] EXCEPTION in _run_scraper: {e}")
-        return False, f"[{source}] exception: {e}"
-
-def _extract_year_from_text(x) -> Optional[int]:
-    """Extract a 4-digit year from text, e.g., 'year 2018 (registered 2019)' => 2018."""
-    if x is None:
-        return None
-    m = re.search(r"(20\d{2}|19\d{2})", str(x))
-    return int(m.group(1)) if m else None
-
-def _get_car_year(c: CarCache) -> Optional[int]:
-    """Return year from main column or from various keys in 'extra'."""
-    if getattr(c, "year", None) is not None:
-        try:
-            return int(c.year)
-        except Exception:
-            pass
-    ex = c.extra or {}
-    sp = ex.get("สเปกย่อย") or {}
-    # Try common keys
-    for k in ("ปีรถ", "ปี", "year", "ปีผลิต"):
-        y = ex.get(k)
-        yy = _extract_year_from_text(y)
-        if yy:
-            return yy
-    for k in ("ปีจดทะเบียน",):
-        y = sp.get(k)
-        yy = _extract_year_from_text(y)
-        if yy:
-            return yy
-    return None
-
-def _match_extra_filters(
-    c: CarCache,
-    car_type: str,
-    fuel_type: str,
-    gear_type: str,
-    color: str,
-    min_year: Optional[int],
-    max_year: Optional[int],
-) -> bool:
-    extra = c.extra or {}
-    def norm(x: str | None) -> str:
-        return (x or "").strip().lower()
-
-    # --- body type ---
-    if car_type:
-        ct = norm(car_type)
-        val = (
-            norm(extra.get("ประเภทรถ")) or
-            norm(extra.get("ตัวถัง")) or
-            norm(extra.get("ประเภทตัวถัง")) or
-            norm((extra.get("สเปกย่อย") or {}).get("ประเภทรถ")) or
-            norm(extra.get("body_type"))
-        )
-        if ct and val and ct not in val:
-            return False
-
-    # --- fuel ---
-    if fuel_type:
-        ft = norm(fuel_type)
-        val = (
-            norm(extra.get("เชื้อเพลิง")) or
-            norm(extra.get("น้ำมัน")) or
-            norm((extra.get("สเปกย่อย") or {}).get("เชื้อเพลิง")) or
-            norm((extra.get("สเปกย่อย") or {}).get("น้ำมัน"))
-        )
-        if ft and val and ft not in val:
-            return False
-
-    # --- transmission ---
-    if gear_type:
-        gt = norm(gear_type)
-        val = (
-            norm(extra.get("เกียร์")) or
-            norm(extra.get("ระบบเกียร์")) or
-            norm((extra.get("สเปกย่อย") or {}).get("เกียร์"))
-        )
-        if gt and val and gt not in val:
-            return False
-
-    # --- color ---
-    if color:
-        cc = norm(color)
-        val = norm(extra.get("สี")) or norm((extra.get("สเปกย่อย") or {}).get("สี"))
-        if cc and val and cc not in val:
-            return False
-
-    # --- year range ---
-    if min_year or max_year:
-        y = _get_car_year(c)
-        # If user set a year range but the listing has no year -> exclude
-        if y is None:
-            return False
-        if min_year and y < min_year:
-            return False
-        if max_year and y > max_year:
-            return False
-
-    return True
-
 # ---------- promo helpers ----------
 def _parse_date(s: Optional[str]) -> Optional[date]:
     """Try to parse multiple date formats and return a naive date object."""
@@ -292,45 +123,6 @@ def _has_used_trial(db, user_id: int) -> bool:
     )
     return db.execute(q).scalar_one_or_none() is not None
 
-# ---------- sort helpers ----------
-def _safe_int(x, default_big=True):
-    try:
-        return int(x)
-    except Exception:
-        return 10**15 if default_big else -10**15
-
-def _safe_str(x):
-    return (x or "").strip().lower()
-
-def _apply_sort(cars, sort_key: str):
-    if not sort_key: return cars
-    key = sort_key.lower()
-
-    if key == "price_asc":
-        return sorted(cars, key=lambda c: _safe_int(getattr(c, "price_thb", None)))
-    if key == "price_desc":
-        return sorted(cars, key=lambda c: _safe_int(getattr(c, "price_thb", None)), reverse=True)
-
-    if key == "year_asc":
-        return sorted(cars, key=lambda c: _safe_int(getattr(c, "year", None)))
-    if key == "year_desc":
-        return sorted(cars, key=lambda c: _safe_int(getattr(c, "year", None)), reverse=True)
-
-    if key == "mileage_asc":
-        return sorted(cars, key=lambda c: _safe_int(getattr(c, "mileage_km", None)))
-    if key == "mileage_desc":
-        return sorted(cars, key=lambda c: _safe_int(getattr(c, "mileage_km", None)), reverse=True)
-
-    if key == "brand_az":
-        return sorted(cars, key=lambda c: _safe_str(getattr(c, "brand", None)))
-    if key == "brand_za":
-        return sorted(cars, key=lambda c: _safe_str(getattr(c, "brand", None)), reverse=True)
-
-    if key == "source":
-        return sorted(cars, key=lambda c: _safe_str(getattr(c, "source", None) or getattr(c, "source_site", None)))
-
-    return cars
-
 # ----------------------------- Search -----------------------------
 @bp.get("/search")
 @login_required
@@ -359,8 +151,6 @@ def search_loading():
 @bp.post("/search/start")
 @login_required
 def search_start():
-    from collections import Counter
-
     q = (request.form.get("q") or "").strip()
 
     # ---- total items user wants to fetch (20/30/40/50) ----
@@ -422,12 +212,6 @@ def search_start():
 
         print("DEBUG SCRAPER_SOURCES (final) =", sources, "Q =", q)
 
-        # clear cache per source
-        for s in sources:
-            purged = _purge_cache_for_source(db, s)
-            print(f"DEBUG purged {purged} rows for source={s}")
-        db.commit()
-
         # spread target count across sources
         n_sources = max(1, len(sources))
         per_source_limit = (total_limit + n_sources - 1) // n_sources  # ceil
@@ -436,57 +220,6 @@ def search_start():
         if cfg_cap > 0:
             per_source_limit = min(per_source_limit, cfg_cap)
 
-        display_limit = total_limit
-
-        any_ok = False
-        last_msg = ""
-        for s in sources:
-            ok, msg = _run_scraper(s, q=q, min_price=0, max_price=max_budget, limit=per_source_limit)
-            last_msg = msg
-            if ok:
-                any_ok = True
-
-        if not any_ok:
-            flash("An error occurred while fetching data from external sources.", "error")
-            if last_msg:
-                print(last_msg)
-            return redirect(url_for("shop.search"))
-
-        # ---- filter by budget 'max' ----
-        conds = [CarCache.price_thb.isnot(None), CarCache.price_thb <= max_budget]
-        if q:
-            like = f"%{q}%"
-            conds.append(or_(CarCache.title.ilike(like), CarCache.brand.ilike(like), CarCache.model.ilike(like)))
-        if sources:
-            conds.append(or_(CarCache.source.in_(sources), CarCache.source_site.in_(sources)))
-
-        rows = db.execute(
-            select(CarCache).where(and_(*conds)).order_by(CarCache.price_thb.asc()).limit(display_limit * 3)
-        ).scalars().all()
-
-        rows_by_source = Counter((getattr(c, "source", None) or getattr(c, "source_site", None) or "NONE") for c in rows)
-        print("DEBUG rows_from_db=%d" % len(rows))
-        print("DEBUG rows_by_source:", rows_by_source)
-
-        # ✅ apply year range with other filters
-        cars = [
-            c for c in rows
-            if _match_extra_filters(c, car_type, fuel_type, gear_type, color, min_year, max_year)
-        ]
-
-        cars_by_source = Counter((getattr(c, "source", None) or getattr(c, "source_site", None) or "NONE") for c in cars)
-        print("DEBUG after_extra_filters=%d" % len(cars))
-        print("DEBUG cars_by_source:", cars_by_source)
-
-        if not cars:
-            flash("No results found for the given filters.", "info")
-            return redirect(url_for("shop.search"))
-
-        # consume credit only after we have results
-        if not consume_one_credit(db, current_user.id):
-            flash("Insufficient credits. Please purchase a package.", "error")
-            return redirect(url_for("shop.list_packages"))
-
         params = {
             "q": q,
             "max_budget": max_budget,
@@ -507,14 +240,8 @@ def search_start():
             "total_limit": total_limit,
             "per_source_limit": per_source_limit
         }
-        ss = SearchSession(user_id=current_user.id, params_json=params, status="done")
-        db.add(ss)
-        db.flush()
-
-        cars = cars[:display_limit]
-        for idx, c in enumerate(cars, start=1):
-            db.add(SearchSessionCar(session_id=ss.id, car_id=c.id, rank=idx))
-
+        # only enqueue here; a search worker runs the scrapers and attaches cars as they arrive
+        ss = enqueue_search(db, current_user.id, params)
         db.commit()
         return redirect(url_for("shop.search_view", session_id=ss.id))
 
@@ -529,9 +256,8 @@ def search_start():
 @bp.get("/search/<int:session_id>")
 @login_required
 def search_view(session_id: int):
-    from collections import Counter
-
     sort = request.args.get("sort", "").strip()
+    after = request.args.get("after", "").strip() or None
 
     db = SessionLocal()
     try:
@@ -540,17 +266,42 @@ def search_view(session_id: int):
             flash("Search session not found.", "error")
             return redirect(url_for("shop.search"))
 
-        rows = db.execute(
-            select(SearchSessionCar)
-            .where(SearchSessionCar.session_id == ss.id)
-            .order_by(SearchSessionCar.rank)
-        ).scalars().all()
-        cars = [r.car for r in rows]
-        by_source = Counter((getattr(c, "source", None) or getattr(c, "source_site", None) or "NONE") for c in cars)
-        print("DEBUG search_view sources:", by_source)
+        # sort + แบ่งหน้าใน SQL; ระหว่างที่ยังค้นอยู่แสดงทั้งหมด (JS ต่อท้ายรถที่แนบเพิ่มตาม rank)
+        running = ss.status in ("queued", "running")
+        cars, next_after = page_cars(db, ss.id, sort, None if running else after,
+                                     limit=None if running else PAGE_SIZE)
+        total = count_cars(db, ss.id)
+        print(f"DEBUG search_view session={ss.id} total={total} page={len(cars)} sort={sort or 'rank'}")
 
-        cars = _apply_sort(cars, sort)
-        return render_template("shop/search_results.html", session=ss, cars=cars, sort=sort)
+        return render_template(
+            "shop/search_results.html", session=ss, cars=cars, sort=sort, total=total,
+            after=None if running else after, next_after=next_after,
+            running=running, progress=ss.progress_json or {},
+        )
+    finally:
+        db.close()
+
+@bp.get("/search/<int:session_id>/progress")
+@login_required
+def search_progress(session_id: int):
+    """polling endpoint of the results page: status per source + cards attached after rank `after`"""
+    after = request.args.get("after", default=0, type=int)
+
+    db = SessionLocal()
+    try:
+        ss = db.get(SearchSession, session_id)
+        if not ss or ss.user_id != current_user.id:
+            return jsonify({"error": "not found"}), 404
+
+        rows = ranked_cars(db, ss.id, after_rank=after)
+
+        html = "".join(render_template("shop/_car_card.html", c=car) for _, car in rows)
+        return jsonify({
+            "status": ss.status,
+            "sources": ss.progress_json or {},
+            "count": rows[-1][0] if rows else after,
+            "html": html,
+        })
     finally:
         db.close()
 
@@ -564,12 +315,7 @@ def best_car(session_id: int):
             flash("No suitable recommendation found.", "error")
             return redirect(url_for("shop.search"))
 
-        rows = db.execute(
-            select(SearchSessionCar)
-            .where(SearchSessionCar.session_id == ss.id)
-            .order_by(SearchSessionCar.rank)
-        ).scalars().all()
-        cars = [r.car for r in rows]
+        cars = session_cars(db, ss.id)
 
         raw = ss.params_json
         params = raw if isinstance(raw, dict) else (json.loads(raw or "{}") if raw else {})
@@ -585,19 +331,44 @@ def best_car(session_id: int):
                     except:
                         pass
 
-        best, reason = pick_best_car_with_gemini(
-            cars=cars,
-            session_params=params,
-            exclude_ids=exclude_ids,
-            fallback_first=True
-        )
+        # ค่าเริ่มต้น: คะแนนในเครื่อง (ไม่เรียก model); ?ai=1 = ผู้ใช้ขอคำแนะนำจาก AI เอง
+        use_ai = request.args.get("ai") == "1"
+        picks = pick_settings(current_app.config)
+        weights = picks["score_weights"]
+        if use_ai:
+            # chain จัดอันดับ top-K จาก model ครั้งเดียวต่อ session → คลิกถัด ๆ ไปอ่านจาก DB
+            picked = next_pick(ss, cars, exclude_ids)
+            chain_failed = False
+            if not picked and not has_chain(ss, cars):
+                if precompute_picks(db, ss, cars, picks, timeout=None):
+                    db.commit()
+                    picked = next_pick(ss, cars, exclude_ids)
+                else:
+                    chain_failed = True
+            if picked:
+                best, reason = picked
+            elif chain_failed:
+                # model เพิ่ง timeout/error ไป — ไม่ถามซ้ำอีกรอบ (จะกิน LLM_TIMEOUT_SEC เป็นสองเท่า) ใช้คะแนนในเครื่อง
+                best, reason = best_pick(cars, params, exclude_ids, weights)
+            else:
+                # chain ใช้ครบแล้ว → ถาม model ทีละคันแบบเดิม
+                best, reason = pick_best_car_with_gemini(
+                    cars=cars,
+                    session_params=params,
+                    exclude_ids=exclude_ids,
+                    fallback_first=True,
+                    db=db,
+                    settings=picks,
+                )
+                db.commit()  # pick_cache hit count / new entry
+        else:
+            best, reason = best_pick(cars, params, exclude_ids, weights)
 
         if not best:
             flash("No suitable recommendation found.", "info")
             return redirect(url_for("shop.search_view", session_id=ss.id))
 
-        others = [c for c in cars if c.id != best.id and c.id not in exclude_ids]
-        others = sorted(others, key=lambda c: (c.price_thb is None, c.price_thb))[:8]
+        others = [s.car for s in rank_scored(cars, params, weights) if s.car.id != best.id and s.car.id not in exclude_ids][:8]
 
         next_exclude = ",".join([*(str(i) for i in exclude_ids), str(best.id)]) if exclude_ids else str(best.id)
 
@@ -607,7 +378,8 @@ def best_car(session_id: int):
             car=best,
             reason=reason,
             next_exclude=next_exclude,
-            others=others
+            others=others,
+            use_ai=use_ai,
         )
     finally:
         db.close()
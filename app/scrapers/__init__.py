@@ -0,0 +1,19 @@
+# app/scrapers/__init__.py
+# -*- coding: utf-8 -*-
+"""
+scraper ของทุก source: 1 โมดูลต่อเว็บ (app/scrapers/<source>.py) ที่มีแค่ SourceAdapter ของเว็บนั้น
+ส่วนที่เหมือนกันทุกเว็บอยู่ใน engine.py / common.py / normalize.py
+
+เพิ่ม source ใหม่ = เขียน adapter ในโมดูลใหม่ (ตั้ง ADAPTER = คลาสนั้น) แล้วเพิ่มชื่อใน SOURCES
+"""
+import importlib
+from typing import Type
+
+SOURCES = ("kaidee", "carsome", "one2car", "roddonjai")
+
+
+def get_adapter(source: str) -> "Type":
+    """คืนคลาส adapter ของ source (import โมดูลครั้งแรกที่เรียก แล้ว Python cache ไว้ใน sys.modules)"""
+    if source not in SOURCES:
+        raise KeyError(f"unknown source: {source}")
+    return importlib.import_module(f"app.scrapers.{source}").ADAPTER
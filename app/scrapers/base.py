@@ -0,0 +1,128 @@
+# app/scrapers/base.py
+# -*- coding: utf-8 -*-
+"""
+SourceAdapter — ส่วนที่ต่างกันของแต่ละเว็บ (ค้นหา / เก็บลิงก์ / parse หน้าประกาศ / แปลงเป็นแถว)
+
+ส่วนที่เหมือนกันทุกเว็บ (เปิด driver, เปิดหน้าประกาศพร้อมกัน, HTTP ก่อน Selenium, retry,
+กรองราคา/คำค้น, เขียน DB เป็นชุด) อยู่ใน app/scrapers/engine.py ที่เดียว
+
+สร้าง adapter ใหม่ 1 ตัวต่อการ scrape 1 รอบ: คำค้นและ option ราย source (เช่น debug_fuel)
+อยู่บน self ให้ทุก method ใช้ได้
+
+hook ที่ต้องมีทุก source (abstractmethod — adapter ที่ขาดตัวไหนสร้าง instance ไม่ได้ตั้งแต่ต้น):
+open_search / collect_links / parse_detail / to_car_row
+hook เสริมตัวเดียว: parse_detail_html — source ที่ประกาศ "http" ใน FETCH_BACKENDS["detail"] ต้อง override
+(ตรวจตอนประกาศ class ใน __init_subclass__)
+"""
+import argparse
+from abc import ABC, abstractmethod
+import hashlib
+from typing import Dict, List, Optional
+
+from app.scrapers.common import canonical_url, card_texts, card_title_price
+
+
+class ListingCard:
+    """ข้อมูลย่อของประกาศจากการ์ดหน้า list — fingerprint ตรงกับรอบก่อน = ไม่ต้องเปิดหน้า detail ซ้ำ"""
+
+    __slots__ = ("url", "title", "price")
+
+    def __init__(self, url: str, title: Optional[str] = None, price: Optional[int] = None):
+        self.url = url
+        self.title = title
+        self.price = price
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        # อ่านชื่อ/ราคาจากการ์ดไม่ได้ → ตัดสินไม่ได้ว่าเปลี่ยนไหม ให้เปิดหน้า detail เสมอ
+        if not self.title and self.price is None:
+            return None
+        title = " ".join((self.title or "").lower().split())
+        raw = f"{self.url}|{self.price if self.price is not None else ''}|{title}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SourceAdapter(ABC):
+    name = ""
+    BASE_URL = ""
+
+    # politeness cap: เปิดหน้าประกาศพร้อมกันได้ไม่เกินกี่ driver + เว้นระยะระหว่าง request (วินาที)
+    DETAIL_MAX_CONCURRENCY = 2
+    DETAIL_MIN_INTERVAL_SEC = 1.0
+
+    # หน้าไหนรองรับ backend อะไร (ดู app/services/http_fetch.py)
+    FETCH_BACKENDS = {"list": ("selenium",), "detail": ("selenium",)}
+
+    # page_load_strategy ของ Chrome → driver pool ยืมจากกลุ่มนี้
+    DRIVER_PROFILE = "normal"
+
+    # กรองรถที่ title/brand/model ไม่มีคำค้นครบทุกคำ (เว็บที่ผลค้นหาหลวม)
+    KEYWORD_FILTER = False
+
+    DEFAULT_LIMIT = 20
+
+    # การ์ดประกาศบนหน้า list (+ ลิงก์ในการ์ด ถ้าตัวการ์ดไม่ใช่ <a>) ใช้อ่านชื่อ/ราคาทำ fingerprint
+    CARD_CSS = ""
+    CARD_LINK_CSS: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "http" in cls.FETCH_BACKENDS.get("detail", ()) and cls.parse_detail_html is SourceAdapter.parse_detail_html:
+            raise TypeError(f"{cls.__name__}: FETCH_BACKENDS['detail'] has 'http' but parse_detail_html is not overridden")
+
+    def __init__(self, q: str = "", debug_dump: bool = False, **options):
+        self.q = (q or "").strip()
+        self.debug_dump = debug_dump
+        self.options = options
+
+    @property
+    def tag(self) -> str:
+        return self.name.upper()
+
+    # ---------------- CLI ----------------
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        """flag เพิ่มเติมของ source นี้ (ค่าจะถูกส่งเข้า __init__ เป็น options)"""
+
+    # ---------------- list page ----------------
+    @abstractmethod
+    def open_search(self, driver) -> None:
+        """เปิดหน้าเว็บแล้วค้นหา self.q จนหน้า list พร้อมให้เก็บลิงก์"""
+
+    @abstractmethod
+    def collect_links(self, driver, limit: int) -> List[str]:
+        """ลิงก์ประกาศบนหน้า list (ไม่เกิน limit)"""
+
+    def collect_cards(self, driver, limit: int) -> List[ListingCard]:
+        """collect_links + ชื่อ/ราคาจากการ์ดของแต่ละลิงก์ (ลิงก์ที่หาการ์ดไม่เจอ ได้ card เปล่า)"""
+        links = self.collect_links(driver, limit)
+        texts = {}
+        if self.CARD_CSS:
+            for href, text in card_texts(driver, self.CARD_CSS, self.CARD_LINK_CSS):
+                texts.setdefault(canonical_url(href), text)
+        return [ListingCard(u, *card_title_price(texts.get(canonical_url(u)))) for u in links]
+
+    # ---------------- detail page ----------------
+    @abstractmethod
+    def parse_detail(self, driver, link: str) -> Dict:
+        """เปิดหน้าประกาศด้วย Selenium + รอ DOM + parse"""
+
+    def parse_detail_html(self, html: str, link: str) -> Optional[Dict]:
+        """
+        hook เสริม (ตัวเดียวที่ไม่บังคับ): parse จาก HTML ล้วนสำหรับ backend http — None = parse ไม่ได้
+        engine เรียกเฉพาะ source ที่ FETCH_BACKENDS["detail"] มี "http" (source นั้นต้อง override)
+        """
+        return None
+
+    def detail_complete(self, data: Dict) -> bool:
+        """หน้า detail ที่ได้จาก HTTP ใช้ได้ไหม (ถ้าเป็นหน้าเปล่าที่รอ JS จะไม่มีชื่อรถ/ราคา)"""
+        return bool(data.get("title") and data.get("price_thb"))
+
+    # ---------------- result ----------------
+    @abstractmethod
+    def to_car_row(self, data: Dict) -> Optional[Dict]:
+        """แปลงผล parse เป็นแถวของ car_cache (คอลัมน์ตาม app/services/car_writer.py:COLUMNS)"""
+
+    def log_item(self, idx: int, link: str, data: Dict, row: Dict) -> None:
+        """พิมพ์ debug ต่อคัน (ก่อนเขียน DB)"""
+        print(f"#{idx} ok -> {row.get('brand') or ''} {row.get('model') or ''} price={row.get('price_thb')}")
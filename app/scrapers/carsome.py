@@ -0,0 +1,380 @@
+# app/scrapers/carsome.py
+# -*- coding: utf-8 -*-
+"""
+Carsome (carsome.co.th) — หน้า list ต้องพิมพ์ค้นหา/scroll ด้วย Selenium, หน้า detail parse จาก HTML ล้วน (ลอง HTTP ก่อน)
+ตัวอย่าง:
+  python scripts\\scrape_carsome.py --q "City" --min 0 --max 999999999 --limit 40 --chromedriver "C:\\File\\CARCOM\\backend\\chromedriver.exe" --headless --debug-fuel
+"""
+import re
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urljoin
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from app.scrapers.base import SourceAdapter
+from app.scrapers.common import all_words_in, extract_year, to_int, wait_any
+from app.scrapers.normalize import (
+    normalize_color_th_to_en,
+    normalize_fuel_th_to_en,
+    normalize_transmission_th_to_en,
+)
+from app.services.waits import auto_scroll_until_stable, track_network, wait_dom_quiet, wait_network_idle
+
+BASE_URL = "https://www.carsome.co.th/buy-car"
+CARD_CSS = "article.mod-b-card, article.card, article[class*='car-card']"
+
+# carsome แสดงเบนซินเป็น Petrol (เหมือนที่เคยเก็บลง DB)
+FUEL_OVERRIDES = {"Benzine": "Petrol"}
+
+
+def clean_money(txt: str) -> str:
+    return re.sub(r"[^\d,\.]", "", txt or "").strip()
+
+
+def is_carsome_car_url(href: str) -> bool:
+    if not href:
+        return False
+    href = re.sub(r'[#?].*$', '', href)
+    return "/buy-car/" in href and re.search(r"/[a-z]{3}\d{3,}/?$", href, re.I) is not None
+
+
+def collect_links(driver, limit: int, q: Optional[str] = None) -> List[str]:
+    links: List[str] = []
+    seen = set()
+    try:
+        cards = driver.find_elements(By.CSS_SELECTOR, CARD_CSS)
+        for card in cards:
+            try:
+                a = card.find_element(By.CSS_SELECTOR, "a[href]")
+                href = a.get_attribute("href") or ""
+                if not href or not href.startswith("http"):
+                    continue
+                if not is_carsome_car_url(href):
+                    continue
+                txt = card.text.strip()
+                if q and not all_words_in(txt + " " + href, q):
+                    continue
+                u = re.sub(r"[#?].*$", "", href).rstrip("/")
+                if u not in seen:
+                    links.append(u); seen.add(u)
+            except Exception:
+                continue
+    except Exception:
+        pass
+
+    if len(links) < limit:
+        html = driver.page_source
+        hrefs = re.findall(r'href="([^"]+)"', html)
+        for h in hrefs:
+            u = urljoin(driver.current_url, h)
+            u = re.sub(r"[#?].*$", "", u).rstrip("/")
+            if not is_carsome_car_url(u):
+                continue
+            if u not in seen:
+                links.append(u); seen.add(u)
+            if len(links) >= limit * 2:
+                break
+    return links[:limit]
+
+
+def parse_detail_html(html: str, url: str) -> Dict:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+
+    def sel_text(selector, default=""):
+        el = soup.select_one(selector)
+        return (el.get_text(strip=True) if el else default) or default
+
+    # ===== helper: specs / fuel / color =====
+    def collect_spec_items() -> Dict[str, str]:
+        specs: Dict[str, str] = {}
+        for row in soup.select(".car-details-content .detail-item, .detail__car-spec .detail-item"):
+            key_el = row.select_one(".key")
+            val_el = row.select_one(".value")
+            k = key_el.get_text(strip=True) if key_el else ""
+            v = val_el.get_text(strip=True) if val_el else ""
+            if k and v:
+                specs[k] = v
+        return specs
+
+    def extract_fuel(specs: Dict[str, str]) -> Tuple[str, str, str]:
+        fuel_keys = ["ประเภทเชื้อเพลิง", "เชื้อเพลิง", "ประเภทน้ำมัน", "ชนิดเชื้อเพลิง", "ประเภทพลังงาน"]
+        for k in fuel_keys:
+            if k in specs and specs[k]:
+                return specs[k].strip(), k, "specs"
+        for row in soup.select(".detail-item"):
+            key_el = row.select_one(".key")
+            val_el = row.select_one(".value")
+            if not key_el or not val_el:
+                continue
+            k = key_el.get_text(strip=True)
+            v = val_el.get_text(strip=True)
+            if any(alt in k for alt in fuel_keys):
+                return v.strip(), k, "detail-item"
+        blob = soup.get_text(" ", strip=True)
+        m = re.search(r"(ประเภทเชื้อเพลิง|เชื้อเพลิง|ประเภทน้ำมัน)\s*[:：]\s*([A-Za-zก-ฮ0-9/ \-]+)", blob)
+        if m:
+            return m.group(2).strip(), m.group(1), "regex"
+        return "", "", "not-found"
+
+    def extract_color(specs: Dict[str, str]) -> Tuple[str, str]:
+        color_th = ""
+        for k, v in specs.items():
+            if any(word in k for word in ["สีรถ", "สีภายนอก", "สีตัวถัง", "สี"]):
+                color_th = v.strip()
+                break
+        color_en = normalize_color_th_to_en(color_th)
+        return color_th, color_en
+
+    # ===== fields =====
+    title = (
+        sel_text(".vehicle__title-wrapper span")
+        or sel_text(".car-info-left .car-info-top")
+        or sel_text(".head-mobile__title")
+        or sel_text("h1")
+        or "ไม่พบชื่อรุ่น"
+    )
+
+    price_txt = sel_text(".car-price .price") or sel_text(".detail__price .price") or sel_text(".car__price")
+    price_clean = clean_money(price_txt) if price_txt else ""
+    price_int = to_int(price_clean)
+
+    mileage_trans = sel_text(".car-mileage") or sel_text(".detail__car-info") or ""
+    mil = re.search(r"([\d,]+)\s*กม", mileage_trans)
+    mileage_km = to_int(mil.group(1)) if mil else None
+
+    gear_m = re.search(r"\|\s*([A-Za-zก-ฮ]+)", mileage_trans)
+    transmission_raw = (gear_m.group(1).strip() if gear_m else "") or sel_text(".transmission") or ""
+
+    # แปลงเกียร์เป็นอังกฤษ (Manual / Automatic) ถ้าได้
+    transmission_en = normalize_transmission_th_to_en(transmission_raw)
+    transmission_display = transmission_en or transmission_raw
+
+    location = sel_text(".car-all__location-descs") or sel_text(".detail__location") or ""
+
+    specs = collect_spec_items()
+    fuel_type_th, fuel_key, fuel_method = extract_fuel(specs)
+    color_th, color_en = extract_color(specs)
+
+    fuel_en = normalize_fuel_th_to_en(fuel_type_th, overrides=FUEL_OVERRIDES)
+
+    reg_txt = ""
+    for row in soup.select(".car-details-content .detail-item, .detail__car-spec .detail-item"):
+        key_el = row.select_one(".key")
+        if key_el and ("วันจดทะเบียน" in key_el.get_text(strip=True) or "ปี" == key_el.get_text(strip=True)):
+            val_el = row.select_one(".value")
+            reg_txt = val_el.get_text(strip=True) if val_el else ""
+            break
+    year = extract_year(reg_txt) or extract_year(title)
+
+    first_img = ""
+    for im in soup.select(".banner__slide img[src], .detail__images img[src]"):
+        src = (im.get("src") or "").strip()
+        if src.startswith("http"):
+            first_img = src
+            break
+
+    brand = ""
+    model = ""
+    m = re.match(r"([A-Za-zก-ฮ]+)\s+([A-Za-z0-9\.\-]+)", title)
+    if m:
+        brand = m.group(1)
+        model = m.group(2)
+
+    attrs: Dict[str, object] = {
+        "ผู้ขาย": "CARSOME",
+        "ชื่อรุ่น": title,
+        "ราคา(บาท)": price_clean or price_txt or "",
+        "เลขไมล์(กม.)": f"{mileage_km:,}" if mileage_km else "",
+        "เกียร์": transmission_display,   # ใช้อัน display ที่เป็นอังกฤษถ้า map ได้
+        "ที่ตั้งรถ": location,
+        "สเปกย่อย": specs,
+    }
+
+    # ----- fuel (เขียนทับ key เดิมให้เป็นอังกฤษถ้า map ได้) -----
+    display_fuel = fuel_en or fuel_type_th
+    if display_fuel:
+        attrs["ประเภทเชื้อเพลิง"] = display_fuel
+        attrs["เชื้อเพลิง"] = display_fuel
+
+    if fuel_type_th:
+        attrs["fuel_type_th"] = fuel_type_th
+    if fuel_en:
+        attrs["fuel_type_en"] = fuel_en
+        attrs["fuel_type_normalized"] = fuel_en.lower()
+    else:
+        attrs["fuel_type_normalized"] = (fuel_type_th or "").lower()
+
+    if isinstance(attrs.get("สเปกย่อย"), dict):
+        attrs["สเปกย่อย"].setdefault("เชื้อเพลิง", fuel_type_th or display_fuel or "")
+        if fuel_en:
+            attrs["สเปกย่อย"]["fuel_type_en"] = fuel_en
+
+    # ----- color (ทับ key "สี" ให้เป็นอังกฤษ ถ้า map ได้) -----
+    display_color = color_en or color_th
+    if display_color:
+        attrs["สี"] = display_color
+
+    if color_th:
+        attrs["color_th"] = color_th
+    if color_en:
+        attrs["color_en"] = color_en
+        attrs["color_normalized"] = color_en.lower()
+        if isinstance(attrs.get("สเปกย่อย"), dict):
+            attrs["สเปกย่อย"].setdefault("สี", color_th or display_color)
+            attrs["สเปกย่อย"]["color_en"] = color_en
+
+    # ----- transmission meta -----
+    if transmission_raw:
+        attrs["transmission_th"] = transmission_raw
+    if transmission_en:
+        attrs["transmission_en"] = transmission_en
+        attrs["transmission_normalized"] = transmission_en.lower()
+    else:
+        attrs["transmission_normalized"] = (transmission_raw or "").lower()
+
+    debug_fuel = {
+        "value": fuel_type_th,
+        "key": fuel_key,
+        "method": fuel_method,
+        "fuel_en": fuel_en,
+    }
+
+    return {
+        "source": "carsome",
+        "source_url": url,
+        "title": title,
+        "brand": brand or None,
+        "model": model or None,
+        "year": year,
+        "price_thb": price_int,
+        "mileage_km": mileage_km,
+        "province": location or None,
+        "image_url": first_img or None,
+        "attrs_json": attrs,
+        "debug_fuel": debug_fuel,
+    }
+
+
+class CarsomeAdapter(SourceAdapter):
+    name = "carsome"
+    BASE_URL = BASE_URL
+    CARD_CSS = CARD_CSS
+    CARD_LINK_CSS = "a[href]"
+
+    DETAIL_MAX_CONCURRENCY = 3
+    DETAIL_MIN_INTERVAL_SEC = 0.5
+
+    # หน้า list ต้องพิมพ์ค้นหา/scroll → Selenium; หน้า detail parse จาก HTML ล้วน → ลอง HTTP ก่อน
+    FETCH_BACKENDS = {"list": ("selenium",), "detail": ("http", "selenium")}
+
+    # ผลค้นหาของ carsome หลวม (มีรถแนะนำปน) → เก็บเฉพาะคันที่มีคำค้นครบ
+    KEYWORD_FILTER = True
+
+    @classmethod
+    def add_arguments(cls, parser) -> None:
+        parser.add_argument("--debug-fuel", action="store_true", help="พิมพ์ fuel type ต่อคันเพื่อดีบัก")
+
+    def open_search(self, driver) -> None:
+        driver.get(BASE_URL)
+        wait_dom_quiet(driver, quiet_ms=300, timeout=3)
+
+        q = self.q
+        if q:
+            try:
+                typed = False
+                selectors = [
+                    (By.CSS_SELECTOR, 'input[type="search"]'),
+                    (By.CSS_SELECTOR, 'input[placeholder*="ค้นหา"]'),
+                    (By.CSS_SELECTOR, 'form input[type="text"]'),
+                ]
+                for by, sel in selectors:
+                    try:
+                        el = WebDriverWait(driver, 6).until(EC.presence_of_element_located((by, sel)))
+                        el.clear()
+                        el.send_keys(q)
+                        track_network(driver)
+                        el.send_keys(Keys.ENTER)
+                        wait_network_idle(driver, idle_ms=400, timeout=5)
+                        try:
+                            btns = driver.find_elements(By.XPATH, "//button[.='ค้นหา' or contains(., 'ค้นหา')]")
+                            if btns:
+                                track_network(driver)
+                                btns[0].click()
+                                wait_network_idle(driver, idle_ms=400, timeout=5)
+                        except Exception:
+                            pass
+                        typed = True
+                        print(f"CARSOME: typed query via {sel!r}")
+                        break
+                    except Exception:
+                        continue
+                if not typed:
+                    track_network(driver)
+                    driver.execute_script("""
+                        const ss = ['input[type="search"]','input[placeholder*="ค้นหา"]','form input[type="text"]'];
+                        for (const s of ss) {
+                          const el = document.querySelector(s);
+                          if (el) { el.value = arguments[0];
+                            el.dispatchEvent(new Event('input',{bubbles:true}));
+                            el.dispatchEvent(new KeyboardEvent('keydown',{key:'Enter',bubbles:true}));
+                            const btn = [...document.querySelectorAll('button')].find(b=>/ค้นหา/.test(b.textContent||''));
+                            if (btn) btn.click();
+                            return true; }
+                        }
+                        return false;
+                    """, q)
+                    wait_network_idle(driver, idle_ms=400, timeout=5)
+                    print("CARSOME: typed query via JS fallback")
+            except Exception as e:
+                print("CARSOME: search typing error:", e)
+
+        wait_any(driver, ["article.mod-b-card", ".detail__popular-car, .detail__car-info"])
+        auto_scroll_until_stable(driver, css=CARD_CSS, max_rounds=8)
+
+    def collect_links(self, driver, limit: int) -> List[str]:
+        return collect_links(driver, limit=limit, q=self.q)
+
+    def parse_detail(self, driver, link: str) -> Dict:
+        driver.get(link)
+        wait_any(driver, [".detail__car-info", ".car-price .price", ".vehicle__title-wrapper", "h1"])
+        return parse_detail_html(driver.page_source, link)
+
+    def parse_detail_html(self, html: str, link: str) -> Dict:
+        return parse_detail_html(html, link)
+
+    def to_car_row(self, data: Dict) -> Optional[Dict]:
+        source_url = data.get("source_url")
+        if not source_url:
+            return None
+        return {
+            "source": self.name,
+            "url": source_url,
+            "title": data.get("title") or "ไม่ระบุชื่อ",
+            "brand": data.get("brand"),
+            "model": data.get("model"),
+            "year": data.get("year"),
+            "price_thb": data.get("price_thb"),
+            "mileage_km": data.get("mileage_km"),
+            "province": data.get("province"),
+            "image_url": data.get("image_url"),
+            "extra": data.get("attrs_json"),
+        }
+
+    def log_item(self, idx: int, link: str, data: Dict, row: Dict) -> None:
+        if self.options.get("debug_fuel"):
+            dbg = data.get("debug_fuel", {}) or {}
+            print(
+                f"[FUEL] #{idx} -> {dbg.get('value') or 'N/A'} "
+                f"| fuel_en={dbg.get('fuel_en') or 'N/A'} "
+                f"| key={dbg.get('key') or '-'} "
+                f"| method={dbg.get('method') or '-'} "
+                f"| url={link}"
+            )
+        super().log_item(idx, link, data, row)
+
+
+ADAPTER = CarsomeAdapter
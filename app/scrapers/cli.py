@@ -0,0 +1,35 @@
+# app/scrapers/cli.py
+# -*- coding: utf-8 -*-
+"""
+argparse กลางของ scripts/scrape_*.py (โหมด subprocess ของ scrape_runner ก็เรียกผ่านทางนี้)
+flag ร่วมอยู่ที่นี่ flag เฉพาะเว็บมาจาก adapter.add_arguments
+"""
+import argparse
+
+from dotenv import load_dotenv
+
+from app.scrapers import get_adapter
+from app.scrapers.engine import MAX_PRICE, scrape
+
+
+def main(source: str, argv=None) -> None:
+    load_dotenv()
+    adapter_cls = get_adapter(source)
+
+    p = argparse.ArgumentParser(description=f"Scrape {source} แล้ว upsert เข้า car_cache")
+    p.add_argument("--q", type=str, default="", help="คำค้นหา (เช่น Honda City)")
+    p.add_argument("--min", dest="min_price", type=int, default=0, help="ราคาต่ำสุด")
+    p.add_argument("--max", dest="max_price", type=int, default=MAX_PRICE, help="ราคาสูงสุด")
+    p.add_argument("--limit", type=int, default=adapter_cls.DEFAULT_LIMIT, help="จำนวนรายการสูงสุด")
+    p.add_argument("--chromedriver", type=str, default="", help="พาธของ chromedriver.exe")
+    p.add_argument("--headless", action="store_true", help="รันแบบ headless")
+    p.add_argument("--detail-workers", type=int, default=1,
+                   help=f"เปิดหน้าประกาศพร้อมกันกี่ browser (สูงสุด {adapter_cls.DETAIL_MAX_CONCURRENCY})")
+    p.add_argument("--fetch-backend", choices=["auto", "selenium"], default="auto", help="auto = ใช้ HTTP กับหน้าที่รองรับ")
+    p.add_argument("--full", action="store_true", help="เปิดหน้าประกาศทุกคัน แม้การ์ดบนหน้า list ไม่เปลี่ยนจากรอบก่อน")
+    p.add_argument("--debug-dump", action="store_true", help=f"บันทึก HTML หน้าผลลัพธ์ไว้ดู ({source}_results.html)")
+    adapter_cls.add_arguments(p)
+
+    args = vars(p.parse_args(argv))
+    args["incremental"] = not args.pop("full")
+    scrape(source, **args)
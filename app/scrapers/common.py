@@ -0,0 +1,94 @@
+# app/scrapers/common.py
+# -*- coding: utf-8 -*-
+"""helper เล็ก ๆ ที่ทุก source ใช้ร่วมกัน (เดิมก๊อปไว้ในทุก scripts/scrape_*.py)"""
+import re
+from typing import List, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+def to_int(s) -> Optional[int]:
+    if s is None:
+        return None
+    s = re.sub(r"[^\d]", "", str(s))
+    if not s:
+        return None
+    try:
+        return int(s)
+    except Exception:
+        return None
+
+
+def extract_year(text: str) -> Optional[int]:
+    m = re.search(r"(\d{4})", text or "")
+    return int(m.group(1)) if m else None
+
+
+def all_words_in(text: str, q: str) -> bool:
+    """ทุกคำใน q (แยกด้วยช่องว่าง) ต้องอยู่ใน text (ไม่สนตัวเล็กตัวใหญ่)"""
+    words = [w for w in re.split(r"\s+", (q or "").strip().lower()) if w]
+    if not words:
+        return True
+    blob = (text or "").lower()
+    return all(w in blob for w in words)
+
+
+def canonical_url(href: str) -> str:
+    """ตัด #fragment / ?query / / ท้าย — ใช้จับคู่ลิงก์การ์ดกับลิงก์ที่ adapter เก็บ"""
+    return re.sub(r"[#?].*$", "", href or "").rstrip("/")
+
+
+# ดึง (href, ข้อความบนการ์ด) ของทุกการ์ดใน JS ครั้งเดียว แทนการเรียก .text ทีละ element
+_CARD_TEXTS_JS = """
+var cards = document.querySelectorAll(arguments[0]), linkCss = arguments[1], out = [];
+for (var i = 0; i < cards.length; i++) {
+  var a = linkCss ? cards[i].querySelector(linkCss) : cards[i];
+  if (a && a.href) out.push([a.href, cards[i].innerText || ""]);
+}
+return out;
+"""
+
+
+def card_texts(driver, card_css: str, link_css: Optional[str] = None) -> List[Tuple[str, str]]:
+    try:
+        return [(h, t) for h, t in (driver.execute_script(_CARD_TEXTS_JS, card_css, link_css) or [])]
+    except Exception:
+        return []
+
+
+_MONEY_RE = re.compile(r"\d{1,3}(?:,\d{3})+|\d{5,}")
+
+
+def card_title_price(text: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """
+    เดาชื่อ (บรรทัดแรกที่มีตัวอักษร) และราคา จากข้อความบนการ์ดหน้า list
+    ราคา = ตัวเลขที่ติด ฿/บาท ก่อน ถ้าไม่มีใช้ตัวแรกที่ไม่ใช่เลขไมล์ (กม./km)
+    """
+    if not text:
+        return None, None
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    title = next((ln for ln in lines if re.search(r"[A-Za-zก-๙]", ln)), None)
+
+    price = fallback = None
+    for m in _MONEY_RE.finditer(text):
+        after = text[m.end():m.end() + 6].strip().lower()
+        before = text[max(0, m.start() - 3):m.start()]
+        if after.startswith(("กม", "km")):
+            continue
+        if "฿" in before or after.startswith(("บาท", "฿", ".-")):
+            price = to_int(m.group(0))
+            break
+        if fallback is None:
+            fallback = to_int(m.group(0))
+    return (title[:255] if title else None), (price if price is not None else fallback)
+
+
+def wait_any(driver, selectors: List[str], timeout=12):
+    conds = [EC.presence_of_element_located((By.CSS_SELECTOR, sel)) for sel in selectors]
+    WebDriverWait(driver, timeout).until(lambda d: any(c(d) for c in conds))
+
+
+def wait_body(driver, timeout=12):
+    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
@@ -0,0 +1,225 @@
+# app/scrapers/engine.py
+# -*- coding: utf-8 -*-
+"""
+engine กลางของ scraper ทุก source — รับ SourceAdapter แล้วทำส่วนที่เหมือนกันทั้งหมด:
+
+1. เปิด/ยืม Chrome (profile ตาม adapter.DRIVER_PROFILE) → adapter.open_search → adapter.collect_links
+2. เปิดหน้าประกาศพร้อมกันตาม politeness cap ของ adapter (app/services/detail_fetch.py)
+   ลอง HTTP ก่อนถ้า adapter ประกาศว่า detail รองรับ (app/services/http_fetch.py)
+3. หน้าที่พลาด (exception) ลองใหม่อีก DETAIL_RETRIES รอบด้วย driver หลัก
+4. กรองราคา (+ คำค้น ถ้า adapter.KEYWORD_FILTER) แล้วเขียนลง car_cache เป็นชุดผ่าน CarWriter
+
+incremental: ก่อนเปิดหน้าประกาศ เทียบ fingerprint ของการ์ดหน้า list (url + ราคา + ชื่อ) กับ car_cache
+ประกาศที่ไม่เปลี่ยนไม่ต้องเปิดหน้า detail ซ้ำ แค่ต่ออายุ (listing_cache.mark_seen) — ค้น query เดิมซ้ำ
+จะเหลือแค่ประกาศใหม่/เปลี่ยนราคาที่ต้องโหลดจริง
+
+เรียกได้ทั้งจาก CLI (app/scrapers/cli.py) และจาก worker ใน process เดียวกับเว็บ (app/services/scrape_worker.py)
+"""
+from typing import Dict, Iterable, List, Optional
+
+from app.db import SessionLocal
+from app.scrapers import get_adapter
+from app.scrapers.base import ListingCard, SourceAdapter
+from app.scrapers.common import all_words_in, to_int
+from app.services.car_writer import CarWriter
+from app.services.detail_fetch import DetailResult, fetch_details, quitting
+from app.services.driver_pool import build_chrome
+from app.services.http_fetch import http_first, supports
+from app.services.listing_cache import mark_seen, unchanged_listings
+
+# หน้าประกาศที่โหลด/parse พลาด ลองใหม่กี่รอบ (หลังรอบแรกจบ ทีละหน้าด้วย driver หลัก)
+DETAIL_RETRIES = 1
+
+MAX_PRICE = 999_999_999
+
+
+def build_driver(adapter: SourceAdapter, chromedriver: str = "", headless: bool = False):
+    return build_chrome(chromedriver, headless, adapter.DRIVER_PROFILE)
+
+
+def _stopped(stop_event) -> bool:
+    return stop_event is not None and stop_event.is_set()
+
+
+def _write_details(
+    adapter: SourceAdapter,
+    details: Iterable[DetailResult],
+    writer: CarWriter,
+    min_price: int,
+    max_price: int,
+    failed: List[str],
+    fingerprints: Dict[str, str],
+    prefix: str = "#",
+) -> int:
+    """กรอง + add เข้า writer; ลิงก์ที่พลาดเก็บใน failed ให้ลองใหม่ คืนจำนวนหน้าที่ผ่านมือ"""
+    done = 0
+    for idx, link, data, err in details:
+        done += 1
+        if err is not None:
+            print(f"{prefix}{idx} error: {type(err).__name__}: {err}")
+            failed.append(link)
+            continue
+        try:
+            row = adapter.to_car_row(data)
+            if not row:
+                print(f"{prefix}{idx} skip (no url) -> {link}")
+                continue
+
+            if adapter.KEYWORD_FILTER and adapter.q:
+                blob = " ".join(str(row.get(k) or "") for k in ("title", "brand", "model"))
+                if not all_words_in(blob, adapter.q):
+                    print(f"{prefix}{idx} skip kw (not match '{adapter.q}') -> {link}")
+                    continue
+
+            price = to_int(row.get("price_thb"))
+            if price is not None and (price < min_price or price > max_price):
+                print(f"{prefix}{idx} skip (price {price} not in {min_price}-{max_price})")
+                continue
+
+            row["list_fingerprint"] = fingerprints.get(link)
+            adapter.log_item(idx, link, data, row)
+            writer.add(row)
+        except Exception as e:
+            print(f"{prefix}{idx} error: {type(e).__name__}: {e}")
+    return done
+
+
+def run_scrape(
+    adapter: SourceAdapter,
+    min_price: int = 0,
+    max_price: int = MAX_PRICE,
+    limit: int = 20,
+    chromedriver: str = "",
+    headless: bool = False,
+    stop_event=None,
+    driver=None,
+    detail_workers: int = 1,
+    extra_driver=None,
+    fetch_backend: str = "auto",
+    incremental: bool = True,
+) -> Dict:
+    """
+    stop_event: threading.Event (ถ้ามี) ใช้สั่งหยุดกลางทาง แถวที่ flush ไปแล้วยังอยู่
+    driver: WebDriver ที่ยืมมาจาก driver pool (ถ้ามี) — ไม่ quit ให้ คนยืมเป็นคนคืนเอง
+    detail_workers / extra_driver: เปิดหน้าประกาศพร้อมกันกี่ driver (ไม่เกิน adapter.DETAIL_MAX_CONCURRENCY)
+        และ context manager สำหรับเปิด driver เสริม (ไม่ส่งมา = เปิด Chrome ใหม่แล้ว quit ตอนจบ)
+    fetch_backend: auto = ใช้ HTTP กับหน้าที่ adapter ประกาศไว้ใน FETCH_BACKENDS, selenium = บังคับใช้ browser ทุกหน้า
+    incremental: False = เปิดหน้า detail ทุกประกาศแม้การ์ดไม่เปลี่ยน
+    คืน dict สรุปผล {source, links, unchanged, created, updated, failed}
+    """
+    tag = adapter.tag
+    own_driver = driver is None
+    links: List[str] = []
+    unchanged: Dict[str, int] = {}
+    created = updated = 0
+    failed: List[str] = []
+
+    try:
+        if own_driver:
+            driver = build_driver(adapter, chromedriver, headless)
+
+        adapter.open_search(driver)
+
+        if adapter.debug_dump:
+            with open(f"{adapter.name}_results.html", "w", encoding="utf-8") as f:
+                f.write(driver.page_source)
+            print(f"Saved {adapter.name}_results.html")
+
+        cards: Dict[str, ListingCard] = {}
+        for card in adapter.collect_cards(driver, limit):
+            cards.setdefault(card.url, card)
+        links = list(cards)[:limit]
+        fingerprints = {u: cards[u].fingerprint for u in links if cards[u].fingerprint}
+        print(f"Found {len(links)} {adapter.name} listing links")
+
+        load = adapter.parse_detail
+        if fetch_backend != "selenium" and supports(adapter.FETCH_BACKENDS, "detail", "http"):
+            load = http_first(adapter.parse_detail_html, adapter.parse_detail, adapter.detail_complete, tag=tag)
+
+        db = SessionLocal()
+        writer = CarWriter(db)
+        try:
+            if incremental and fingerprints:
+                unchanged = unchanged_listings(db, adapter.name, fingerprints)
+                if unchanged:
+                    mark_seen(db, unchanged.values())
+                    db.commit()
+            to_fetch = [u for u in links if u not in unchanged]
+            print(f"{tag}: {len(unchanged)} unchanged (detail skipped), {len(to_fetch)} to fetch")
+
+            details = fetch_details(
+                to_fetch, load, driver,
+                extra_driver=extra_driver or quitting(lambda: build_driver(adapter, chromedriver, headless)),
+                concurrency=min(detail_workers, adapter.DETAIL_MAX_CONCURRENCY),
+                min_interval=adapter.DETAIL_MIN_INTERVAL_SEC,
+                stop_event=stop_event,
+            )
+            done = _write_details(adapter, details, writer, min_price, max_price, failed, fingerprints)
+
+            for attempt in range(1, DETAIL_RETRIES + 1):
+                if not failed or _stopped(stop_event):
+                    break
+                retry, failed = failed, []
+                print(f"{tag}: retry {attempt}/{DETAIL_RETRIES} for {len(retry)} failed detail pages")
+                _write_details(
+                    adapter,
+                    fetch_details(retry, load, driver, min_interval=adapter.DETAIL_MIN_INTERVAL_SEC,
+                                  stop_event=stop_event),
+                    writer, min_price, max_price, failed, fingerprints, prefix=f"retry{attempt} #",
+                )
+
+            if getattr(load, "stats", None):
+                print(f"{tag}: detail backends {load.stats}")
+            if _stopped(stop_event):
+                print(f"{tag}: stop requested, {done}/{len(to_fetch)} done")
+            writer.flush()
+            created, updated = writer.inserted, writer.updated
+            print(f"Upserted {created} new / {updated} updated rows to car_cache (source={adapter.name})")
+        finally:
+            db.close()
+
+    finally:
+        if driver and own_driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    return {"source": adapter.name, "links": len(links), "unchanged": len(unchanged),
+            "created": created, "updated": updated, "failed": len(failed)}
+
+
+def scrape(
+    source: str,
+    q: str = "",
+    min_price: int = 0,
+    max_price: int = MAX_PRICE,
+    limit: Optional[int] = None,
+    chromedriver: str = "",
+    headless: bool = False,
+    debug_dump: bool = False,
+    stop_event=None,
+    driver=None,
+    detail_workers: int = 1,
+    extra_driver=None,
+    fetch_backend: str = "auto",
+    incremental: bool = True,
+    **options,
+) -> Dict:
+    """scrape source เดียว; options ที่เหลือ (เช่น debug_fuel, include_sold) ส่งให้ adapter ของ source นั้น"""
+    adapter_cls = get_adapter(source)
+    adapter = adapter_cls(q=q, debug_dump=debug_dump, **options)
+    return run_scrape(
+        adapter,
+        min_price=min_price,
+        max_price=max_price,
+        limit=limit or adapter_cls.DEFAULT_LIMIT,
+        chromedriver=chromedriver,
+        headless=headless,
+        stop_event=stop_event,
+        driver=driver,
+        detail_workers=detail_workers,
+        extra_driver=extra_driver,
+        fetch_backend=fetch_backend,
+        incremental=incremental,
+    )
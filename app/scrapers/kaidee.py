@@ -0,0 +1,419 @@
+# app/scrapers/kaidee.py
+# -*- coding: utf-8 -*-
+"""
+Kaidee (rod.kaidee.com) — พิมพ์คำค้นในช่องค้นหา แล้วเปิดหน้าประกาศด้วย Selenium
+ตัวอย่างรัน:
+  python scripts\\scrape_kaidee.py --q "City" --min 0 --max 999999999 --limit 40 --chromedriver "C:\\File\\CARCOM\\backend\\chromedriver.exe" --headless --debug-fuel --debug-body
+"""
+from typing import List, Dict, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from app.scrapers.base import SourceAdapter
+from app.scrapers.common import to_int, wait_body
+from app.scrapers.normalize import (
+    normalize_body_type_th_to_en,
+    normalize_color_th_to_en,
+    normalize_fuel_th_to_en,
+    normalize_province_from_location,
+    normalize_transmission_th_to_en,
+)
+from app.services.waits import track_network, wait_dom_quiet, wait_network_idle, wait_selector_count
+
+BASE_URL = "https://rod.kaidee.com/c11-auto-car"
+CARD_CSS = "a.block.cursor-pointer.rounded-sm.p-md.shadow-lg"
+
+
+def dismiss_banners(driver):
+    candidates = [
+        (By.XPATH, "//button[contains(., 'ยอมรับ')]"),
+        (By.XPATH, "//button[contains(., 'ตกลง')]"),
+        (By.XPATH, "//button[contains(., 'Accept')]"),
+        (By.CSS_SELECTOR, "#onetrust-accept-btn-handler"),
+        (By.CSS_SELECTOR, "button[aria-label='Close']"),
+    ]
+    for by, sel in candidates:
+        try:
+            btns = driver.find_elements(by, sel)
+            if btns:
+                btns[0].click()
+                wait_dom_quiet(driver, quiet_ms=200, timeout=0.5)
+        except Exception:
+            pass
+
+
+def wait_for_results(driver, max_tries=15, sleep_sec=1.0) -> List[str]:
+    links: List[str] = []
+    for _ in range(max_tries):
+        links = find_listing_links(driver)
+        if links:
+            break
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        # คืนทันทีที่การ์ดโผล่ (ไม่ต้องรอครบ sleep_sec)
+        wait_selector_count(driver, CARD_CSS, 1, timeout=sleep_sec)
+    return links
+
+
+def find_listing_links(driver) -> List[str]:
+    links = set()
+    try:
+        cards = driver.find_elements(By.CSS_SELECTOR, CARD_CSS)
+        for el in cards:
+            href = el.get_attribute("href")
+            if href:
+                links.add(href)
+    except Exception:
+        pass
+    for css in ['a[href*="product-"]', 'a[href*="/product-"]']:
+        try:
+            anchors = driver.find_elements(By.CSS_SELECTOR, css)
+            for a in anchors:
+                href = a.get_attribute("href")
+                if href:
+                    links.add(href)
+        except Exception:
+            pass
+    return list(links)
+
+
+# -------- fuel helpers --------
+FUEL_KEYS = ["ประเภทเชื้อเพลิง", "เชื้อเพลิง", "ประเภทน้ำมัน", "ชนิดเชื้อเพลิง", "ประเภทพลังงาน"]
+
+
+def extract_fuel_from_data(d: Dict) -> Tuple[str, str]:
+    for k in FUEL_KEYS:
+        if k in d and d[k]:
+            return d[k], k
+    return "", ""
+
+
+# -------- robust text helper --------
+def first_text_by_xpath(driver, xpaths: List[str], timeout: int = 8) -> str:
+    for xp in xpaths:
+        try:
+            el = WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.XPATH, xp))
+            )
+            txt = el.text.strip()
+            if txt:
+                return txt
+        except Exception:
+            continue
+    return ""
+
+
+def parse_detail_page(driver) -> Dict:
+    data: Dict = {}
+
+    # ราคา
+    price = None
+    try:
+        price_el = WebDriverWait(driver, 4).until(
+            EC.presence_of_element_located(
+                (By.XPATH, "//span[contains(text(),'ราคารวมมูลค่าของแถมแล้ว')]/preceding-sibling::span")
+            )
+        )
+        price = price_el.text.strip()
+    except Exception:
+        try:
+            price_el = driver.find_element(By.XPATH, "//span[contains(text(),'฿') or contains(text(),',')]")
+            price = price_el.text.strip()
+        except Exception:
+            pass
+    data["ราคา"] = price or "ไม่พบราคา"
+
+    # ผู้ขาย (ไม่แปล)
+    seller = first_text_by_xpath(driver, [
+        "//img[@alt='รูปโปรไฟล์']/ancestor::div[contains(@class,'sc-1t41luv-3')]//span[contains(@class,'sc-3tpgds-0')][1]",
+        "//div[contains(@class,'sc-1k125n6-2')]//span[contains(@class,'sc-3tpgds-0')][1]",
+        "//span[contains(@class,'sc-3tpgds-0')][1]"
+    ])
+    data["ผู้ขาย"] = seller if seller else "ไม่พบ"
+
+    # รูป
+    img_url = None
+    try:
+        meta = driver.find_element(By.CSS_SELECTOR, 'meta[property="og:image"]')
+        img_url = meta.get_attribute("content")
+    except Exception:
+        try:
+            img = driver.find_element(By.CSS_SELECTOR, "img")
+            img_url = img.get_attribute("src")
+        except Exception:
+            pass
+    if img_url:
+        data["รูปภาพ"] = img_url
+
+    # Attributes (ปี/ไมล์/เกียร์/เชื้อเพลิง/ประเภทรถ ฯลฯ)
+    try:
+        items = driver.find_elements(By.CSS_SELECTOR, "ul#has-attributes > li")
+        for li in items:
+            try:
+                raw_label = li.find_element(By.CSS_SELECTOR, "span.sc-3tpgds-0").text.strip()
+                value = li.find_element(By.CSS_SELECTOR, "div > span").text.strip()
+                if not (raw_label and value):
+                    continue
+
+                label = raw_label
+
+                # ทำคีย์มาตรฐาน เพื่อให้ normalize ทำงานง่ายขึ้น
+                if any(k in label for k in ["Body type", "ประเภทรถ", "ประเภทตัวถัง"]):
+                    key = "ประเภทรถ"
+                elif any(k in label for k in ["Fuel", "เชื้อเพลิง", "ประเภทเชื้อเพลิง", "ประเภทน้ำมัน", "ชนิดเชื้อเพลิง"]):
+                    key = "เชื้อเพลิง"
+                elif any(k in label for k in ["Transmission", "เกียร์", "ระบบเกียร์"]):
+                    key = "เกียร์"
+                else:
+                    key = label
+
+                data[key] = value
+            except Exception:
+                continue
+    except Exception:
+        pass
+
+    # ชื่อประกาศ
+    try:
+        title_el = driver.find_element(By.TAG_NAME, "h1")
+        data["ชื่อประกาศ"] = title_el.text.strip()
+    except Exception:
+        pass
+
+    # ที่อยู่/ตำแหน่ง + province EN
+    location_text = first_text_by_xpath(driver, [
+        "//li[.//span[normalize-space()='ตำแหน่ง']]//span[normalize-space()!='ตำแหน่ง'][last()]",
+        "//li[.//svg]//span[contains(@class,'sc-mj06cq-1') or contains(@class,'biQatR')][last()]"
+    ])
+    if location_text:
+        data["ที่อยู่"] = location_text
+        prov_en, prov_th = normalize_province_from_location(location_text)
+        if prov_en:
+            data["จังหวัด"] = prov_en
+            data["province_th"] = prov_th
+        else:
+            data["จังหวัด"] = location_text
+
+    # ----- Fuel normalize -----
+    fuel_val_th, fuel_key = extract_fuel_from_data(data)
+    fuel_en = normalize_fuel_th_to_en(fuel_val_th)
+    display_fuel = fuel_en or fuel_val_th
+    if display_fuel:
+        data["ประเภทเชื้อเพลิง"] = display_fuel
+        data["เชื้อเพลิง"] = display_fuel
+    if fuel_val_th:
+        data["fuel_type_th"] = fuel_val_th
+    if fuel_en:
+        data["fuel_type_en"] = fuel_en
+        data["fuel_type_normalized"] = fuel_en.lower()
+    else:
+        data["fuel_type_normalized"] = (fuel_val_th or "").strip().lower()
+
+    # ----- Color -----
+    color_th = (data.get("สี") or "").strip()
+    color_en = normalize_color_th_to_en(color_th)
+    display_color = color_en or color_th
+    if display_color:
+        data["สี"] = display_color
+    if color_th:
+        data["color_th"] = color_th
+    if color_en:
+        data["color_en"] = color_en
+        data["color_normalized"] = color_en.lower()
+    else:
+        data["color_normalized"] = display_color.lower() if display_color else ""
+
+    # ----- Body type (ใช้ทั้ง main + sub แล้วล้าง sub ออก) -----
+    body_main_th = (data.get("ประเภทรถ") or data.get("ประเภทตัวถัง") or "").strip()
+    body_sub_th = (data.get("ประเภทย่อย") or "").strip()
+    source_str = body_sub_th or body_main_th   # ถ้ามี "รถเก๋ง 4 ประตู" ให้ใช้ตัวนี้ตัดสิน
+    body_en = normalize_body_type_th_to_en(source_str or body_main_th)
+    display_body = body_en or source_str or body_main_th
+
+    if display_body:
+        data["ประเภทรถ"] = display_body
+        data["ประเภทตัวถัง"] = display_body
+    if body_main_th or body_sub_th:
+        data["body_type_th"] = source_str or body_main_th
+    if body_en:
+        data["body_type_en"] = body_en
+    data["body_type_normalized"] = (body_en or source_str or body_main_th or "").lower()
+
+    # ❗ เคลียร์ประเภทย่อย เพื่อไม่ให้ template แสดงวงเล็บ "(รถเก๋ง 4 ประตู)" อีก
+    data["ประเภทย่อย"] = ""
+
+    # ----- Transmission -----
+    gear_raw = (data.get("เกียร์") or data.get("ระบบเกียร์") or "").strip()
+    gear_en = normalize_transmission_th_to_en(gear_raw)
+    gear_display = gear_en or gear_raw
+    if gear_display:
+        data["เกียร์"] = gear_display
+        data["ระบบเกียร์"] = gear_display
+    if gear_raw:
+        data["transmission_th"] = gear_raw
+    if gear_en:
+        data["transmission_en"] = gear_en
+        data["transmission_normalized"] = gear_en.lower()
+    else:
+        data["transmission_normalized"] = (gear_raw or "").lower()
+
+    # ===== normalized keys สำหรับใช้ต่อ =====
+    data["seller"]    = (data.get("ผู้ขาย") or "").strip()
+    data["location"]  = (data.get("จังหวัด") or data.get("ที่อยู่") or data.get("ตำแหน่ง") or "").strip()
+    data["gear"]      = gear_display
+    data["fuel"]      = display_fuel or ""
+    data["color"]     = display_color
+    data["body_type"] = display_body
+
+    return data
+
+
+class KaideeAdapter(SourceAdapter):
+    name = "kaidee"
+    BASE_URL = BASE_URL
+    CARD_CSS = CARD_CSS
+
+    DETAIL_MAX_CONCURRENCY = 3
+    DETAIL_MIN_INTERVAL_SEC = 0.5
+
+    # หน้า list/detail ต้องรัน JS (ค้นหา + แบนเนอร์) → Selenium อย่างเดียว
+    FETCH_BACKENDS = {"list": ("selenium",), "detail": ("selenium",)}
+
+    @classmethod
+    def add_arguments(cls, parser) -> None:
+        parser.add_argument("--debug-fuel", action="store_true", help="พิมพ์ fuel type ต่อคันเพื่อดีบัก")
+        parser.add_argument("--debug-body", action="store_true", help="พิมพ์ body type ต่อคันเพื่อดีบัก")
+
+    def open_search(self, driver) -> None:
+        driver.get(BASE_URL)
+        wait_dom_quiet(driver, quiet_ms=300, timeout=3)
+        dismiss_banners(driver)
+
+        # ----- พิมพ์คำค้นหา (ถ้ามี q) -----
+        q = self.q
+        if not q:
+            return
+        typed = False
+        try:
+            selectors = [
+                (By.XPATH, '//section//form//input'),
+                (By.CSS_SELECTOR, 'section form input[type="text"]'),
+                (By.CSS_SELECTOR, 'input[placeholder*="ค้นหา"]'),
+                (By.CSS_SELECTOR, 'input[type="search"]'),
+            ]
+            for by, sel in selectors:
+                try:
+                    search_input = WebDriverWait(driver, 5).until(
+                        EC.presence_of_element_located((by, sel))
+                    )
+                    search_input.clear()
+                    search_input.send_keys(q)
+                    track_network(driver)
+                    search_input.send_keys(Keys.ENTER)
+                    wait_network_idle(driver, idle_ms=400, timeout=6)
+                    dismiss_banners(driver)
+                    typed = True
+                    print(f"KAIDEE: typed query via {sel!r}")
+                    break
+                except Exception:
+                    continue
+
+            if not typed:
+                track_network(driver)
+                driver.execute_script("""
+                    const candidates = [
+                      'section form input[type="text"]',
+                      'input[placeholder*="ค้นหา"]',
+                      'input[type="search"]',
+                      'section form input'
+                    ];
+                    for (const s of candidates) {
+                      const el = document.querySelector(s);
+                      if (el) {
+                        el.value = arguments[0];
+                        el.dispatchEvent(new Event('input', {bubbles:true}));
+                        el.dispatchEvent(new KeyboardEvent('keydown', {key:'Enter', bubbles:true}));
+                        return true;
+                      }
+                    }
+                    return false;
+                """, q)
+                wait_network_idle(driver, idle_ms=400, timeout=6)
+                dismiss_banners(driver)
+                print("KAIDEE: typed query via JS fallback")
+        except Exception as e:
+            print("KAIDEE: search typing error:", e)
+
+    def collect_links(self, driver, limit: int) -> List[str]:
+        return wait_for_results(driver, max_tries=15, sleep_sec=1.0)[:limit]
+
+    def parse_detail(self, driver, link: str) -> Dict:
+        driver.get(link)
+        wait_body(driver, timeout=12)
+        dismiss_banners(driver)
+        data = parse_detail_page(driver)
+        data["ลิงก์"] = link
+        return data
+
+    def to_car_row(self, data: Dict) -> Optional[Dict]:
+        source_url = data.get("ลิงก์") or data.get("url") or data.get("link")
+        if not source_url:
+            return None
+
+        title = data.get("ชื่อประกาศ") or data.get("title")
+        brand = data.get("ยี่ห้อ") or data.get("brand")
+        model = data.get("รุ่น") or data.get("model")
+
+        province = (
+            data.get("จังหวัด")
+            or data.get("ที่อยู่")
+            or data.get("ตำแหน่ง")
+            or data.get("location")
+        )
+
+        return {
+            "source": self.name,
+            "url": source_url,
+            "title": title or (f"{brand or ''} {model or ''}".strip() or "ไม่ระบุชื่อ"),
+            "price_thb": to_int(data.get("ราคา") or data.get("price")),
+            "brand": brand,
+            "model": model,
+            "year": to_int(data.get("ปีรถ") or data.get("year")),
+            "mileage_km": to_int(data.get("เลขไมล์") or data.get("mileage")),
+            "province": province,
+            "image_url": data.get("รูปภาพ"),
+            "extra": data,
+        }
+
+    def log_item(self, idx: int, link: str, data: Dict, row: Dict) -> None:
+        if self.options.get("debug_fuel"):
+            fuel_val = (
+                data.get("เชื้อเพลิง")
+                or data.get("ประเภทเชื้อเพลิง")
+                or data.get("fuel_type_normalized")
+                or "N/A"
+            )
+            print(f"[FUEL] #{idx} -> {fuel_val} | url={link}")
+
+        if self.options.get("debug_body"):
+            body_raw = (
+                data.get("body_type_th")
+                or data.get("ประเภทรถ")
+                or data.get("ประเภทตัวถัง")
+                or ""
+            )
+            print(
+                f"[BODY] #{idx} raw='{body_raw}' | en='{data.get('body_type_en') or ''}' | "
+                f"display='{data.get('ประเภทรถ') or data.get('ประเภทตัวถัง') or ''}' | "
+                f"norm='{data.get('body_type_normalized') or ''}' | url={link}"
+            )
+
+        print(
+            f"#{idx} ok -> {data.get('ยี่ห้อ','?')} {data.get('รุ่น','?')} "
+            f"price={data.get('ราคา')} | seller={data.get('ผู้ขาย')} | loc={data.get('จังหวัด') or data.get('ที่อยู่')}"
+        )
+
+
+ADAPTER = KaideeAdapter
@@ -0,0 +1,462 @@
+# app/scrapers/normalize.py
+# -*- coding: utf-8 -*-
+"""
+ตาราง mapping สี / น้ำมัน / เกียร์ / body type / จังหวัด (ไทย → อังกฤษ) ที่ทุก source ใช้ร่วมกัน
+
+เดิมแต่ละ scripts/scrape_*.py ก๊อปตารางของตัวเองไว้ ตอนรวมใช้ชุดที่ครบที่สุด:
+- สี: ชุดของ kaidee/roddonjai + "บรอนซ์"/"อื่น" จาก carsome
+- น้ำมัน: ชุดของ roddonjai (มี LPG/NGV และคำอังกฤษ) — carsome แสดงเบนซินเป็น "Petrol" ผ่าน overrides
+- body type: pattern ของ kaidee + ตารางของ roddonjai
+
+ตารางถูก compile เป็น Matcher (Aho-Corasick) ครั้งเดียวตอน import: หา key ทุกตัวในข้อความด้วยการไล่
+ตัวอักษรรอบเดียว แทนการวน `key in text` ทีละ key (จังหวัด 80 key ต่อรถ 1 คัน) — ผลเหมือนเดิมทุกประการ
+คือ key ที่อยู่ก่อนในตารางชนะ ไม่ว่าจะเจอตรงไหนของข้อความ
+ค่าจากหน้าประกาศซ้ำกันมาก (เบนซิน / เกียร์อัตโนมัติ / ...) จึงมีตาราง exact-match ที่คำนวณไว้ตอน import
+และ lru_cache ต่อ normalizer — ข้อความที่เคยเจอแล้วไม่ต้องไล่ automaton ซ้ำ
+ใช้ร่วมกันทั้ง scraper (ตอน parse) และคอลัมน์ filter ของ car_cache (attr_columns / attr_filter_values)
+benchmark: scripts/bench_normalize.py
+"""
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+COLOR_MAP_TH_EN = {
+    "ดำ": "Black",
+    "ขาว": "White",
+    "เทา": "Gray",
+    "เงิน": "Silver",
+    "แดง": "Red",
+    "น้ำเงิน": "Blue",
+    "ฟ้า": "Light Blue",
+    "เขียว": "Green",
+    "ส้ม": "Orange",
+    "เหลือง": "Yellow",
+    "ชมพู": "Pink",
+    "ม่วง": "Purple",
+    "น้ำตาล": "Brown",
+    "ทอง": "Gold",
+    "เบจ": "Beige",
+    "ครีม": "Cream",
+    "บรอนซ์เงิน": "Silver",
+    "บรอนซ์ทอง": "Gold",
+    "บรอนซ์": "Bronze",
+    "กากี": "Khaki",
+    "กรมท่า": "Navy Blue",
+    "โรสโกลด์": "Rose Gold",
+    "เนื้อ": "Nude",
+    "หลากสี": "Multicolor",
+    "อื่น": "Other",
+}
+
+FUEL_MAP_TH_EN = {
+    "เบนซิน": "Benzine",
+    "ดีเซล": "Diesel",
+    "ไฮบริด": "Hybrid",
+    "ไฟฟ้า": "EV",
+    "EV/ไฟฟ้า": "EV",
+    "ปลั๊กอินไฮบริด": "PHEV",
+    "LPG": "LPG",
+    "NGV": "NGV",
+    "LPG/NGV": "LPG/NGV",
+}
+
+TRANSMISSION_MAP_TH_EN = {
+    "เกียร์ธรรมดา": "Manual",
+    "ธรรมดา": "Manual",
+    "mt": "Manual",
+    "เอ็มที": "Manual",
+    "เกียร์อัตโนมัติ": "Automatic",
+    "อัตโนมัติ": "Automatic",
+    "auto": "Automatic",
+    "at": "Automatic",
+    "เอที": "Automatic",
+}
+
+BODY_TYPE_MAP_TH_EN = {
+    "รถเก๋ง": "Sedan",
+    "เก๋ง": "Sedan",
+    "รถเก๋งซีดาน": "Sedan",
+    "รถเก๋งขนาดกลาง/ใหญ่": "Large Sedan",
+    "รถสปอร์ต": "Sport",
+    "ซุปเปอร์สปอร์ต": "Super Sport",
+    "รถสปอร์ต/ซุปเปอร์สปอร์ต": "Sport / Super Sport",
+    "รถอเนกประสงค์": "MPV/SUV/PPV",
+    "อเนกประสงค์": "MPV/SUV/PPV",
+    "รถตู้": "Van",
+    "ตู้": "Van",
+    "รถกระบะ": "Pickup",
+    "กระบะ": "Pickup",
+}
+
+# จังหวัดไทยทั้งหมด → อังกฤษ
+PROVINCE_MAP_TH_EN = {
+    "กรุงเทพมหานคร": "Bangkok",
+    "กรุงเทพฯ": "Bangkok",
+    "กรุงเทพ": "Bangkok",
+    "กทม": "Bangkok",
+    "กระบี่": "Krabi",
+    "กาญจนบุรี": "Kanchanaburi",
+    "กาฬสินธุ์": "Kalasin",
+    "กำแพงเพชร": "Kamphaeng Phet",
+    "ขอนแก่น": "Khon Kaen",
+    "จันทบุรี": "Chanthaburi",
+    "ฉะเชิงเทรา": "Chachoengsao",
+    "ชลบุรี": "Chonburi",
+    "ชัยนาท": "Chai Nat",
+    "ชัยภูมิ": "Chaiyaphum",
+    "ชุมพร": "Chumphon",
+    "เชียงราย": "Chiang Rai",
+    "เชียงใหม่": "Chiang Mai",
+    "ตรัง": "Trang",
+    "ตราด": "Trat",
+    "ตาก": "Tak",
+    "นครนายก": "Nakhon Nayok",
+    "นครปฐม": "Nakhon Pathom",
+    "นครพนม": "Nakhon Phanom",
+    "นครราชสีมา": "Nakhon Ratchasima",
+    "โคราช": "Nakhon Ratchasima",
+    "นครศรีธรรมราช": "Nakhon Si Thammarat",
+    "นครสวรรค์": "Nakhon Sawan",
+    "นนทบุรี": "Nonthaburi",
+    "นราธิวาส": "Narathiwat",
+    "น่าน": "Nan",
+    "บึงกาฬ": "Bueng Kan",
+    "บุรีรัมย์": "Buri Ram",
+    "ปทุมธานี": "Pathum Thani",
+    "ประจวบคีรีขันธ์": "Prachuap Khiri Khan",
+    "ปราจีนบุรี": "Prachin Buri",
+    "ปัตตานี": "Pattani",
+    "พระนครศรีอยุธยา": "Phra Nakhon Si Ayutthaya",
+    "อยุธยา": "Phra Nakhon Si Ayutthaya",
+    "พังงา": "Phang Nga",
+    "พัทลุง": "Phatthalung",
+    "พิจิตร": "Phichit",
+    "พิษณุโลก": "Phitsanulok",
+    "เพชรบุรี": "Phetchaburi",
+    "เพชรบูรณ์": "Phetchabun",
+    "แพร่": "Phrae",
+    "ภูเก็ต": "Phuket",
+    "มหาสารคาม": "Maha Sarakham",
+    "มุกดาหาร": "Mukdahan",
+    "แม่ฮ่องสอน": "Mae Hong Son",
+    "ยโสธร": "Yasothon",
+    "ยะลา": "Yala",
+    "ร้อยเอ็ด": "Roi Et",
+    "ระนอง": "Ranong",
+    "ระยอง": "Rayong",
+    "ราชบุรี": "Ratchaburi",
+    "ลพบุรี": "Lopburi",
+    "ลำปาง": "Lampang",
+    "ลำพูน": "Lamphun",
+    "เลย": "Loei",
+    "ศรีสะเกษ": "Si Sa Ket",
+    "สกลนคร": "Sakon Nakhon",
+    "สงขลา": "Songkhla",
+    "สตูล": "Satun",
+    "สมุทรปราการ": "Samut Prakan",
+    "สมุทรสงคราม": "Samut Songkhram",
+    "สมุทรสาคร": "Samut Sakhon",
+    "สระแก้ว": "Sa Kaeo",
+    "สระบุรี": "Saraburi",
+    "สิงห์บุรี": "Sing Buri",
+    "สุโขทัย": "Sukhothai",
+    "สุพรรณบุรี": "Suphan Buri",
+    "สุราษฎร์ธานี": "Surat Thani",
+    "สุรินทร์": "Surin",
+    "หนองคาย": "Nong Khai",
+    "หนองบัวลำภู": "Nong Bua Lamphu",
+    "อ่างทอง": "Ang Thong",
+    "อำนาจเจริญ": "Amnat Charoen",
+    "อุดรธานี": "Udon Thani",
+    "อุตรดิตถ์": "Uttaradit",
+    "อุทัยธานี": "Uthai Thani",
+    "อุบลราชธานี": "Ubon Ratchathani",
+}
+
+
+def _no_space(s: str) -> str:
+    return re.sub(r"\s+", "", s)
+
+
+def _no_space_lower(s: str) -> str:
+    return re.sub(r"\s+", "", s).lower()
+
+
+class Matcher:
+    """
+    Aho-Corasick automaton ของ (key, value) — find(text) คืนคู่ที่ key อยู่ลำดับแรกสุดในรายการ
+    จากทุก key ที่เป็น substring ของ text (= ผลของการวน `for key in table: if key in text`)
+    fold: แปลงทั้ง key และ text ก่อนเทียบ (เช่น ตัดช่องว่าง / lower)
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]], fold: Callable[[str], str] = _no_space):
+        self.fold = fold
+        self.pairs: List[Tuple[str, str]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[int]] = [None]  # ลำดับ key ที่ดีที่สุดที่จบที่ node นี้ (รวม fail chain)
+
+        for key, value in pairs:
+            k = fold(key)
+            if not k:
+                continue
+            node = 0
+            for ch in k:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                node = nxt
+            if self._best[node] is None:  # key ซ้ำหลัง fold → ตัวแรกชนะเหมือนการวน dict
+                self._best[node] = len(self.pairs)
+            self.pairs.append((key, value))
+        self._build_fail_links()
+        # ข้อความที่เท่ากับ key พอดี (กรณีที่พบบ่อยสุด) → ลำดับที่ชนะ คำนวณไว้เลย
+        self._exact: Dict[str, Optional[int]] = {fold(k): self._scan(fold(k)) for k, _ in self.pairs}
+
+    def _build_fail_links(self) -> None:
+        # BFS ตั้ง fail link แล้วรวม best ของ suffix เข้ามา
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                inherited = self._best[self._fail[nxt]]
+                if inherited is not None and (self._best[nxt] is None or inherited < self._best[nxt]):
+                    self._best[nxt] = inherited
+                queue.append(nxt)
+
+    def find_index(self, text: str) -> Optional[int]:
+        if not text:
+            return None
+        t = self.fold(text)
+        if t in self._exact:
+            return self._exact[t]
+        return self._scan(t)
+
+    def _scan(self, t: str) -> Optional[int]:
+        goto, fail, best_at = self._goto, self._fail, self._best
+        best = None
+        node = 0
+        for ch in t:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            b = best_at[node]
+            if b is not None and (best is None or b < best):
+                best = b
+                if best == 0:
+                    break
+        return best
+
+    def find(self, text: str) -> Optional[Tuple[str, str]]:
+        i = self.find_index(text)
+        return self.pairs[i] if i is not None else None
+
+    def get(self, text: str, default: str = "") -> str:
+        i = self.find_index(text)
+        return self.pairs[i][1] if i is not None else default
+
+
+COLOR_MATCHER = Matcher(COLOR_MAP_TH_EN.items())
+
+# ตารางก่อน แล้วคำอังกฤษที่เว็บ/ฟอร์มค้นหาใช้ (plug-in ต้องมาก่อน hybrid)
+FUEL_MATCHER = Matcher(
+    list(FUEL_MAP_TH_EN.items()) + [
+        ("diesel", "Diesel"),
+        ("benzin", "Benzine"),
+        ("gasoline", "Benzine"),
+        ("petrol", "Benzine"),
+        ("plug-in", "PHEV"),
+        ("phev", "PHEV"),
+        ("hybrid", "Hybrid"),
+        ("ev", "EV"),
+        ("electric", "EV"),
+    ],
+    fold=_no_space_lower,
+)
+
+TRANSMISSION_MATCHER = Matcher(
+    list(TRANSMISSION_MAP_TH_EN.items()) + [("manual", "Manual"), ("automatic", "Automatic")],
+    fold=_no_space_lower,
+)
+
+# กฎ body type เรียงตามลำดับความสำคัญ (บนชนะ) ตามด้วยตารางใหญ่
+_BODY_TYPE_RULES = [
+    ("รถเก๋ง5ประตู", "Hatchback"),        # 0
+    ("รถเก๋ง4ประตู", "Sedan"),            # 1
+    ("รถเก๋ง2ประตู", "Coupe"),            # 2
+    ("เปิดประทุน", "Convertible"),        # 3
+    ("รถตู้บรรทุกสินค้า", "Cargo Van"),    # 4
+    ("รถตู้", "Van"),                     # 5
+    ("รถกระบะ2ประตูตอนเดียว", "Single Cab Pickup"),   # 6
+    ("รถกระบะ2ประตูตอนครึ่ง", "Extended Cab Pickup"),  # 7
+    ("รถกระบะ4ประตู", "Double Cab Pickup"),           # 8
+    ("รถSUV", "SUV"),                     # 9
+    ("รถPPV", "PPV"),                     # 10
+    ("รถMPV", "MPV"),                     # 11
+]
+BODY_TYPE_MATCHER = Matcher(_BODY_TYPE_RULES + list(BODY_TYPE_MAP_TH_EN.items()))
+
+# กฎที่ดูข้อความดิบ (ภาษาอังกฤษ) — ลำดับเดียวกับ _BODY_TYPE_RULES ข้างบน
+_SUV_RE = re.compile(r"\bSUV\b")
+_PPV_RE = re.compile(r"\bPPV\b")
+_MPV_RE = re.compile(r"\bMPV\b")
+_BODY_TYPE_RAW_RULES = [
+    (0, lambda raw: "Sedan" in raw and "5" in raw and "ประตู" in raw, "Hatchback"),
+    (1, lambda raw: "Sedan" in raw and "4" in raw and "ประตู" in raw, "Sedan"),
+    (9, _SUV_RE.search, "SUV"),
+    (10, _PPV_RE.search, "PPV"),
+    (11, _MPV_RE.search, "MPV"),
+]
+
+# จังหวัดเทียบกับข้อความตรง ๆ (ไม่ตัดช่องว่าง)
+PROVINCE_MATCHER = Matcher(PROVINCE_MAP_TH_EN.items(), fold=lambda s: s)
+
+
+@lru_cache(maxsize=4096)
+def normalize_color_th_to_en(s: str) -> str:
+    if not s:
+        return ""
+    return COLOR_MATCHER.get(s)
+
+
+def normalize_fuel_th_to_en(s: str, overrides: Optional[Dict[str, str]] = None) -> str:
+    """overrides: เปลี่ยนชื่อที่แสดงราย source เช่น carsome ใช้ {"Benzine": "Petrol"}"""
+    if not s:
+        return ""
+    en = _fuel_en(s)
+    return (overrides or {}).get(en, en)
+
+
+@lru_cache(maxsize=4096)
+def _fuel_en(s: str) -> str:
+    return FUEL_MATCHER.get(s)
+
+
+@lru_cache(maxsize=4096)
+def normalize_transmission_th_to_en(s: str) -> str:
+    if not s:
+        return ""
+    return TRANSMISSION_MATCHER.get(s)
+
+
+@lru_cache(maxsize=4096)
+def normalize_body_type_th_to_en(s: str) -> str:
+    """แปลงทุกข้อความที่เกี่ยวกับประเภทรถให้เป็น EN เดียว เช่น 'รถเก๋ง 5 ประตู' → Hatchback"""
+    if not s:
+        return ""
+    best = BODY_TYPE_MATCHER.find_index(s)
+    for rank, rule, en in _BODY_TYPE_RAW_RULES:
+        if best is not None and rank >= best:
+            break
+        if rule(s):
+            return en
+    return BODY_TYPE_MATCHER.pairs[best][1] if best is not None else ""
+
+
+@lru_cache(maxsize=4096)
+def normalize_province_from_location(loc: str) -> Tuple[str, str]:
+    """รับสตริงตำแหน่ง (เช่น 'บางกรวย นนทบุรี') คืน (province_en, province_th_found)"""
+    if not loc:
+        return "", ""
+    hit = PROVINCE_MATCHER.find(loc)
+    if hit:
+        return hit[1], hit[0]
+    return "", ""
+
+
+_NORMALIZERS = {
+    "body_type": normalize_body_type_th_to_en,
+    "fuel_type": normalize_fuel_th_to_en,
+    "transmission": normalize_transmission_th_to_en,
+    "color": normalize_color_th_to_en,
+}
+
+# คีย์ใน extra ที่เก็บค่าดิบของแต่ละคอลัมน์ (ตัวแรกที่มีค่าชนะ) — ("สเปกย่อย", k) = extra["สเปกย่อย"][k]
+ATTR_KEYS = {
+    "body_type": ("ประเภทรถ", "ตัวถัง", "ประเภทตัวถัง", ("สเปกย่อย", "ประเภทรถ"), "body_type",
+                  "body_type_normalized"),
+    "fuel_type": ("เชื้อเพลิง", "น้ำมัน", ("สเปกย่อย", "เชื้อเพลิง"), ("สเปกย่อย", "น้ำมัน"),
+                  "fuel_type_normalized"),
+    "transmission": ("เกียร์", "ระบบเกียร์", ("สเปกย่อย", "เกียร์"), "transmission_normalized"),
+    "color": ("สี", ("สเปกย่อย", "สี"), "color_normalized"),
+}
+
+ATTR_MAX_LEN = 40
+
+# ค่าที่ normalizer คืนได้ทั้งหมด (ตัวเล็ก) — ใช้แปลงค่าที่ผู้ใช้เลือกเป็นชุดค่าสำหรับ WHERE col IN (...)
+_VOCAB = {
+    "body_type": {v.lower() for _, v in BODY_TYPE_MATCHER.pairs},
+    "fuel_type": {v.lower() for _, v in FUEL_MATCHER.pairs},
+    "transmission": {v.lower() for _, v in TRANSMISSION_MATCHER.pairs},
+    "color": {v.lower() for _, v in COLOR_MATCHER.pairs},
+}
+
+
+def _raw_attr(extra: Dict, keys) -> str:
+    for k in keys:
+        if isinstance(k, tuple):
+            sub = extra.get(k[0])
+            v = sub.get(k[1]) if isinstance(sub, dict) else None
+        else:
+            v = extra.get(k)
+        v = str(v).strip() if v is not None else ""
+        if v:
+            return v
+    return ""
+
+
+def attr_columns(extra: Optional[Dict]) -> Dict[str, Optional[str]]:
+    """
+    extra ของประกาศ → ค่าคอลัมน์ body_type / fuel_type / transmission / color ของ car_cache
+    เก็บชื่อมาตรฐานตัวเล็ก (เช่น 'sedan', 'benzine') ถ้าแปลงไม่ได้เก็บค่าดิบตัวเล็ก ไม่มีค่า = None
+    (filter จับค่าดิบด้วย substring — ดู attr_value_matches)
+    """
+    extra = extra if isinstance(extra, dict) else {}
+    out: Dict[str, Optional[str]] = {}
+    for col, keys in ATTR_KEYS.items():
+        raw = _raw_attr(extra, keys)
+        val = (_NORMALIZERS[col](raw) or raw).lower() if raw else ""
+        out[col] = val[:ATTR_MAX_LEN] or None
+    return out
+
+
+def attr_filter_values(col: str, wanted: str) -> List[str]:
+    """
+    ค่าที่ผู้ใช้เลือก (เช่น Gasoline / Pickup) → ค่าในคอลัมน์ที่นับว่าตรง
+    ('pickup' → pickup / single cab pickup / double cab pickup / ...) ใช้กับ WHERE col IN (...) ที่วิ่งบน B-tree index ได้
+    """
+    wanted = (wanted or "").strip()
+    if not wanted:
+        return []
+    w = (_NORMALIZERS[col](wanted) or wanted).lower()
+    values = {v for v in _VOCAB[col] if w == v or w in re.split(r"[\s/]+", v)}
+    values.add(w)
+    values.add(wanted.lower()[:ATTR_MAX_LEN])
+    return sorted(values)
+
+
+def attr_vocab(col: str) -> List[str]:
+    """ชื่อมาตรฐานทั้งหมดของคอลัมน์ — ค่าอื่นในคอลัมน์คือค่าดิบที่ attr_columns แปลงไม่ได้"""
+    return sorted(_VOCAB[col])
+
+
+def attr_needle(wanted: str) -> str:
+    """ค่าที่ผู้ใช้เลือก → substring ที่ใช้เทียบกับค่าดิบ (เหมือน filter เดิม `wanted in value`)"""
+    return (wanted or "").strip().lower()
+
+
+def attr_value_matches(col: str, value: str, values: List[str], needle: str) -> bool:
+    """
+    เงื่อนไขเดียวกับ attr_conds ใน SQL: ตรงกับ attr_filter_values หรือเป็นค่าดิบนอก vocab ที่มี needle อยู่
+    ('pickup 4 door' ยังผ่าน filter Pickup เหมือนเดิม แต่ 'phev' ไม่ผ่าน filter EV)
+    """
+    return value in values or (bool(needle) and value not in _VOCAB[col] and needle in value)
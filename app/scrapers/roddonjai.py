@@ -0,0 +1,446 @@
+# app/scrapers/roddonjai.py
+# -*- coding: utf-8 -*-
+"""
+RodDonJai — ค้นหาผ่าน URL (keyword=...), หน้า list เป็น infinite scroll, หน้า detail parse จาก HTML ล้วน (ลอง HTTP ก่อน)
+
+ตัวอย่างรัน:
+  python scripts\\scrape_roddonjai.py --q "Honda City" --min 0 --max 999999999 --limit 40 --chromedriver "C:\\File\\CARCOM\\backend\\chromedriver.exe" --headless --debug-fuel --debug-detail
+"""
+import re
+from typing import Optional, Dict, List
+from urllib.parse import urljoin, quote_plus
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException  # สำหรับกัน wait timeout
+
+from app.scrapers.base import SourceAdapter
+from app.scrapers.common import extract_year, to_int, wait_any
+from app.scrapers.normalize import (
+    normalize_body_type_th_to_en,
+    normalize_color_th_to_en,
+    normalize_fuel_th_to_en,
+    normalize_province_from_location,
+    normalize_transmission_th_to_en,
+)
+from app.services.waits import auto_scroll_until_stable, wait_dom_quiet, wait_selector_count
+
+BASE_URL = "https://www.roddonjai.com/"
+CARD_CSS = 'a[href^="/service/car-detail/"]'
+
+
+def clean_money(t: str) -> str:
+    """
+    แปลงข้อความราคามาเป็นตัวเลขล้วน เช่น:
+      '528,000.-' -> '528,000'
+      '฿ 528,000 บาท' -> '528,000'
+    ถ้าหา pattern ตัวเลขไม่เจอ -> ''
+    """
+    t = (t or "").strip()
+    if not t:
+        return ""
+    m = re.search(r"(\d[\d,\.]*)", t)
+    if not m:
+        return ""
+    val = m.group(1)
+    if val.endswith("."):
+        val = val[:-1]
+    return val
+
+
+def is_sold_in_anchor(a_tag) -> bool:
+    if a_tag is None:
+        return False
+    if a_tag.select_one("p.MuiTypography-root.css-1m41lnq"):
+        return True
+    return "ขายแล้ว" in a_tag.get_text(" ", strip=True)
+
+
+def collect_links(driver, limit: int, exclude_sold: bool = True) -> List[str]:
+    html = driver.page_source
+    soup = BeautifulSoup(html, "html.parser")
+
+    links, seen = [], set()
+    kept, sold = 0, 0
+
+    for a in soup.select(CARD_CSS):
+        href = (a.get("href") or "").strip()
+        href = re.sub(r"[#?].*$", "", href).rstrip("/")
+        if not href:
+            continue
+        full = urljoin(driver.current_url, href)
+        if full in seen:
+            continue
+
+        flag_sold = is_sold_in_anchor(a)
+        if exclude_sold and flag_sold:
+            sold += 1
+            continue
+
+        links.append(full)
+        seen.add(full)
+        kept += 1
+
+        if len(links) >= limit:
+            break
+
+    print(f"[RODDONJAI] collected total={kept+sold} kept={kept} sold_skipped={sold}")
+    return links[:limit]
+
+
+def parse_detail_html(html: str, url: str, debug: bool = False) -> Dict:
+    """ดึงข้อมูลจากหน้า detail ของ RodDonJai แล้ว map เป็นโครงเดียวกับที่ CARCOM ใช้"""
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    def sel_text(selector, default=""):
+        el = soup.select_one(selector)
+        return (el.get_text(strip=True) if el else default) or default
+
+    # ------------- ชื่อรถ -------------
+    title = (
+        sel_text(".css-ldavcx p")
+        or sel_text(".mui-ldavcx p")
+        or sel_text("h1,h2,.jss420")
+        or "ไม่พบชื่อรุ่น"
+    )
+
+    # ------------- ราคา -------------
+    raw_price = ""
+
+    if not raw_price:
+        raw_price = sel_text(
+            "p.MuiTypography-root.MuiTypography-body1.css-13bl6la"
+        ) or sel_text("p.MuiTypography-root.MuiTypography-body1.mui-13bl6la")
+
+    if not raw_price:
+        raw_price = sel_text("p.MuiTypography-subtitle1.jss275")
+
+    if not raw_price:
+        for p in soup.select("p"):
+            t = p.get_text(strip=True)
+            if re.search(r"\d{2,3}[.,]\d{3}", t):
+                raw_price = t
+                break
+
+    price_clean = clean_money(raw_price) if raw_price else ""
+    price_int = to_int(price_clean)
+
+    # ------------- ตารางสเปก -------------
+    specs: Dict[str, str] = {}
+    for row in soup.select(
+        ".MuiCollapse-wrapperInner .MuiGrid-item .d-flex.justify-content-between.mb-1"
+    ):
+        ps = row.select("p")
+        if len(ps) >= 2:
+            k = ps[0].get_text(strip=True)
+            v = ps[1].get_text(strip=True)
+            if k and v:
+                specs[k] = v
+
+    # ------------- ผู้ขาย -------------
+    seller = sel_text("p.mui-12zbq1l") or specs.get("ผู้ขาย") or None
+
+    # ------------- จังหวัด / ที่อยู่ -------------
+    province_raw = sel_text("p.css-1ijcpbd")
+    if not province_raw:
+        province_raw = (
+            sel_text("div.jss197 p.mui-1frg2by")
+            or sel_text("div.jss116 p.mui-1frg2by")
+            or sel_text("p.mui-1frg2by")
+        )
+
+    prov_en, prov_th = normalize_province_from_location(province_raw or "")
+    province = prov_en or province_raw or None
+
+    # ------------- เลขไมล์ -------------
+    mileage_km: Optional[int] = None
+
+    if "เลขไมล์" in specs:
+        m = re.search(r"([\d,]+)", specs["เลขไมล์"])
+        if m:
+            mileage_km = to_int(m.group(1))
+
+    if mileage_km is None:
+        block = soup.find("div", class_="mui-1rx0p6b")
+        if block:
+            label = block.find("p", string=lambda x: x and "เลขไมล์" in x)
+            if label:
+                val_p = label.find_next("p")
+                if val_p:
+                    mileage_km = to_int(val_p.get_text(strip=True))
+
+    if mileage_km is not None:
+        specs.setdefault("เลขไมล์", f"{mileage_km:,} กม.")
+    else:
+        specs.setdefault("เลขไมล์", "—")
+
+        # ------------- รูปภาพ -------------
+    image_url = None
+
+
+    main_img = soup.select_one(
+        '.slick-slider.slider.car-profile div.slick-slide[data-index="0"] img[src*="WATERMARK"]'
+    )
+
+
+    if not main_img:
+        main_img = soup.select_one(
+            '.slick-slider.slider.car-profile div.slick-slide:not(.slick-cloned) img[src*="WATERMARK"]'
+        )
+
+    if main_img:
+        src = (main_img.get("src") or "").strip()
+        if src.startswith("http"):
+            image_url = src
+
+
+    if not image_url:
+        for im in soup.select('img[src*="WATERMARK"]'):
+            src = (im.get("src") or "").strip()
+            if src.startswith("http"):
+                image_url = src
+                break
+
+
+
+    brand = specs.get("ยี่ห้อ") or ""
+    model = specs.get("รุ่น") or ""
+
+    if not brand or not model:
+        m = re.match(r"([A-Za-zก-ฮ]+)\s+(.+)", title)
+        if m:
+            if not brand:
+                brand = m.group(1)
+            if not model:
+                model = m.group(2)
+
+    brand = brand or None
+    model = model or None
+
+
+    year = None
+    for key in ["ปี", "ปีผลิต", "ปีจดทะเบียน", "ปีที่จดทะเบียน"]:
+        if key in specs:
+            year = extract_year(specs.get(key) or "")
+            if year:
+                break
+    if not year:
+        year = extract_year(title)
+
+    # ------------- Normalization: fuel / color / body / gear -------------
+    # fuel: ใช้จาก "ประเภทเครื่องยนต์" หรือ "เชื้อเพลิง" ถ้ามี
+    fuel_val_raw = (specs.get("ประเภทเครื่องยนต์") or specs.get("เชื้อเพลิง") or "").strip()
+    fuel_en = normalize_fuel_th_to_en(fuel_val_raw)
+    fuel_display = fuel_en or fuel_val_raw
+    if fuel_display:
+        specs["ประเภทเครื่องยนต์"] = fuel_display
+        specs["เชื้อเพลิง"] = fuel_display
+
+    # color
+    color_th = (specs.get("สี") or "").strip()
+    color_en = normalize_color_th_to_en(color_th)
+    color_display = color_en or color_th
+    if color_display:
+        specs["สี"] = color_display
+
+    # body type
+    body_main_th = (specs.get("ประเภท") or specs.get("ประเภทรถ") or "").strip()
+    body_sub_th = (specs.get("ประเภทย่อย") or "").strip()
+    body_source = body_sub_th or body_main_th
+    body_en = normalize_body_type_th_to_en(body_source or body_main_th)
+    body_display = body_en or body_source or body_main_th
+    if body_display:
+        specs["ประเภทรถ"] = body_display
+        specs["ประเภท"] = body_display
+    # ไม่อยากให้โชว์วงเล็บไทยซ้ำ
+    specs["ประเภทย่อย"] = ""
+
+    # transmission
+    gear_raw = (specs.get("เกียร์") or "").strip()
+    gear_en = normalize_transmission_th_to_en(gear_raw)
+    gear_display = gear_en or gear_raw
+    if gear_display:
+        specs["เกียร์"] = gear_display
+
+    # ------------- เชื้อเพลิง (ใช้ค่าที่ normalize แล้ว) -------------
+    fuel_type = fuel_display
+    fuel_key = "ประเภทเครื่องยนต์" if fuel_type else ""
+    fuel_method = "specs" if fuel_type else "not-found"
+
+    # ------------- attrs_json -------------
+    attrs: Dict[str, object] = {
+        "ผู้ขาย": seller or "RODDONJAI",
+        "ชื่อรุ่น": title,
+        "ราคา(บาท)": price_clean or raw_price or "",
+        "เลขไมล์(กม.)": f"{mileage_km:,}" if mileage_km is not None else "",
+        "จังหวัด": province or "",
+        "จังหวัด_th": prov_th or "",
+        "สเปกย่อย": specs,
+        "body_type_th": body_source or body_main_th,
+        "body_type_en": body_en or "",
+        "body_type_normalized": (body_en or body_display or "").lower(),
+        "color_th": color_th,
+        "color_en": color_en or "",
+        "color_normalized": (color_display or "").lower(),
+        "transmission_th": gear_raw,
+        "transmission_en": gear_en or "",
+        "transmission_normalized": (gear_display or "").lower(),
+    }
+
+    if fuel_type:
+        attrs["ประเภทเชื้อเพลิง"] = fuel_type
+        attrs["เชื้อเพลิง"] = fuel_type
+        attrs["fuel_type_normalized"] = fuel_type.lower()
+        attrs["fuel_type_th"] = fuel_val_raw
+        attrs["fuel_type_en"] = fuel_en or ""
+        if isinstance(attrs.get("สเปกย่อย"), dict):
+            attrs["สเปกย่อย"].setdefault("เชื้อเพลิง", fuel_type)
+
+    debug_fuel = {"value": fuel_type, "key": fuel_key, "method": fuel_method}
+
+    if debug:
+        print("======== RODDONJAI DETAIL DEBUG ========")
+        print(f"url           : {url}")
+        print(f"title         : {title!r}")
+        print(f"raw_price     : {raw_price!r}")
+        print(f"price_clean   : {price_clean!r}")
+        print(f"price_int     : {price_int!r}")
+        print(f"seller        : {seller!r}")
+        print(f"province_raw  : {province_raw!r}")
+        print(f"province_th   : {prov_th!r}")
+        print(f"province_en   : {province!r}")
+        print(f"brand         : {brand!r}")
+        print(f"model         : {model!r}")
+        print(f"year          : {year!r}")
+        print(f"mileage_km    : {mileage_km!r}")
+        print(f"image_url     : {image_url!r}")
+        print(f"fuel_raw      : {fuel_val_raw!r}")
+        print(f"fuel_en       : {fuel_en!r}")
+        print(f"fuel_display  : {fuel_display!r}")
+        print(f"gear_raw      : {gear_raw!r}")
+        print(f"gear_en       : {gear_en!r}")
+        print(f"gear_display  : {gear_display!r}")
+        print(f"color_th      : {color_th!r}")
+        print(f"color_en      : {color_en!r}")
+        print(f"body_main_th  : {body_main_th!r}")
+        print(f"body_sub_th   : {body_sub_th!r}")
+        print(f"body_en       : {body_en!r}")
+        print(f"body_display  : {body_display!r}")
+        print(f"specs_keys    : {list(specs.keys())}")
+        print(f"debug_fuel    : {debug_fuel}")
+        print("========================================")
+
+    return {
+        "source": "roddonjai",
+        "source_url": url,
+        "title": title,
+        "brand": brand,
+        "model": model,
+        "year": year,
+        "price_thb": price_int,
+        "mileage_km": mileage_km,
+        "province": province,
+        "image_url": image_url,
+        "attrs_json": attrs,
+        "debug_fuel": debug_fuel,
+    }
+
+
+class RoddonjaiAdapter(SourceAdapter):
+    name = "roddonjai"
+    BASE_URL = BASE_URL
+    CARD_CSS = CARD_CSS
+
+    DETAIL_MAX_CONCURRENCY = 3
+    DETAIL_MIN_INTERVAL_SEC = 0.5
+
+    # หน้า list เป็น infinite scroll → Selenium; หน้า detail parse จาก HTML ล้วน → ลอง HTTP ก่อน
+    FETCH_BACKENDS = {"list": ("selenium",), "detail": ("http", "selenium")}
+
+    # keyword search ของ roddonjai คืนรุ่นใกล้เคียงมาด้วย → เก็บเฉพาะคันที่มีคำค้นครบ
+    KEYWORD_FILTER = True
+
+    DEFAULT_LIMIT = 40
+
+    @classmethod
+    def add_arguments(cls, parser) -> None:
+        parser.add_argument("--include-sold", action="store_true", help="ถ้าใส่ flag นี้ จะแถมคันที่ขายแล้วมาด้วย")
+        parser.add_argument("--debug-fuel", action="store_true", help="พิมพ์ fuel type ต่อคันเพื่อดีบัก")
+        parser.add_argument("--debug-detail", action="store_true", help="พิมพ์ค่าทุก field ที่ดึงได้จากแต่ละ detail page")
+
+    def open_search(self, driver) -> None:
+        q = self.q
+        if q:
+            kw = quote_plus(q)
+            search_url = (
+                "https://www.roddonjai.com/search"
+                "?brandList=&carFuelList=&carInterestList=&carTypeList=&colorCodeList="
+                "&downPercent=&downPrice=&gearList=&installment="
+                f"&keyword={kw}"
+                "&lat=&lng=&locationId=&maxMileage=&maxPrice=20000000"
+                "&minMileage=&minPrice=0&modelList=%7B%7D&provinceList="
+                "&score=&sellerSubTypeList=&sellingPointList=&subModelList=%7B%7D"
+                "&yearFrom=&yearTo="
+            )
+            print(f"RODDONJAI: go search URL with keyword={q!r}")
+            driver.get(search_url)
+        else:
+            print("RODDONJAI: no keyword, go BASE_URL")
+            driver.get(BASE_URL)
+
+        wait_any(driver, ["#scrollDivResult", ".jss249"], timeout=20)
+        wait_selector_count(driver, CARD_CSS, 1, timeout=5)
+
+        # นับการ์ดด้วย querySelectorAll ในหน้า (ไม่ต้อง parse page_source ทั้งหน้าทุกรอบ)
+        auto_scroll_until_stable(driver, css=CARD_CSS, settle_timeout=3.0, max_rounds=120)
+
+    def collect_links(self, driver, limit: int) -> List[str]:
+        return collect_links(driver, limit=limit, exclude_sold=not self.options.get("include_sold"))
+
+    def parse_detail(self, driver, link: str) -> Dict:
+        driver.get(link)
+        try:
+            wait_any(
+                driver,
+                [".css-ldavcx", ".mui-ldavcx", ".MuiCollapse-wrapperInner", "h1", ".jss420"],
+                timeout=15,
+            )
+        except TimeoutException as te:
+            print(f"warn: Timeout waiting detail DOM ({type(te).__name__}) -> {link}")
+            wait_dom_quiet(driver, quiet_ms=300, timeout=2.0)
+        return self.parse_detail_html(driver.page_source, link)
+
+    def parse_detail_html(self, html: str, link: str) -> Dict:
+        return parse_detail_html(html, link, debug=bool(self.options.get("debug_detail")))
+
+    def to_car_row(self, data: Dict) -> Optional[Dict]:
+        source_url = data.get("source_url")
+        if not source_url:
+            return None
+        return {
+            "source": self.name,
+            "url": source_url,
+            "title": data.get("title") or "ไม่ระบุชื่อ",
+            "brand": data.get("brand"),
+            "model": data.get("model"),
+            "year": data.get("year"),
+            "price_thb": data.get("price_thb"),
+            "mileage_km": data.get("mileage_km"),
+            "province": data.get("province"),
+            "image_url": data.get("image_url"),
+            "extra": data.get("attrs_json"),
+        }
+
+    def log_item(self, idx: int, link: str, data: Dict, row: Dict) -> None:
+        if self.options.get("debug_fuel"):
+            dbg = data.get("debug_fuel", {}) or {}
+            print(
+                f"[FUEL] #{idx} -> {dbg.get('value') or 'N/A'} "
+                f"| key={dbg.get('key') or '-'} "
+                f"| method={dbg.get('method') or '-'} "
+                f"| url={link}"
+            )
+        super().log_item(idx, link, data, row)
+
+
+ADAPTER = RoddonjaiAdapter
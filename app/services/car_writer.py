@@ -0,0 +1,101 @@
+# app/services/car_writer.py
+# -*- coding: utf-8 -*-
+"""
+เขียนประกาศที่ scrape ได้ลง car_cache แบบเป็นชุด (แทน select + ORM insert/update + commit ทีละคัน)
+
+- scraper แปลงข้อมูลเป็น dict ของคอลัมน์ (to_car_row) แล้ว add() เข้า buffer
+- flush เมื่อครบ batch_size หรือของในบัฟเฟอร์ค้างเกิน max_delay วินาที (หน้าผลลัพธ์ยังเห็นรถทยอยเข้า)
+  1 batch = INSERT ... ON CONFLICT (source, url) DO UPDATE 1 คำสั่ง + commit 1 ครั้ง
+- body_type / fuel_type / transmission / color คำนวณจาก extra ตอน add (ถ้า scraper ไม่ได้ใส่มาเอง)
+- ค่าที่เป็น None ไม่ทับค่าเดิม (COALESCE), extra (JSONB) merge กับของเดิม, scraped_at/expires_at/last_seen_at ต่ออายุทุกครั้ง
+- นับ inserted / updated จาก RETURNING (xmax = 0) — แถวที่ถูก insert ใหม่ xmax เป็น 0
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import CarCache
+from app.scrapers.normalize import attr_columns
+from app.services.listing_cache import fresh_values
+
+COLUMNS = (
+    "source", "source_id", "url", "title", "brand", "model", "year",
+    "price_thb", "mileage_km", "province", "image_url", "extra", "list_fingerprint",
+    "body_type", "fuel_type", "transmission", "color",
+)
+
+
+class CarWriter:
+    def __init__(self, db, batch_size: int = 25, max_delay: float = 1.0):
+        self.db = db
+        self.batch_size = max(1, int(batch_size))
+        self.max_delay = max_delay
+        self.inserted = 0
+        self.updated = 0
+        self.ids: List[int] = []
+        self._buf: Dict[Tuple[str, str], Dict] = {}
+        self._first_at: Optional[float] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, row: Optional[Dict]) -> None:
+        if not row or not row.get("url") or not row.get("source"):
+            return
+        clean = {k: (None if row.get(k) == "" else row.get(k)) for k in COLUMNS}
+        for k, v in attr_columns(clean.get("extra")).items():
+            if clean[k] is None:
+                clean[k] = v
+        key = (clean["source"], clean["url"])
+        # ประกาศเดียวกันซ้ำใน batch เดียว (ON CONFLICT แก้แถวเดียวซ้ำในคำสั่งเดียวไม่ได้) → รวมเป็นแถวเดียว
+        prev = self._buf.get(key)
+        if prev:
+            extra = {**(prev.get("extra") or {}), **(clean.get("extra") or {})}
+            clean = {**prev, **{k: v for k, v in clean.items() if v is not None}, "extra": extra or None}
+        self._buf[key] = clean
+        if self._first_at is None:
+            self._first_at = time.monotonic()
+        if len(self._buf) >= self.batch_size or time.monotonic() - self._first_at >= self.max_delay:
+            self.flush()
+
+    def flush(self) -> Tuple[int, int]:
+        """เขียนบัฟเฟอร์ลง DB แล้ว commit; คืน (inserted, updated) ของ batch นี้"""
+        if not self._buf:
+            return 0, 0
+        rows = [{**r, **fresh_values()} for r in self._buf.values()]
+        self._buf = {}
+        self._first_at = None
+
+        t = CarCache.__table__
+        stmt = insert(t).values(rows)
+        ex = stmt.excluded
+        update = {c: func.coalesce(ex[c], t.c[c]) for c in COLUMNS if c not in ("source", "url", "extra")}
+        update["extra"] = (
+            func.coalesce(t.c.extra, literal_column("'{}'::jsonb"))
+            .op("||")(func.coalesce(ex.extra, literal_column("'{}'::jsonb")))
+        )
+        for c in ("scraped_at", "expires_at", "last_seen_at"):
+            update[c] = ex[c]
+        stmt = (
+            stmt.on_conflict_do_update(index_elements=[t.c.source, t.c.url], set_=update)
+            .returning(t.c.id, literal_column("(xmax = 0)").label("inserted"))
+        )
+
+        try:
+            result = self.db.execute(stmt).all()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        ins = sum(1 for r in result if r.inserted)
+        upd = len(result) - ins
+        self.inserted += ins
+        self.updated += upd
+        self.ids.extend(int(r.id) for r in result)
+        return ins, upd
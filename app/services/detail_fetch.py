@@ -0,0 +1,170 @@
+# app/services/detail_fetch.py
+# -*- coding: utf-8 -*-
+"""
+เปิดหน้าประกาศ (detail page) หลาย ๆ หน้าพร้อมกันภายใน scraper รอบเดียว
+
+- แต่ละเธรดถือ WebDriver ของตัวเอง (Selenium ใช้ driver เดียวข้ามเธรดไม่ได้):
+  เธรดแรกใช้ driver หลักของ scraper, เธรดที่เหลือเปิด/ยืม driver เพิ่มผ่าน extra_driver()
+  แบบ lazy — เปิดจริงตอน load() แตะ driver ครั้งแรก (ถ้าหน้าโหลดผ่าน HTTP ได้หมด ก็ไม่ต้องเปิด Chrome เพิ่ม)
+- จำนวนเธรดถูกจำกัดด้วย politeness cap ของแต่ละเว็บ + เว้นระยะระหว่าง request ต่อเว็บ (min_interval)
+- คืนผลเป็น generator (idx, link, data, error) ตามลำดับที่โหลดเสร็จ
+  ให้ caller เขียน DB บนเธรดตัวเอง (Session ของ SQLAlchemy ไม่ thread-safe)
+- concurrency=1 ทำงานแบบเดิมทุกอย่าง (ทีละลิงก์ บนเธรดที่เรียก ไม่สร้างเธรดใหม่)
+"""
+import time, queue, threading
+from contextlib import contextmanager, ExitStack
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+DetailResult = Tuple[int, str, Optional[Dict], Optional[Exception]]
+
+
+def quitting(build: Callable[[], Any]) -> Callable[[], ContextManager[Any]]:
+    """ห่อ build_driver() ให้เป็น context manager ที่ quit ตอนจบ (ใช้เป็น extra_driver ตอนรันจาก CLI)"""
+    @contextmanager
+    def _cm():
+        driver = build()
+        try:
+            yield driver
+        finally:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    return _cm
+
+
+class DriverUnavailable(Exception):
+    pass
+
+
+class _LazyDriver:
+    """proxy ของ WebDriver ที่เปิดจริงตอนถูกใช้ครั้งแรก"""
+
+    def __init__(self, stack: ExitStack, open_driver: Callable[[], ContextManager[Any]]):
+        self._stack = stack
+        self._open = open_driver
+        self._driver = None
+
+    def _get(self):
+        if self._driver is None:
+            try:
+                self._driver = self._stack.enter_context(self._open())
+            except Exception as e:
+                raise DriverUnavailable(str(e)) from e
+        return self._driver
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
+class _Throttle:
+    """เว้นระยะระหว่าง request ต่อเว็บ (ใช้ร่วมกันทุกเธรดของ scraper รอบนั้น)"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = max(0.0, float(min_interval or 0))
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next_at)
+            self._next_at = at + self.min_interval
+        if at > now:
+            time.sleep(at - now)
+
+
+def fetch_details(
+    links: List[str],
+    load: Callable[[Any, str], Dict],
+    driver,
+    extra_driver: Optional[Callable[[], ContextManager[Any]]] = None,
+    concurrency: int = 1,
+    min_interval: float = 0.0,
+    stop_event: Optional[threading.Event] = None,
+) -> Iterator[DetailResult]:
+    """
+    load(driver, link) -> dict : เปิดหน้า + รอ DOM + parse (ฟังก์ชัน parse_detail เดิมของแต่ละเว็บ)
+    ไม่มี extra_driver → รันทีละลิงก์ด้วย driver หลัก
+    """
+    throttle = _Throttle(min_interval)
+    concurrency = max(1, min(int(concurrency or 1), len(links)))
+    if extra_driver is None:
+        concurrency = 1
+
+    if concurrency == 1:
+        for idx, link in enumerate(links, start=1):
+            if stop_event is not None and stop_event.is_set():
+                return
+            throttle.wait()
+            try:
+                yield idx, link, load(driver, link), None
+            except Exception as e:
+                yield idx, link, None, e
+        return
+
+    jobs: "queue.Queue[Tuple[int, str]]" = queue.Queue()
+    for item in enumerate(links, start=1):
+        jobs.put(item)
+    results: "queue.Queue[Optional[DetailResult]]" = queue.Queue()
+    halt = threading.Event()
+
+    def _stopped() -> bool:
+        return halt.is_set() or (stop_event is not None and stop_event.is_set())
+
+    def _work(n: int) -> None:
+        try:
+            with ExitStack() as stack:
+                drv = driver if n == 0 else _LazyDriver(stack, extra_driver)
+                while not _stopped():
+                    try:
+                        idx, link = jobs.get_nowait()
+                    except queue.Empty:
+                        return
+                    throttle.wait()
+                    try:
+                        results.put((idx, link, load(drv, link), None))
+                    except DriverUnavailable as e:
+                        # เปิด driver เสริมไม่ได้ → คืนลิงก์เข้าคิวแล้วเลิกเธรดนี้ เธรดอื่นทำต่อ
+                        jobs.put((idx, link))
+                        print(f"[detail-fetch] worker {n} has no driver, stopping: {e}")
+                        return
+                    except Exception as e:
+                        results.put((idx, link, None, e))
+        except Exception as e:
+            print(f"[detail-fetch] worker {n} crashed: {e}")
+        finally:
+            results.put(None)
+
+    threads = [
+        threading.Thread(target=_work, args=(n,), name=f"detail-fetch-{n}", daemon=True)
+        for n in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        running = len(threads)
+        while running:
+            item = results.get()
+            if item is None:
+                running -= 1
+                continue
+            yield item
+
+        # ลิงก์ที่ถูกคืนเข้าคิวหลังเธรดอื่นเลิกไปแล้ว → ทำต่อด้วย driver หลัก
+        while not _stopped():
+            try:
+                idx, link = jobs.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                yield idx, link, load(driver, link), None
+            except Exception as e:
+                yield idx, link, None, e
+    finally:
+        halt.set()
+        for t in threads:
+            t.join()
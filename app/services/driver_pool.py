@@ -0,0 +1,263 @@
+# app/services/driver_pool.py
+# -*- coding: utf-8 -*-
+"""
+Pool ของ Chrome WebDriver ที่เปิดค้างไว้ ใช้ร่วมกันระหว่างงาน scrape (โหมด worker)
+
+- เปิด browser headless ไว้ล่วงหน้า `size` ตัว (ขยายได้ถึง `max_size` ถ้างานเข้าพร้อมกันเยอะ)
+- ก่อนคืนเข้า pool จะล้าง cookies / localStorage / sessionStorage / tab ที่เปิดค้าง แล้วกลับไป about:blank
+- ตัวที่ใช้ครบ `max_uses` ครั้ง หรือเช็คแล้วพัง (crash / session หาย) จะถูก quit แล้วเปิดตัวใหม่แทน
+- metrics() คืนสถิติการใช้งาน pool (ดูได้ที่ /admin/scraper-pool)
+
+แยก pool ตาม profile เพราะ page_load_strategy ตั้งได้ตอนเปิด browser เท่านั้น
+(one2car ใช้ "eager", ที่เหลือใช้ "normal")
+"""
+import time, threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36"
+)
+
+
+def build_chrome(chromedriver_path: Optional[str], headless: bool, page_load_strategy: str = "normal"):
+    """option รวมของทุก scraper (ใช้ทั้ง driver pool และ app/scrapers/engine.py)"""
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1440,900")
+    options.add_argument("--disable-notifications")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--log-level=3")
+    options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+    options.add_argument(f"--user-agent={USER_AGENT}")
+    options.page_load_strategy = page_load_strategy
+
+    if chromedriver_path:
+        driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
+    else:
+        driver = webdriver.Chrome(options=options)
+
+    driver.set_page_load_timeout(60)
+    try:
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"},
+        )
+    except Exception:
+        pass
+    return driver
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+
+class DriverPool:
+    def __init__(self, chromedriver: str = "", headless: bool = True, size: int = 2, max_size: int = 4,
+                 max_uses: int = 20, page_load_strategy: str = "normal", name: str = "normal"):
+        self.chromedriver = chromedriver
+        self.headless = headless
+        self.size = max(0, int(size))
+        self.max_size = max(1, int(max_size), self.size)
+        self.max_uses = max(1, int(max_uses))
+        self.page_load_strategy = page_load_strategy
+        self.name = name
+
+        self._idle: List[_PooledDriver] = []
+        self._total = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "launched": 0,
+            "launch_failed": 0,
+            "leases": 0,
+            "recycled_max_uses": 0,
+            "recycled_broken": 0,
+            "wait_sec_total": 0.0,
+            "launch_sec_total": 0.0,
+        }
+
+    # ---------- launch / quit ----------
+    def _launch(self) -> _PooledDriver:
+        started = time.monotonic()
+        try:
+            driver = build_chrome(self.chromedriver, self.headless, self.page_load_strategy)
+        except Exception:
+            with self._cond:
+                self._stats["launch_failed"] += 1
+            raise
+        with self._cond:
+            self._stats["launched"] += 1
+            self._stats["launch_sec_total"] += time.monotonic() - started
+        return _PooledDriver(driver)
+
+    @staticmethod
+    def _quit(pd: _PooledDriver) -> None:
+        try:
+            pd.driver.quit()
+        except Exception:
+            pass
+
+    def warm_up(self) -> None:
+        """เปิด browser ให้มี idle ครบ `size` ตัว (เรียกจากเธรดพื้นหลังตอน SearchWorker เริ่ม)"""
+        while True:
+            with self._cond:
+                if self._total >= self.size:
+                    return
+                self._total += 1
+            try:
+                pd = self._launch()
+            except Exception as e:
+                print(f"[driver-pool:{self.name}] warm-up launch failed: {e}")
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                return
+            with self._cond:
+                self._idle.append(pd)
+                self._cond.notify()
+
+    # ---------- lease ----------
+    def acquire(self, timeout: Optional[float] = None) -> _PooledDriver:
+        started = time.monotonic()
+        launch = False
+        with self._cond:
+            while not self._idle and self._total >= self.max_size:
+                remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"driver pool '{self.name}' exhausted ({self.max_size} in use)")
+                self._cond.wait(remaining)
+            if self._idle:
+                pd = self._idle.pop()
+            else:
+                self._total += 1
+                launch = True
+            self._in_use += 1
+            self._stats["leases"] += 1
+            self._stats["wait_sec_total"] += time.monotonic() - started
+
+        if launch:
+            try:
+                pd = self._launch()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+        pd.uses += 1
+        return pd
+
+    def release(self, pd: _PooledDriver) -> None:
+        reason = ""
+        if pd.uses >= self.max_uses:
+            reason = "recycled_max_uses"
+        elif not self._reset(pd.driver):
+            reason = "recycled_broken"
+
+        if reason:
+            self._quit(pd)
+        with self._cond:
+            self._in_use -= 1
+            if reason:
+                self._stats[reason] += 1
+                self._total -= 1
+            else:
+                self._idle.append(pd)
+            self._cond.notify()
+
+        # เติม browser ใหม่แทนตัวที่ทิ้งไป (ไม่ให้งานถัดไปต้องรอเปิด Chrome)
+        if reason and self.size:
+            threading.Thread(target=self.warm_up, name=f"driver-pool-{self.name}-refill", daemon=True).start()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        pd = self.acquire(timeout)
+        try:
+            yield pd.driver
+        finally:
+            self.release(pd)
+
+    @staticmethod
+    def _reset(driver) -> bool:
+        """ล้าง state ของงานก่อนหน้า; คืน False ถ้า driver ใช้ต่อไม่ได้ (crash / session หาย)"""
+        try:
+            handles = driver.window_handles
+            for h in handles[1:]:
+                driver.switch_to.window(h)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            try:
+                driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            except Exception:
+                pass
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            print(f"[driver-pool] reset failed, dropping driver: {e}")
+            return False
+
+    def shutdown(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+        for pd in idle:
+            self._quit(pd)
+
+    def metrics(self) -> dict:
+        with self._cond:
+            leases = self._stats["leases"]
+            launched = self._stats["launched"]
+            return {
+                "name": self.name,
+                "size": self.size,
+                "max_size": self.max_size,
+                "max_uses": self.max_uses,
+                "total": self._total,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "utilisation": round(self._in_use / self.max_size, 3),
+                **{k: (round(v, 3) if isinstance(v, float) else v) for k, v in self._stats.items()},
+                "avg_wait_sec": round(self._stats["wait_sec_total"] / leases, 3) if leases else 0.0,
+                "avg_launch_sec": round(self._stats["launch_sec_total"] / launched, 3) if launched else 0.0,
+            }
+
+
+_pools: Dict[str, DriverPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(settings: dict, profile: str = "normal") -> DriverPool:
+    """pool เดียวต่อ profile ต่อ process (ใช้ settings ของครั้งแรกที่เรียก)"""
+    with _pools_lock:
+        pool = _pools.get(profile)
+        if pool is None:
+            pool = DriverPool(
+                chromedriver=settings.get("chromedriver", ""),
+                headless=bool(settings.get("headless", True)),
+                size=settings.get("driver_pool_size", 2),
+                max_size=settings.get("driver_pool_max", 4),
+                max_uses=settings.get("driver_max_uses", 20),
+                page_load_strategy=profile,
+                name=profile,
+            )
+            _pools[profile] = pool
+        return pool
+
+
+def pool_metrics() -> List[dict]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [p.metrics() for p in pools]
@@ -0,0 +1,96 @@
+# app/services/http_fetch.py
+# -*- coding: utf-8 -*-
+"""
+Fetch backend แบบ HTTP ล้วน (ไม่ต้องเปิด Chrome) สำหรับหน้าที่ server render มาแล้ว
+
+- ใช้ requests.Session ตัวเดียวต่อ process (keep-alive + connection pool + retry 429/5xx)
+- แต่ละ scraper ประกาศ FETCH_BACKENDS ว่าหน้าไหนรองรับ backend อะไร เช่น
+      FETCH_BACKENDS = {"list": ("selenium",), "detail": ("http", "selenium")}
+  ลำดับใน tuple = ลำดับที่ลอง (ตัวแรกไม่ผ่าน → ใช้ตัวถัดไป)
+- http_first() ห่อ load_detail เดิม: ดึง HTML ด้วย HTTP แล้ว parse ด้วยฟังก์ชันเดียวกับ Selenium
+  ถ้า parse แล้วข้อมูลไม่ครบ (เช่นหน้าเป็น client-side render) → fallback เป็น Selenium
+  พลาดติดกันเกิน max_misses ครั้งจะเลิกลอง HTTP ไปทั้งรอบ
+"""
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36"
+)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET", "HEAD"))
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "th-TH,th;q=0.9,en;q=0.8",
+            })
+            _session = s
+        return _session
+
+
+def fetch_html(url: str, timeout=(5, 20)) -> str:
+    r = get_session().get(url, timeout=timeout)
+    r.raise_for_status()
+    if not r.encoding or r.encoding.lower() == "iso-8859-1":
+        r.encoding = r.apparent_encoding or "utf-8"
+    return r.text
+
+
+def supports(fetch_backends: Dict, page: str, backend: str) -> bool:
+    return backend in (fetch_backends or {}).get(page, ("selenium",))
+
+
+def http_first(
+    parse_html: Callable[[str, str], Optional[Dict]],
+    load_selenium: Callable[[Any, str], Dict],
+    is_complete: Callable[[Dict], bool],
+    tag: str = "",
+    max_misses: int = 3,
+) -> Callable[[Any, str], Dict]:
+    """คืน load(driver, link) ที่ลอง HTTP ก่อน แล้วค่อย fallback เป็น Selenium"""
+    state = {"misses": 0, "http": 0, "selenium": 0}
+    lock = threading.Lock()
+
+    def load(drv, link: str) -> Dict:
+        if state["misses"] < max_misses:
+            try:
+                data = parse_html(fetch_html(link), link)
+                if data and is_complete(data):
+                    with lock:
+                        state["misses"] = 0
+                        state["http"] += 1
+                    return data
+                reason = "incomplete html"
+            except Exception as e:
+                reason = f"{type(e).__name__}: {e}"
+            with lock:
+                state["misses"] += 1
+                if state["misses"] == max_misses:
+                    print(f"[{tag}] http backend missed {max_misses}x in a row, using selenium for the rest")
+            print(f"[{tag}] http fallback ({reason}) -> {link}")
+
+        with lock:
+            state["selenium"] += 1
+        return load_selenium(drv, link)
+
+    load.stats = state
+    return load
@@ -0,0 +1,143 @@
+# app/services/listing_cache.py
+# -*- coding: utf-8 -*-
+"""
+car_cache เป็น listing cache แบบมีอายุ (TTL) แทนการลบทิ้งทุกครั้งที่ค้นหา
+
+- scraper upsert ประกาศเมื่อไร (app/services/car_writer.py) → fresh_values(): scraped_at = now, expires_at = now + CAR_CACHE_TTL_SEC
+- ประกาศที่การ์ดบนหน้า list ไม่เปลี่ยน (list_fingerprint ตรง) ไม่ต้องเปิดหน้า detail ซ้ำ แค่ต่ออายุ (mark_seen)
+- การค้นหาใช้เฉพาะแถวที่ยังไม่หมดอายุ (fresh_cond) และ filter ทุกตัวของฟอร์มเป็น WHERE ใน SQL
+  (query_conds = ขอบเขตของ query: คำค้น / งบ / แหล่ง, filter_conds = ประเภทรถ / น้ำมัน / เกียร์ / สี / ปี)
+- source ไหนต้อง scrape ใหม่ตัดสินที่ระดับ query ใน app/services/scrape_cache.py
+- แถวหมดอายุนานเกิน CAR_CACHE_KEEP_EXPIRED_SEC และไม่มี session ไหนอ้างถึง ถูกลบเป็นรอบ ๆ (prune_expired)
+
+ค่า TTL อ่านจาก env ตรง ๆ (เหมือน app/db.py) เพราะ scraper โหมด subprocess ไม่ได้สร้าง Flask app
+"""
+import os
+from datetime import timedelta
+from typing import Dict, Iterable
+
+from sqlalchemy import Integer, cast, select, delete, update, and_, or_, func
+
+from app.models import CarCache, SearchSessionCar
+from app.scrapers.normalize import attr_filter_values, attr_needle, attr_vocab
+from app.services.text_search import match_conds
+
+CACHE_TTL_SEC = int(os.getenv("CAR_CACHE_TTL_SEC", str(6 * 3600)))
+KEEP_EXPIRED_SEC = int(os.getenv("CAR_CACHE_KEEP_EXPIRED_SEC", str(7 * 24 * 3600)))
+
+
+def fresh_values() -> Dict:
+    """ค่า scraped_at / expires_at ของแถวที่ scraper เพิ่งเห็น (ทั้งแถวใหม่และแถวเดิม)"""
+    return {
+        "scraped_at": func.now(),
+        "expires_at": func.now() + timedelta(seconds=CACHE_TTL_SEC),
+        "last_seen_at": func.now(),
+    }
+
+
+def unchanged_listings(db, source: str, fingerprints: Dict[str, str]) -> Dict[str, int]:
+    """
+    {url: fingerprint} จากหน้า list → {url: car_cache.id} ของประกาศที่เก็บไว้แล้วและการ์ดไม่เปลี่ยน
+    (แถวที่ยังไม่มีราคาถือว่าเปลี่ยน ให้เปิดหน้า detail ใหม่)
+    """
+    if not fingerprints:
+        return {}
+    rows = db.execute(
+        select(CarCache.id, CarCache.url, CarCache.list_fingerprint)
+        .where(
+            CarCache.source == source,
+            CarCache.url.in_(list(fingerprints)),
+            CarCache.list_fingerprint.isnot(None),
+            CarCache.price_thb.isnot(None),
+        )
+    ).all()
+    return {url: int(car_id) for car_id, url, fp in rows if fp == fingerprints.get(url)}
+
+
+def mark_seen(db, ids: Iterable[int]) -> int:
+    """ต่ออายุประกาศที่ scraper เห็นบนหน้า list แต่ไม่ได้เปิดหน้า detail (caller commit เอง)"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    res = db.execute(
+        update(CarCache).where(CarCache.id.in_(ids)).values(**fresh_values())
+        .execution_options(synchronize_session=False)
+    )
+    return res.rowcount or 0
+
+
+def fresh_cond():
+    return CarCache.expires_at > func.now()
+
+
+def query_conds(params: Dict) -> list:
+    """เงื่อนไข SQL ของ query ใน session (งบ / คำค้น / แหล่ง) — ประเภทรถ/น้ำมัน/เกียร์/สี อยู่ใน attr_conds"""
+    conds = [CarCache.price_thb.isnot(None), CarCache.price_thb <= params.get("max_budget")]
+    # คำค้นผ่าน trigram index (app/services/text_search.py)
+    conds += match_conds(params.get("q") or "")
+    sources = params.get("sources") or []
+    if sources:
+        conds.append(CarCache.source.in_(sources))
+    return conds
+
+
+# ชื่อ field ในฟอร์มค้นหา → คอลัมน์ของ car_cache
+ATTR_PARAMS = {"car_type": "body_type", "fuel_type": "fuel_type", "gear_type": "transmission", "color": "color"}
+
+
+def attr_conds(params: Dict) -> list:
+    """
+    filter ประเภทรถ / น้ำมัน / เกียร์ / สี ของ session เป็น WHERE บนคอลัมน์ที่มี index
+    ประกาศที่ไม่มีค่าในคอลัมน์นั้นผ่าน (เหมือน filter เดิมที่ทำใน Python)
+    ค่าดิบที่แปลงเป็นชื่อมาตรฐานไม่ได้ (เช่น 'pickup 4 door') เทียบแบบ substring เหมือนเดิม (attr_value_matches)
+    """
+    conds = []
+    for param, col in ATTR_PARAMS.items():
+        wanted = params.get(param) or ""
+        values = attr_filter_values(col, wanted)
+        if values:
+            column = getattr(CarCache, col)
+            conds.append(or_(
+                column.is_(None),
+                column.in_(values),
+                and_(column.notin_(attr_vocab(col)), column.contains(attr_needle(wanted), autoescape=True)),
+            ))
+    return conds
+
+
+# ปีรถ: คอลัมน์ year ก่อน แล้วปี 4 หลักแรกจาก extra ตามลำดับคีย์ (แทน _get_car_year ที่เคยไล่ทีละแถวใน Python)
+YEAR_KEYS = ("ปีรถ", "ปี", "year", "ปีผลิต", ("สเปกย่อย", "ปีจดทะเบียน"))
+_YEAR_PATTERN = "(?:19|20)[0-9]{2}"
+
+
+def year_expr():
+    found = [cast(func.substring(CarCache.extra[k].astext, _YEAR_PATTERN), Integer) for k in YEAR_KEYS]
+    return func.coalesce(CarCache.year, *found)
+
+
+def filter_conds(params: Dict) -> list:
+    """filter ทุกตัวของ session นอกจากขอบเขต query: งบ + attr_conds + ช่วงปี (ไม่มีปี = ไม่ผ่าน ถ้าตั้งช่วงปีไว้)"""
+    conds = [CarCache.price_thb.isnot(None), CarCache.price_thb <= params.get("max_budget")]
+    conds += attr_conds(params)
+    min_year, max_year = params.get("min_year"), params.get("max_year")
+    if min_year or max_year:
+        year = year_expr()
+        if min_year:
+            conds.append(year >= int(min_year))
+        if max_year:
+            conds.append(year <= int(max_year))
+    return conds
+
+
+def prune_expired(db) -> int:
+    """ลบแถวที่หมดอายุนานแล้วและไม่มีผลค้นหาไหนอ้างถึง (caller commit เอง)"""
+    referenced = select(SearchSessionCar.car_id).where(SearchSessionCar.car_id == CarCache.id).exists()
+    res = db.execute(
+        delete(CarCache)
+        .where(
+            CarCache.expires_at < func.now() - timedelta(seconds=KEEP_EXPIRED_SEC),
+            ~referenced,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return res.rowcount or 0
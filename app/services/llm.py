@@ -1,6 +1,7 @@
 # app/services/llm.py
-import os, json, re
-import google.generativeai as genai
+import json
+
+from app.services.llm_gateway import api_key, generate_text, parse_json
 
 def pick_best_car(params: dict, cars: list[dict]):
     """
@@ -8,13 +9,9 @@ def pick_best_car(params: dict, cars: list[dict]):
     cars: list of cars (dict) to let the LLM choose from
     return: (best_index: int|None, reason: str|None, raw_text: str)
     """
-    api = os.getenv("GEMINI_API_KEY")
-    if not api:
+    if not api_key():
         return None, None, "NO_API_KEY"
 
-    genai.configure(api_key=api)
-    model = genai.GenerativeModel("gemini-1.5-flash")
-
     # Build a brief list for readability + 1-based 'index'
     brief = []
     for i, c in enumerate(cars, start=1):
@@ -45,18 +42,16 @@ def pick_best_car(params: dict, cars: list[dict]):
         )
     }
 
-    resp = model.generate_content(
-        contents=[system, "Data:", json.dumps(prompt, ensure_ascii=False)]
-    )
+    # shared client + deadline (app/services/llm_gateway.py); timeout/error → None
+    text = generate_text([system, "Data:", json.dumps(prompt, ensure_ascii=False)], json_mode=True)
+    if text is None:
+        return None, None, "NO_RESPONSE"
 
-    text = resp.text or ""
-    # Extract JSON
-    m = re.search(r"\{[\s\S]*\}", text)
-    if not m:
+    data = parse_json(text)
+    if not isinstance(data, dict):
         return None, None, text
 
     try:
-        data = json.loads(m.group(0))
         best = int(data.get("best_index")) if "best_index" in data else None
         reason = data.get("reason")
         # Clamp range
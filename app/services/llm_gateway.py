@@ -0,0 +1,173 @@
+# app/services/llm_gateway.py
+# -*- coding: utf-8 -*-
+"""
+ทางเดียวที่ service ต่าง ๆ ใช้เรียก Gemini (google-genai) — llm_select.py / llm.py เรียกผ่านที่นี่
+
+- client ตัวเดียวทั้ง process (สร้างครั้งแรกที่ใช้, connection pool ของ httpx ใช้ร่วมกัน) แทน genai.Client() ทุกครั้ง
+- ทุกคำขอมี deadline (ค่าเริ่มต้น LLM_TIMEOUT_SEC, ส่ง timeout= ต่อคำขอได้): ตั้งเป็น HTTP timeout ของคำขอนั้น
+  + รอผลจาก pool ไม่เกินเวลาเดียวกัน
+  เกินเวลา / error / ไม่มี GEMINI_API_KEY → คืน None ให้ผู้เรียกใช้ fallback ของตัวเอง (เช่น _fallback_pick)
+  web worker จึงไม่ค้างตาม model ที่ตอบช้า
+- เรียกหลายคำขอพร้อมกันได้: generate_many (จากโค้ด sync, ผ่าน thread pool ขนาด LLM_MAX_CONCURRENCY)
+  หรือ agenerate_text / agenerate_json (ใน event loop, ผ่าน client.aio)
+- client / pool เป็นของทั้ง process → LLM_TIMEOUT_SEC / LLM_MAX_CONCURRENCY ตั้งครั้งเดียวจาก app.config ใน create_app (configure)
+"""
+import asyncio, json, os, re, threading, time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import List, Optional
+
+GEMINI_MODEL = "gemini-2.5-flash"
+DEFAULT_TIMEOUT_SEC = 20.0
+DEFAULT_MAX_CONCURRENCY = 8
+
+_lock = threading.Lock()
+_client = None
+_pool: Optional[ThreadPoolExecutor] = None
+_settings = {"timeout_sec": DEFAULT_TIMEOUT_SEC, "max_concurrency": DEFAULT_MAX_CONCURRENCY}
+
+
+def configure(config) -> None:
+    """deadline / ขนาด pool ของ process นี้จาก app.config (เรียกใน create_app ก่อนใช้ครั้งแรก)"""
+    with _lock:
+        _settings["timeout_sec"] = float(config.get("LLM_TIMEOUT_SEC", DEFAULT_TIMEOUT_SEC))
+        _settings["max_concurrency"] = max(1, int(config.get("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+
+
+def api_key() -> str:
+    return os.getenv("GEMINI_API_KEY", "").strip()
+
+
+def get_client():
+    """google-genai Client ตัวเดียวของ process (None ถ้าไม่มี API key)"""
+    global _client
+    if _client is None and api_key():
+        with _lock:
+            if _client is None:
+                # pip install -U google-genai
+                from google import genai
+
+                _client = genai.Client(api_key=api_key())
+    return _client
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=_settings["max_concurrency"], thread_name_prefix="llm")
+    return _pool
+
+
+def _config(json_mode: bool, timeout: float):
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        response_mime_type="application/json" if json_mode else None,
+        http_options=types.HttpOptions(timeout=int(timeout * 1000)),  # ms
+    )
+
+
+def parse_json(txt: Optional[str]):
+    """ข้อความจาก model → dict/list (ตัดข้อความรอบ ๆ JSON ออกได้) หรือ None"""
+    txt = (txt or "").strip()
+    if not txt:
+        return None
+    try:
+        return json.loads(txt)
+    except Exception:
+        m = re.search(r"[\{\[][\s\S]+[\}\]]", txt)
+        if m:
+            try:
+                return json.loads(m.group(0))
+            except Exception:
+                return None
+    return None
+
+
+def _log_usage(model: str, resp, started: float) -> None:
+    """token ที่ใช้จริงต่อการเรียก (usage_metadata ของ Gemini) — ใช้ดูผลของ prompt แบบย่อใน llm_prompt.py"""
+    u = getattr(resp, "usage_metadata", None)
+    print(
+        f"DEBUG llm model={model} prompt_tokens={getattr(u, 'prompt_token_count', None)} "
+        f"output_tokens={getattr(u, 'candidates_token_count', None)} ms={(time.monotonic() - started) * 1000:.0f}"
+    )
+
+
+def _call(prompt, model: str, json_mode: bool, timeout: float) -> str:
+    started = time.monotonic()
+    resp = get_client().models.generate_content(model=model, contents=prompt, config=_config(json_mode, timeout))
+    _log_usage(model, resp, started)
+    return (resp.text or "").strip()
+
+
+def _submit(prompt, model: str, json_mode: bool, timeout: float):
+    return _get_pool().submit(_call, prompt, model, json_mode, timeout)
+
+
+def _result(fut, deadline: float) -> Optional[str]:
+    try:
+        return fut.result(timeout=deadline)
+    except FuturesTimeout:
+        fut.cancel()
+        print(f"LLM timeout after {deadline:.1f}s")
+    except Exception as e:
+        print("LLM error:", e)
+    return None
+
+
+def generate_text(
+    prompt, model: str = GEMINI_MODEL, json_mode: bool = False, timeout: Optional[float] = None,
+) -> Optional[str]:
+    """คำตอบของ model หรือ None (ไม่มี key / เกิน deadline / error)"""
+    if get_client() is None:
+        return None
+    timeout = timeout or _settings["timeout_sec"]
+    return _result(_submit(prompt, model, json_mode, timeout), timeout)
+
+
+def generate_json(prompt, model: str = GEMINI_MODEL, timeout: Optional[float] = None):
+    """เหมือน generate_text แต่บังคับตอบ JSON แล้ว parse ให้ → dict/list หรือ None"""
+    return parse_json(generate_text(prompt, model, json_mode=True, timeout=timeout))
+
+
+def generate_many(
+    prompts: List, model: str = GEMINI_MODEL, json_mode: bool = False, timeout: Optional[float] = None,
+) -> List[Optional[str]]:
+    """ส่งหลาย prompt พร้อมกัน (deadline เดียวกันทั้งชุด) → คำตอบตามลำดับ prompts; ข้อที่ไม่สำเร็จ = None"""
+    if get_client() is None:
+        return [None] * len(prompts)
+    timeout = timeout or _settings["timeout_sec"]
+    futs = [_submit(p, model, json_mode, timeout) for p in prompts]
+    out: List[Optional[str]] = []
+    end = time.monotonic() + timeout
+    for fut in futs:
+        out.append(_result(fut, max(0.0, end - time.monotonic())))
+    return out
+
+
+async def agenerate_text(
+    prompt, model: str = GEMINI_MODEL, json_mode: bool = False, timeout: Optional[float] = None,
+) -> Optional[str]:
+    """เวอร์ชัน async (client.aio) สำหรับโค้ดที่อยู่ใน event loop — รันหลายตัวพร้อมกันด้วย asyncio.gather"""
+    client = get_client()
+    if client is None:
+        return None
+    timeout = timeout or _settings["timeout_sec"]
+    started = time.monotonic()
+    try:
+        resp = await asyncio.wait_for(
+            client.aio.models.generate_content(model=model, contents=prompt, config=_config(json_mode, timeout)),
+            timeout,
+        )
+        _log_usage(model, resp, started)
+        return (resp.text or "").strip()
+    except asyncio.TimeoutError:
+        print(f"LLM timeout after {timeout:.1f}s")
+    except Exception as e:
+        print("LLM error:", e)
+    return None
+
+
+async def agenerate_json(prompt, model: str = GEMINI_MODEL, timeout: Optional[float] = None):
+    return parse_json(await agenerate_text(prompt, model, json_mode=True, timeout=timeout))
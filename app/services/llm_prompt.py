@@ -1,43 +1,101 @@
 # app/services/llm_prompt.py
-import json
+# -*- coding: utf-8 -*-
+"""
+เข้ารหัสรายการรถสำหรับ prompt ของ LLM แบบประหยัด token
+
+เดิมส่ง JSON เต็มต่อคัน (URL, image URL, key ภาษาไทย, ค่า null) 40–50 คัน → prompt ยาวและช้าตามจำนวนรถ
+encode_cars ทำเป็นตาราง 1 บรรทัดต่อคัน คั่นด้วย '|' (header บอกชื่อคอลัมน์ครั้งเดียว):
+- ไม่ส่ง URL / รูป / ค่าว่าง (ช่องว่าง = ไม่มีข้อมูล); เชื้อเพลิง/เกียร์/ตัวถังใช้คอลัมน์มาตรฐานภาษาอังกฤษของ car_cache
+- id ในตารางเป็นเลขสั้น 1..N (ids[n] → car_id จริง) แทน id ใน DB
+- งบ token (PROMPT_TOKEN_BUDGET, นับแบบประมาณด้วย estimate_tokens): เรียงรถด้วย rank_scored ของ
+  app/services/scoring.py (ลำดับเดียวกับรถแนะนำในเครื่อง) แล้วใส่ทีละคันจนเต็มงบหรือครบ PROMPT_MAX_CARS คัน
+  แถวที่ได้แสดงตามลำดับเดิมของ cars (PROMPT_TOKEN_BUDGET / PROMPT_MAX_CARS มาจาก app.config ผ่าน pick_settings)
+
+จำนวน token จริงต่อการเรียกดูได้จาก log ของ app/services/llm_gateway.py (usage_metadata)
+"""
+from typing import Dict, List, NamedTuple, Optional
+
+from app.services.scoring import as_int, rank_scored
+
+DEFAULT_TOKEN_BUDGET = 2500
+DEFAULT_MAX_CARS = 40
+
+CAR_HEADER = ("id", "name", "year", "price_thb", "mileage_km", "fuel", "gear", "body", "province")
+_NAME_MAX = 48
+
+
+class EncodedCars(NamedTuple):
+    table: str                 # header + 1 บรรทัดต่อคัน
+    ids: Dict[int, int]        # id สั้นในตาราง → car_id
+    tokens: int                # token โดยประมาณของ table
+    dropped: int               # จำนวนคันที่ตัดออกเพราะเกินงบ token / PROMPT_MAX_CARS
+
+
+def estimate_tokens(text: str) -> int:
+    """ประมาณ token แบบถูก ๆ: ASCII ~4 ตัวอักษร/token, ตัวอักษรอื่น (ไทย ฯลฯ) ~2 ตัวอักษร/token"""
+    ascii_n = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_n + 3) // 4 + (len(text) - ascii_n + 1) // 2
+
+
+def _cell(v) -> str:
+    if v is None:
+        return ""
+    return " ".join(str(v).split()).replace("|", "/")
+
+
+def _name(c) -> str:
+    name = (c.title or "").strip() or " ".join(x for x in (c.brand, c.model) if x)
+    return name[:_NAME_MAX]
+
+
+def car_row(n: int, c) -> str:
+    return "|".join(_cell(v) for v in (
+        n, _name(c), as_int(c.year), as_int(c.price_thb), as_int(c.mileage_km),
+        c.fuel_type, c.transmission, c.body_type, c.province,
+    ))
+
+
+def encode_cars(
+    cars: List, params: Optional[Dict] = None,
+    token_budget: Optional[int] = None, max_cars: Optional[int] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> EncodedCars:
+    """params / weights: เหมือน scoring.rank_scored (max_budget + ความชอบจากฟอร์ม) — ใช้เลือกว่าคันไหนได้อยู่ใน prompt"""
+    token_budget = token_budget or DEFAULT_TOKEN_BUDGET
+    max_cars = max_cars or DEFAULT_MAX_CARS
+
+    header = "|".join(CAR_HEADER)
+    used = estimate_tokens(header)
+    keep = set()
+    for c in (s.car for s in rank_scored(cars, params, weights)):
+        if len(keep) >= max_cars:
+            break
+        # id สั้นจริงยังไม่รู้ตอนนี้ → ประมาณด้วยเลขหลักมากสุด
+        cost = estimate_tokens(car_row(len(cars), c)) + 1
+        if keep and used + cost > token_budget:
+            continue
+        keep.add(c.id)
+        used += cost
+
+    rows, ids = [header], {}
+    for c in cars:
+        if c.id in keep:
+            n = len(ids) + 1
+            ids[n] = c.id
+            rows.append(car_row(n, c))
+    table = "\n".join(rows)
+    return EncodedCars(table, ids, estimate_tokens(table), len(cars) - len(ids))
+
 
 def _val(x, default="N/A"):
     x = (x or "").strip() if isinstance(x, str) else x
     return x if x else default
 
-def build_cars_payload(cars, max_items=40):
-    """
-    Convert CarCache list -> compact JSON structure for the LLM.
-    """
-    payload = []
-    for i, c in enumerate(cars[:max_items], start=1):
-        ex = c.extra or {}
-        sp = ex.get("สเปกย่อย") or {}
-
-        payload.append({
-            "index": i,
-            "car_id": c.id,
-            "source": c.source,
-            "title": c.title,
-            "brand": c.brand or ex.get("ยี่ห้อ"),
-            "model": c.model or ex.get("รุ่น") or ex.get("ชื่อรุ่น"),
-            "trim": ex.get("รุ่นย่อย") or sp.get("รุ่นย่อย"),
-            "year": c.year or ex.get("ปีรถ") or sp.get("ปีจดทะเบียน"),
-            "price_thb": int(c.price_thb) if c.price_thb is not None else None,
-            "mileage_km": c.mileage_km or ex.get("เลขไมล์") or ex.get("เลขไมล์(กม.)"),
-            "fuel": ex.get("เชื้อเพลิง") or sp.get("เชื้อเพลิง"),
-            "gear": ex.get("เกียร์") or sp.get("เกียร์"),
-            "body_type": ex.get("ประเภทรถ") or ex.get("ประเภทย่อย") or sp.get("ประเภทรถ"),
-            "color": ex.get("สี") or sp.get("สี"),
-            "province_or_location": c.province or ex.get("ที่ตั้งรถ") or ex.get("จังหวัด"),
-            "URL": c.url,
-            "image_url": c.image_url,
-        })
-    return payload
-
 def build_gemini_prompt(cars, form_params, exclude_ids=None):
     """
     exclude_ids: list of car_id that must not be selected (used when user asks for "another pick").
+    Candidates go in as the compact table from encode_cars (excluded cars are left out of it).
+    return: (prompt, ids) — ids maps the short `id` the model answers with back to car_id.
     """
     exclude_ids = exclude_ids or []
 
@@ -55,7 +113,7 @@ def build_gemini_prompt(cars, form_params, exclude_ids=None):
     purpose = _val(form_params.get("purpose"))
     other = _val(form_params.get("other_prefs"))
 
-    cars_json = json.dumps(build_cars_payload(cars), ensure_ascii=False)
+    enc = encode_cars([c for c in cars if c.id not in exclude_ids], form_params)
 
     prompt = f"""
 You are a used-car advisor in Thailand. Your task is to choose **exactly one** "best-fit" car from the list below.
@@ -77,10 +135,7 @@ You are a used-car advisor in Thailand. Your task is to choose **exactly one** "
 - Primary usage: {purpose}
 - Other preferences: {other}
 
-[Do NOT select these car_id]: {exclude_ids if exclude_ids else "—"}
-
-[Candidate cars] (index 1..N):
-```json
-{cars_json}
+[Candidate cars] (one per line, `|`-separated, empty cell = unknown; answer with the `id` column):
+{enc.table}
 """.strip()
-    return prompt
+    return prompt, enc.ids
@@ -1,174 +1,135 @@
 # app/services/llm_select.py
 # -*- coding: utf-8 -*-
-import os, json, re
-from decimal import Decimal
+import json
 from typing import List, Tuple, Optional
 
-def _safe_int(v):
-    if v is None:
-        return None
-    if isinstance(v, bool):
-        return int(v)
-    if isinstance(v, (int, float)):
-        return int(v)
-    if isinstance(v, Decimal):
-        return int(v)  # strip fraction
-    # extract only digits from strings, e.g., "519,000 THB"
-    m = re.findall(r"\d+", str(v))
-    return int("".join(m)) if m else None
-
-def _serialize_car(c):
-    ex = c.extra or {}
-    sp = (ex.get("สเปกย่อย") or {}) if isinstance(ex.get("สเปกย่อย"), dict) else {}
+from app.services.llm_gateway import GEMINI_MODEL, api_key, generate_json
+from app.services.llm_prompt import DEFAULT_MAX_CARS, DEFAULT_TOKEN_BUDGET, encode_cars
+from app.services.pick_cache import DEFAULT_MAX_ROWS, DEFAULT_TTL_SEC, get_pick, pick_key, put_pick
+from app.services.scoring import as_int, best_pick, parse_weights
+
+# params ของ session ที่ส่งเข้า prompt (และเป็นส่วนหนึ่งของ key ใน pick_cache)
+PROMPT_PARAM_KEYS = ("q", "max_budget", "salary", "gender", "marital_status", "occupation",
+                     "education_level", "purpose", "other_prefs")
+
+
+def pick_settings(config) -> dict:
+    """
+    ค่าของรถแนะนำจาก app.config (แบบเดียวกับ scraper_settings) — หน้าเว็บส่ง current_app.config,
+    SearchWorker เก็บไว้ใน queue_settings()["picks"] (เธรดของ worker ไม่มี app context)
+    """
     return {
-        "id": c.id,
-        "title": c.title,
-        "brand": c.brand,
-        "model": c.model,
-        "year": _safe_int(getattr(c, "year", None)),
-        "price_thb": _safe_int(getattr(c, "price_thb", None)),
-        "mileage_km": _safe_int(getattr(c, "mileage_km", None)),
-        "fuel": ex.get("เชื้อเพลิง") or sp.get("เชื้อเพลิง"),
-        "gear": ex.get("เกียร์") or sp.get("เกียร์"),
-        "source": getattr(c, "source", None) or getattr(c, "source_site", None),
-        "url": getattr(c, "url", None),
-        "province": getattr(c, "province", None) or ex.get("จังหวัด") or ex.get("ที่ตั้งรถ"),
-        "image_url": getattr(c, "image_url", None),
+        "pick_cache_ttl_sec": int(config.get("PICK_CACHE_TTL_SEC", DEFAULT_TTL_SEC)),
+        "pick_cache_max_rows": int(config.get("PICK_CACHE_MAX_ROWS", DEFAULT_MAX_ROWS)),
+        "chain_k": int(config.get("PICK_CHAIN_K", 5)),
+        "chain_timeout_sec": float(config.get("PICK_CHAIN_TIMEOUT_SEC", 60)),
+        "chain_precompute": bool(config.get("PICK_CHAIN_PRECOMPUTE", False)),
+        "prompt_token_budget": int(config.get("PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)),
+        "prompt_max_cars": int(config.get("PROMPT_MAX_CARS", DEFAULT_MAX_CARS)),
+        "score_weights": parse_weights(config.get("SCORE_WEIGHTS", "")),
     }
 
-def _fallback_pick(cars: List, max_budget: Optional[int], exclude_ids: List[int]) -> Tuple[Optional[object], str]:
-    # Choose the cheapest within budget and not in exclude; if none, choose the first viable one.
-    candidates = []
+def _in_budget_ids(cars: List, max_budget: Optional[int]) -> set:
+    """IDs of cars within budget (for post-check)"""
+    out = set()
     for c in cars:
-        if exclude_ids and c.id in exclude_ids:
-            continue
-        p = _safe_int(getattr(c, "price_thb", None))
-        if max_budget is not None and p is not None and p > max_budget:
-            continue
-        candidates.append((p if p is not None else 10**15, c))
-    if not candidates:
-        # Allow over-budget if nothing fits
-        for c in cars:
-            if exclude_ids and c.id in exclude_ids:
-                continue
-            p = _safe_int(getattr(c, "price_thb", None))
-            candidates.append((p if p is not None else 10**15, c))
-    if not candidates:
-        return None, ""
-    candidates.sort(key=lambda x: x[0])
-    best = candidates[0][1]
-    ptxt = f"{_safe_int(best.price_thb):,} THB" if _safe_int(best.price_thb) is not None else "N/A"
-    return best, f"Picked the best-priced car within budget: {ptxt}"
+        p = as_int(getattr(c, "price_thb", None))
+        if max_budget is None or (p is not None and p <= max_budget):
+            out.add(c.id)
+    return out
+
+def _encode(cars: List, session_params: dict, label: str, settings: dict):
+    enc = encode_cars(cars, session_params, settings.get("prompt_token_budget"), settings.get("prompt_max_cars"),
+                      settings.get("score_weights"))
+    print(f"DEBUG {label} prompt cars={len(enc.ids)}/{len(cars)} table_tokens~{enc.tokens}")
+    return enc
+
+def _fallback_pick(cars: List, session_params: dict, exclude_ids: List[int], settings: dict) -> Tuple[Optional[object], str]:
+    # Deterministic local pick: highest score from app/services/scoring.py (in-budget cars first), not in exclude.
+    return best_pick(cars, session_params, exclude_ids, settings.get("score_weights"))
+
+PICK_CRITERIA = """
+Criteria:
+1) Value for money
+2) Suitability to usage (refer to session_params if provided)
+3) Lower mileage is better
+4) Newer year is better
+
+Numeric rules:
+- Use only numbers that exist in `cars` or session_params
+- Money is Thai Baht, format as ###,### THB
+- If a number is missing, say "N/A"
+""".strip()
 
 def pick_best_car_with_gemini(
     cars: List,
     session_params: dict | None = None,
     exclude_ids: List[int] | None = None,
-    fallback_first: bool = True
+    fallback_first: bool = True,
+    db=None,
+    settings: dict | None = None,
 ) -> Tuple[Optional[object], str]:
     """
     Return (car_obj, reason_en)
-    - Uses Google GenAI SDK (google-genai).
-    - If API is unavailable/errors, falls back to a deterministic rule.
+    - Calls Gemini through app/services/llm_gateway.py (shared client, LLM_TIMEOUT_SEC deadline).
+    - If API is unavailable/errors/times out, falls back to a deterministic rule.
+    - With `db`, model answers are memoized in pick_cache (caller commits); same cars/params/exclude = no model call.
+    - `settings`: pick_settings(config); None = defaults.
     """
+    settings = settings or {}
     session_params = session_params or {}
     exclude_ids = exclude_ids or []
+    prompt_params = {k: v for k, v in session_params.items() if k in PROMPT_PARAM_KEYS}
 
-    # Prepare payload for the model
-    cars_payload = [_serialize_car(c) for c in cars if not (exclude_ids and c.id in exclude_ids)]
-    max_budget = _safe_int(session_params.get("max_budget"))
+    cache_key = None
+    if db is not None:
+        cache_key = pick_key((c.id for c in cars), prompt_params, exclude_ids, GEMINI_MODEL)
+        hit = get_pick(db, cache_key)
+        cached = next((c for c in cars if hit and c.id == hit[0] and c.id not in exclude_ids), None)
+        if cached is not None:
+            print(f"DEBUG pick cache hit car={cached.id}")
+            return cached, hit[1]
 
-    # IDs of cars within budget (for post-check)
-    in_budget_ids = {
-        cp["id"]
-        for cp in cars_payload
-        if (max_budget is None or (cp["price_thb"] is not None and cp["price_thb"] <= max_budget))
-    }
+    candidates = [c for c in cars if not (exclude_ids and c.id in exclude_ids)]
+    max_budget = as_int(session_params.get("max_budget"))
+    in_budget_ids = _in_budget_ids(candidates, max_budget)
 
     # If no API key, fallback immediately
-    api_key = os.getenv("GEMINI_API_KEY", "").strip()
-    if not api_key:
-        return _fallback_pick(cars, max_budget, exclude_ids)
+    if not api_key():
+        return _fallback_pick(cars, session_params, exclude_ids, settings)
 
     try:
-        # ========== New SDK ==========
-        # pip install -U google-genai
-        from google import genai
-        from google.genai import types  # GenerateContentConfig / schema
-
-        # Reads GEMINI_API_KEY from env automatically
-        client = genai.Client()
-
-        # Force JSON output
-        config = types.GenerateContentConfig(
-            response_mime_type="application/json",
-            # Optionally lock schema:
-            # response_schema={
-            #     "type": "object",
-            #     "properties": {
-            #         "car_id": {"type": "integer"},
-            #         "reason": {"type": "string"}
-            #     },
-            #     "required": ["car_id", "reason"]
-            # }
-        )
-
+        # Prepare compact table for the model (token-budgeted, short ids)
+        enc = _encode(candidates, session_params, "pick", settings)
         prompt = f"""
 You are an assistant that selects **one** "best-fit used car" for a user.
 Constraints:
 - User's maximum budget (no more than): {max_budget if max_budget is not None else "N/A"}
-- Candidates are provided as a JSON array in `cars_list` below.
+- Candidates are listed in `cars` below: one per line, `|`-separated, empty cell = unknown.
 - If there are cars within budget, consider only those first; otherwise consider all.
 
-Criteria:
-1) Value for money
-2) Suitability to usage (refer to session_params if provided)
-3) Lower mileage is better
-4) Newer year is better
-
-Numeric rules:
-- Use only numbers that exist in the JSON
-- Money is Thai Baht, format as ###,### THB
-- If a number is missing, say "N/A"
+{PICK_CRITERIA}
 
 Reply **JSON only**:
 {{
-  "car_id": <id>,
+  "car_id": <id column>,
   "reason": "<English explanation, 80–180 words, cite only real numbers>"
 }}
 
 session_params:
-{json.dumps({k: v for k, v in session_params.items() if k in ("q","max_budget","salary","gender","marital_status","occupation","education_level","purpose","other_prefs")}, ensure_ascii=False)}
+{json.dumps(prompt_params, ensure_ascii=False)}
 
-cars_list:
-{json.dumps(cars_payload, ensure_ascii=False)}
+cars:
+{enc.table}
         """.strip()
 
-        resp = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=config,
-        )
-
-        txt = (resp.text or "").strip()
-
-        # Try to parse JSON
-        j = None
-        try:
-            j = json.loads(txt)
-        except Exception:
-            m = re.search(r"\{[\s\S]+\}", txt)
-            if m:
-                try:
-                    j = json.loads(m.group(0))
-                except Exception:
-                    j = None
+        j = generate_json(prompt)
 
         if not isinstance(j, dict) or "car_id" not in j:
             # Bad format → fallback
-            return _fallback_pick(cars, max_budget, exclude_ids)
+            return _fallback_pick(cars, session_params, exclude_ids, settings)
 
-        cid = _safe_int(j.get("car_id"))
+        cid = enc.ids.get(as_int(j.get("car_id")))
         reason = str(j.get("reason") or "").strip()
 
         # Map back to object
@@ -180,20 +141,100 @@ cars_list:
 
         # If model picked over-budget while in-budget options exist → correct it
         if selected:
-            price = _safe_int(getattr(selected, "price_thb", None))
+            price = as_int(getattr(selected, "price_thb", None))
             if max_budget is not None and in_budget_ids and selected.id not in in_budget_ids:
-                fb, fb_reason = _fallback_pick(cars, max_budget, exclude_ids)
+                fb, fb_reason = _fallback_pick(cars, session_params, exclude_ids, settings)
                 if fb:
-                    return fb, (reason or fb_reason)
+                    return fb, fb_reason  # model's reason describes the other car
             # Normalize price formatting inside reason
             if price is not None:
                 reason = reason.replace(str(price), f"{price:,}")
         else:
-            return _fallback_pick(cars, max_budget, exclude_ids)
-
-        return selected, reason or "Reason: selected based on value within budget."
+            return _fallback_pick(cars, session_params, exclude_ids, settings)
+
+        reason = reason or "Reason: selected based on value within budget."
+        if cache_key:
+            try:
+                put_pick(db, cache_key, selected.id, reason,
+                         settings.get("pick_cache_ttl_sec", DEFAULT_TTL_SEC))
+            except Exception as e:
+                db.rollback()
+                print("pick cache store error:", e)
+        return selected, reason
 
     except Exception as e:
         # Do not crash: log and fallback
         print("pick_best_car_with_gemini error:", e)
-        return _fallback_pick(cars, max_budget, exclude_ids)
+        return _fallback_pick(cars, session_params, exclude_ids, settings)
+
+
+def rank_cars_with_gemini(
+    cars: List, session_params: dict | None = None, k: int = 5, timeout: Optional[float] = None,
+    settings: dict | None = None,
+) -> List[Tuple[int, str]]:
+    """
+    ขอ model จัดอันดับ top-k ทีเดียวพร้อมเหตุผล → [(car_id, reason_en)] (ใช้ทำ pick chain ล่วงหน้า ดู pick_chain.py)
+    - id ที่ไม่มีจริง/ซ้ำถูกตัดทิ้ง; ถ้ามีรถในงบ คันในงบขึ้นก่อนคันเกินงบ (กติกาเดียวกับ pick_best_car_with_gemini)
+    - ไม่มี API key / เกิน timeout / model error / ตอบผิดรูปแบบ → [] (ผู้เรียกค่อยไปใช้ทางเดิมทีละคัน)
+    """
+    settings = settings or {}
+    session_params = session_params or {}
+    prompt_params = {key: v for key, v in session_params.items() if key in PROMPT_PARAM_KEYS}
+    if not cars or k <= 0 or not api_key():
+        return []
+
+    max_budget = as_int(session_params.get("max_budget"))
+    in_budget_ids = _in_budget_ids(cars, max_budget)
+    enc = _encode(cars, session_params, "rank", settings)
+    k = min(k, len(enc.ids))
+
+    prompt = f"""
+You are an assistant that ranks the **top {k}** "best-fit used cars" for a user, best first.
+Constraints:
+- User's maximum budget (no more than): {max_budget if max_budget is not None else "N/A"}
+- Candidates are listed in `cars` below: one per line, `|`-separated, empty cell = unknown.
+- Rank cars within budget above cars over budget.
+- Each car at most once.
+
+{PICK_CRITERIA}
+
+Reply **JSON only**:
+{{
+  "picks": [
+    {{"car_id": <id column>, "reason": "<English explanation, 80–180 words, cite only real numbers>"}}
+  ]
+}}
+
+session_params:
+{json.dumps(prompt_params, ensure_ascii=False)}
+
+cars:
+{enc.table}
+    """.strip()
+
+    j = generate_json(prompt, timeout=timeout)
+
+    items = j.get("picks") if isinstance(j, dict) else j
+    if not isinstance(items, list):
+        return []
+
+    prices = {c.id: as_int(getattr(c, "price_thb", None)) for c in cars}
+    picks: List[Tuple[int, str]] = []
+    seen = set()
+    for it in items:
+        if not isinstance(it, dict):
+            continue
+        cid = enc.ids.get(as_int(it.get("car_id")))
+        if cid is None or cid in seen:
+            continue
+        seen.add(cid)
+        reason = str(it.get("reason") or "").strip() or "Reason: selected based on value within budget."
+        price = prices[cid]
+        if price is not None:
+            reason = reason.replace(str(price), f"{price:,}")
+        picks.append((cid, reason))
+
+    # model เอาคันเกินงบขึ้นก่อนทั้งที่มีคันในงบ → เลื่อนคันในงบขึ้นหน้า (คงลำดับเดิมภายในกลุ่ม)
+    if max_budget is not None and in_budget_ids:
+        picks.sort(key=lambda p: p[0] not in in_budget_ids)
+    return picks[:k]
@@ -0,0 +1,75 @@
+# app/services/pick_cache.py
+# -*- coding: utf-8 -*-
+"""
+cache ถาวรของรถที่ Gemini แนะนำ (ตาราง pick_cache) — refresh / กด back ที่หน้า best car ไม่ต้องเรียก model ซ้ำ
+
+- key = sha256(car ids ที่เรียงแล้ว, params ของ session ที่ส่งเข้า prompt, exclude ids ที่เรียงแล้ว, ชื่อ model)
+  ชุดรถ/params/exclude เดียวกัน = คำตอบเดียวกัน
+- เก็บเฉพาะคำตอบจาก model (ไม่เก็บ fallback — model ล่มชั่วคราวแล้วครั้งหน้ายังได้ลองใหม่)
+- หมดอายุใน PICK_CACHE_TTL_SEC และเกิน PICK_CACHE_MAX_ROWS แถว → ลบแถวที่ไม่ได้ใช้นานสุดก่อน (prune_picks)
+  (ค่าจาก app.config ผ่าน pick_settings ใน app/services/llm_select.py)
+"""
+import hashlib, json
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import PickCache
+
+DEFAULT_TTL_SEC = 24 * 3600
+DEFAULT_MAX_ROWS = 20000
+
+
+def pick_key(car_ids: Iterable[int], params: Dict, exclude_ids: Iterable[int], model: str) -> str:
+    raw = json.dumps(
+        {
+            "cars": sorted(int(i) for i in car_ids),
+            "params": params,
+            "exclude": sorted({int(i) for i in exclude_ids}),
+            "model": model,
+        },
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_pick(db, key: str) -> Optional[Tuple[int, str]]:
+    """(car_id, reason) ถ้ายังไม่หมดอายุ (นับ hit บนแถว — caller commit เอง)"""
+    row = db.execute(
+        select(PickCache).where(PickCache.key == key, PickCache.expires_at > func.now())
+    ).scalars().first()
+    if row is None:
+        return None
+    row.hits = (row.hits or 0) + 1
+    row.last_used_at = func.now()
+    return int(row.car_id), row.reason or ""
+
+
+def put_pick(db, key: str, car_id: int, reason: str, ttl_sec: int = DEFAULT_TTL_SEC) -> None:
+    """บันทึก/ทับคำตอบของ key นี้ (caller commit เอง)"""
+    values = {
+        "key": key,
+        "car_id": int(car_id),
+        "reason": reason or "",
+        "expires_at": func.now() + timedelta(seconds=ttl_sec),
+        "last_used_at": func.now(),
+    }
+    stmt = insert(PickCache.__table__).values(**values)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[PickCache.__table__.c.key],
+        set_={k: stmt.excluded[k] for k in ("car_id", "reason", "expires_at", "last_used_at")},
+    ))
+
+
+def prune_picks(db, max_rows: int = DEFAULT_MAX_ROWS) -> int:
+    """ลบแถวหมดอายุ + แถวที่เกิน max_rows (ไม่ได้ใช้นานสุดก่อน) — caller commit เอง"""
+    n = db.execute(
+        delete(PickCache).where(PickCache.expires_at < func.now()).execution_options(synchronize_session=False)
+    ).rowcount or 0
+    overflow = select(PickCache.id).order_by(PickCache.last_used_at.desc()).offset(max_rows)
+    n += db.execute(
+        delete(PickCache).where(PickCache.id.in_(overflow)).execution_options(synchronize_session=False)
+    ).rowcount or 0
+    return n
@@ -0,0 +1,76 @@
+# app/services/pick_chain.py
+# -*- coding: utf-8 -*-
+"""
+pick chain: รถแนะนำจาก model เรียงลำดับไว้ล่วงหน้า (search_sessions.picks_json)
+
+- ขอ model จัดอันดับ top-K พร้อมเหตุผลครั้งเดียว (rank_cars_with_gemini) แทนการเรียก model ใหม่ทุกครั้งที่ผู้ใช้กด
+  "another pick" — สร้างตอนผู้ใช้ขอคำแนะนำจาก AI ครั้งแรก (/search/<id>/best?ai=1) หรือให้ worker สร้างทันที
+  ที่งานค้นหาจบเป็น done เมื่อตั้ง PICK_CHAIN_PRECOMPUTE=true (เสียค่า model ทุก session แม้ไม่มีใครขอ)
+  ค่าเริ่มต้นหน้า best car ใช้คะแนนในเครื่อง (app/services/scoring.py) ไม่เรียก model
+- /search/<id>/best?exclude=... → next_pick = คันแรกใน chain ที่ยังไม่ถูก exclude (อ่าน DB อย่างเดียว)
+- chain ผูกกับ key = pick_key(car ids, params ที่ส่งเข้า prompt, [], model) — ชุดรถ/params/model เปลี่ยน
+  chain นั้นใช้ไม่ได้; ไล่ครบทุกคันแล้ว → ผู้เรียกกลับไปใช้ pick_best_car_with_gemini ทีละคันแบบเดิม
+  สร้าง chain ไม่สำเร็จ (model timeout/error) → ผู้เรียกใช้คะแนนในเครื่อง ไม่ถาม model ซ้ำในคำขอเดียวกัน
+- PICK_CHAIN_K / PICK_CHAIN_TIMEOUT_SEC / PICK_CHAIN_PRECOMPUTE มาจาก app.config ผ่าน pick_settings (llm_select.py)
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+from app.services.llm_select import GEMINI_MODEL, PROMPT_PARAM_KEYS, rank_cars_with_gemini
+from app.services.pick_cache import pick_key
+from app.services.session_cars import session_cars
+
+# จำนวนคันที่ให้ model จัดอันดับล่วงหน้าต่อ session
+DEFAULT_CHAIN_K = 5
+
+
+def _chain_key(cars: List, params: Dict) -> str:
+    prompt_params = {k: v for k, v in params.items() if k in PROMPT_PARAM_KEYS}
+    return pick_key((c.id for c in cars), prompt_params, [], GEMINI_MODEL)
+
+
+def _params(ss) -> Dict:
+    raw = ss.params_json
+    return raw if isinstance(raw, dict) else (json.loads(raw or "{}") if raw else {})
+
+
+def precompute_picks(
+    db, ss, cars: Optional[List] = None, settings: Optional[Dict] = None, timeout: Optional[float] = None,
+) -> int:
+    """
+    จัดอันดับ top-chain_k ของ session แล้วเก็บลง ss.picks_json (caller commit เอง)
+    คืนจำนวนคันใน chain (0 = model ใช้ไม่ได้ → ไม่เก็บอะไร)
+    timeout=None = LLM_TIMEOUT_SEC ของหน้าเว็บ; worker ส่ง settings["chain_timeout_sec"] (รอได้นานกว่า)
+    """
+    settings = settings or {}
+    cars = session_cars(db, ss.id) if cars is None else cars
+    params = _params(ss)
+    picks = rank_cars_with_gemini(cars, params, settings.get("chain_k", DEFAULT_CHAIN_K), timeout=timeout,
+                                  settings=settings)
+    if not picks:
+        return 0
+    ss.picks_json = {
+        "key": _chain_key(cars, params),
+        "picks": [{"car_id": cid, "reason": reason} for cid, reason in picks],
+    }
+    return len(picks)
+
+
+def has_chain(ss, cars: List) -> bool:
+    """มี chain ที่ตรงกับชุดรถ/params ปัจจุบัน (ใช้ครบแล้วก็นับว่ามี — ไม่ต้องขอ model จัดอันดับซ้ำ)"""
+    chain = ss.picks_json
+    return isinstance(chain, dict) and chain.get("key") == _chain_key(cars, _params(ss))
+
+
+def next_pick(ss, cars: List, exclude_ids: List[int]) -> Optional[Tuple[object, str]]:
+    """(car, reason) คันถัดไปใน chain ที่ไม่อยู่ใน exclude_ids; None = ไม่มี chain / chain เก่า / ใช้ครบแล้ว"""
+    if not has_chain(ss, cars):
+        return None
+    chain = ss.picks_json
+    by_id = {c.id: c for c in cars}
+    excluded = set(exclude_ids or [])
+    for p in chain.get("picks") or []:
+        cid = p.get("car_id")
+        if cid in by_id and cid not in excluded:
+            return by_id[cid], p.get("reason") or ""
+    return None
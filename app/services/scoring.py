@@ -0,0 +1,253 @@
+# app/services/scoring.py
+# -*- coding: utf-8 -*-
+"""
+ให้คะแนนรถของ session ในเครื่องแบบ deterministic หลายเกณฑ์ — ใช้เลือกรถแนะนำแทน LLM เป็นค่าเริ่มต้น
+(LLM ถูกเรียกเฉพาะเมื่อผู้ใช้ขอเอง ดู /search/<id>/best?ai=1)
+
+เกณฑ์ (ค่า 0..1 ต่อคัน) คำนวณทีละคอลัมน์บน list ของทุกคันในรอบเดียว (ราคา / ปี / ไมล์ แยกเป็น list ขนานกัน):
+- budget  : อยู่ในงบ = เกือบเต็ม (เหลือเงินมากลดนิดหน่อย), เกินงบลดแรง; ไม่ตั้งงบ = ถูกกว่าในผลลัพธ์ชุดนี้ดีกว่า
+- age     : อายุรถ 0 ปี = 1 → 20 ปีขึ้นไป = 0
+- mileage : ไมล์ต่อปี ≤ 10,000 = 1 → ≥ 40,000 = 0 (ไม่รู้ปีใช้ไมล์รวมเทียบ 300,000 กม.)
+- body / fuel / gear : ตรงกับที่เลือกในฟอร์ม (car_type / fuel_type / gear_type) = 1, ไม่มีข้อมูล = 0.5, ไม่ตรง = 0
+  (ตัดสินด้วย attr_value_matches เงื่อนไขเดียวกับ filter ใน SQL) — ไม่ได้เลือกไว้ = ไม่นับเกณฑ์นั้น
+ไม่มีข้อมูลราคา/ปี/ไมล์ได้ค่ากลาง ๆ แทน; คะแนนรวม = ผลรวมถ่วงน้ำหนักของเกณฑ์ที่ใช้ ÷ น้ำหนักรวม × 100
+
+น้ำหนักตั้งได้ผ่าน SCORE_WEIGHTS ใน app.config เช่น "budget=0.4,age=0.2,mileage=0.2,body=0.1,fuel=0.05,gear=0.05"
+(parse_weights → pick_settings()["score_weights"] ของ app/services/llm_select.py); ไม่ส่ง weights = DEFAULT_WEIGHTS
+"""
+import re
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.scrapers.normalize import attr_filter_values, attr_needle, attr_value_matches
+from app.services.listing_cache import ATTR_PARAMS, YEAR_KEYS
+
+DEFAULT_WEIGHTS = {"budget": 0.35, "age": 0.2, "mileage": 0.2, "body": 0.1, "fuel": 0.1, "gear": 0.05}
+# เกณฑ์ความชอบ → param ของฟอร์ม (คอลัมน์ของ car_cache ดูจาก ATTR_PARAMS)
+PREF_PARAMS = {"body": "car_type", "fuel": "fuel_type", "gear": "gear_type"}
+_PREF_LABELS = {"body": "body type", "fuel": "fuel type", "gear": "transmission"}
+
+MISSING = 0.5          # ค่ากลางของเกณฑ์ที่ไม่มีข้อมูล
+MISSING_PRICE = 0.3    # ไม่รู้ราคา = เสี่ยงเกินงบ
+MAX_AGE = 20
+GOOD_KM_PER_YEAR, BAD_KM_PER_YEAR = 10_000, 40_000
+_YEAR_RE = re.compile(r"(?:19|20)[0-9]{2}")
+
+
+def parse_weights(raw: str) -> Dict[str, float]:
+    """'budget=0.4,age=0.2' -> DEFAULT_WEIGHTS ที่ถูกแทนค่าเฉพาะ key ที่รู้จัก"""
+    out = dict(DEFAULT_WEIGHTS)
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        k = k.strip().lower()
+        if k not in out:
+            continue
+        try:
+            out[k] = max(0.0, float(v.strip()))
+        except ValueError:
+            continue
+    return out
+
+
+class Scored(NamedTuple):
+    car: object
+    score: float               # 0..100
+    parts: Dict[str, float]    # เกณฑ์ที่ใช้จริง → 0..1
+    over_budget: bool          # ราคาเกินงบ (ไม่รู้ราคา = ไม่นับว่าเกิน)
+
+
+def as_int(v) -> Optional[int]:
+    """ตัวเลขจำนวนเต็มจากค่าใน DB / ฟอร์ม / คำตอบ model ("519,000 THB" → 519000); bool / ไม่มีตัวเลข = None"""
+    if v is None or isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float, Decimal)):
+        return int(v)
+    digits = "".join(ch for ch in str(v) if ch.isdigit())
+    return int(digits) if digits else None
+
+
+def _year(c) -> Optional[int]:
+    y = as_int(c.year)
+    if y and 1900 <= y <= 2100:
+        return y
+    # ลำดับคีย์เดียวกับ year_expr() ที่ filter ช่วงปีใน SQL
+    ex = c.extra if isinstance(c.extra, dict) else {}
+    for k in YEAR_KEYS:
+        if isinstance(k, tuple):
+            sub = ex.get(k[0])
+            raw = sub.get(k[1]) if isinstance(sub, dict) else None
+        else:
+            raw = ex.get(k)
+        m = _YEAR_RE.search(str(raw or ""))
+        if m:
+            return int(m.group(0))
+    return None
+
+
+def _clamp(x: float) -> float:
+    return 0.0 if x < 0 else 1.0 if x > 1 else x
+
+
+def _budget_col(prices: List[Optional[int]], budget: Optional[int]) -> List[float]:
+    if budget:
+        return [
+            MISSING_PRICE if p is None
+            else 1.0 - 0.1 * (budget - p) / budget if p <= budget
+            else _clamp(0.5 - 2.0 * (p - budget) / budget)
+            for p in prices
+        ]
+    known = [p for p in prices if p is not None]
+    lo, hi = (min(known), max(known)) if known else (0, 0)
+    span = (hi - lo) or 1
+    return [MISSING_PRICE if p is None else 1.0 - 0.5 * (p - lo) / span for p in prices]
+
+
+def _age_col(ages: List[Optional[int]]) -> List[float]:
+    return [MISSING if a is None else _clamp(1.0 - a / MAX_AGE) for a in ages]
+
+
+def _mileage_col(kms: List[Optional[int]], ages: List[Optional[int]]) -> List[float]:
+    span = BAD_KM_PER_YEAR - GOOD_KM_PER_YEAR
+    return [
+        MISSING if km is None
+        else _clamp(1.0 - km / 300_000) if a is None
+        else _clamp(1.0 - (km / max(a, 1) - GOOD_KM_PER_YEAR) / span)
+        for km, a in zip(kms, ages)
+    ]
+
+
+def _pref_col(values: List[Optional[str]], col: str, wanted: Tuple[List[str], str]) -> List[float]:
+    ok, needle = set(wanted[0]), wanted[1]
+    return [MISSING if not v else 1.0 if attr_value_matches(col, v, ok, needle) else 0.0 for v in values]
+
+
+def _wanted(params: Dict) -> Dict[str, Tuple[List[str], str]]:
+    """เกณฑ์ความชอบที่ผู้ใช้เลือกไว้ → (ค่าในคอลัมน์ที่นับว่าตรง, substring สำหรับค่าดิบ)"""
+    out = {}
+    for key, param in PREF_PARAMS.items():
+        wanted = params.get(param) or ""
+        values = attr_filter_values(ATTR_PARAMS[param], wanted)
+        if values:
+            out[key] = (values, attr_needle(wanted))
+    return out
+
+
+def score_cars(cars: List, params: Optional[Dict] = None, weights: Optional[Dict[str, float]] = None) -> List[Scored]:
+    """คะแนนของทุกคัน (ลำดับเดียวกับ cars)"""
+    params = params or {}
+    weights = weights or DEFAULT_WEIGHTS
+    if not cars:
+        return []
+
+    this_year = date.today().year
+    prices = [as_int(c.price_thb) for c in cars]
+    years = [_year(c) for c in cars]
+    ages = [None if y is None else max(0, this_year - y) for y in years]
+    kms = [as_int(c.mileage_km) for c in cars]
+
+    budget = as_int(params.get("max_budget"))
+    cols = {
+        "budget": _budget_col(prices, budget),
+        "age": _age_col(ages),
+        "mileage": _mileage_col(kms, ages),
+    }
+    for key, wanted in _wanted(params).items():
+        col = ATTR_PARAMS[PREF_PARAMS[key]]
+        cols[key] = _pref_col([getattr(c, col, None) for c in cars], col, wanted)
+
+    active = {k: weights.get(k, 0.0) for k in cols if weights.get(k, 0.0) > 0}
+    total_w = sum(active.values()) or 1.0
+    totals = [0.0] * len(cars)
+    for k, w in active.items():
+        totals = [t + w * f for t, f in zip(totals, cols[k])]
+
+    return [
+        Scored(c, round(100.0 * t / total_w, 1), {k: cols[k][i] for k in active},
+               bool(budget) and p is not None and p > budget)
+        for i, (c, t, p) in enumerate(zip(cars, totals, prices))
+    ]
+
+
+def rank_scored(cars: List, params: Optional[Dict] = None, weights: Optional[Dict[str, float]] = None) -> List[Scored]:
+    """คันในงบทั้งหมดก่อนคันเกินงบ แล้วคะแนนมากสุดก่อน (เท่ากัน: ราคาต่ำก่อน แล้ว id)"""
+    return sorted(
+        score_cars(cars, params, weights),
+        key=lambda s: (
+            s.over_budget, -s.score,
+            as_int(s.car.price_thb) if as_int(s.car.price_thb) is not None else 10 ** 15, s.car.id,
+        ),
+    )
+
+
+# ----------------------------- explanation -----------------------------
+def _thb(n: int) -> str:
+    return f"{n:,} THB"
+
+
+def explain(s: Scored, params: Optional[Dict] = None, place: int = 1, total: int = 1) -> str:
+    """เหตุผลภาษาอังกฤษจากตัวเลขจริงของรถคันนั้น (แทนเหตุผลจาก LLM)"""
+    params = params or {}
+    c = s.car
+    price, km, year = as_int(c.price_thb), as_int(c.mileage_km), _year(c)
+    budget = as_int(params.get("max_budget"))
+    lines = []
+
+    if price is None:
+        lines.append("Price is not listed.")
+    elif budget and price <= budget:
+        lines.append(f"Priced at {_thb(price)}, within your {_thb(budget)} budget ({_thb(budget - price)} to spare).")
+    elif budget:
+        lines.append(f"Priced at {_thb(price)}, {_thb(price - budget)} over your {_thb(budget)} budget.")
+    else:
+        lines.append(f"Priced at {_thb(price)}.")
+
+    age = None if year is None else max(0, date.today().year - year)
+    if year is None:
+        lines.append("Model year is not listed.")
+    else:
+        lines.append(f"{year} model, about {age} year{'s' if age != 1 else ''} old.")
+
+    if km is None:
+        lines.append("Mileage is not listed.")
+    elif age is None:
+        lines.append(f"{km:,} km on the clock.")
+    else:
+        lines.append(f"{km:,} km, about {km // max(age, 1):,} km per year.")
+
+    wanted = _wanted(params)
+    matched, unknown, other = [], [], []
+    for key in wanted:
+        col = ATTR_PARAMS[PREF_PARAMS[key]]
+        label = f"{_PREF_LABELS[key]} ({params.get(PREF_PARAMS[key])})"
+        f = s.parts.get(key)
+        if f == 1.0:
+            matched.append(label)
+        elif f == 0.0:
+            other.append(f"{_PREF_LABELS[key]} is {getattr(c, col)}")
+        else:
+            unknown.append(_PREF_LABELS[key])
+    if matched:
+        lines.append("Matches your preferred " + ", ".join(matched) + ".")
+    if other:
+        lines.append("Differs from your preferences: " + "; ".join(other) + ".")
+    if unknown:
+        lines.append("Listing does not state the " + ", ".join(unknown) + ".")
+
+    lines.append(f"Score {s.score:.0f}/100, #{place} of {total} cars in this search.")
+    return " ".join(lines)
+
+
+def best_pick(
+    cars: List, params: Optional[Dict] = None, exclude_ids: Optional[List[int]] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> Tuple[Optional[object], str]:
+    """(car, reason) คะแนนสูงสุดที่ไม่อยู่ใน exclude_ids (อันดับนับรวมคันที่ exclude ไปแล้ว)"""
+    excluded = set(exclude_ids or [])
+    ranked = rank_scored(cars, params, weights)
+    for place, s in enumerate(ranked, start=1):
+        if s.car.id not in excluded:
+            return s.car, explain(s, params, place, len(ranked))
+    return None, ""
@@ -0,0 +1,146 @@
+# app/services/scrape_cache.py
+# -*- coding: utf-8 -*-
+"""
+cache ระดับ query ของผล scrape (ตาราง scrape_runs)
+
+สองคนค้น "City" งบไม่เกิน 500k ห่างกันไม่กี่นาที ไม่ต้องเปิด Selenium ซ้ำ:
+- fingerprint = (source, q ตัวเล็ก/ตัดช่องว่าง, งบปัดขึ้นเป็นช่วง SCRAPE_CACHE_PRICE_BUCKET, per_source_limit)
+- scrape สำเร็จ → บันทึก run พร้อม car_cache.id ที่ได้ หมดอายุใน SCRAPE_CACHE_TTL_SEC
+- ค้นครั้งถัดไป source ไหนมี run ที่ยังไม่หมดอายุและ "ครอบ" query นี้ (q เดียวกัน, ช่วงราคา >=, limit >=)
+  → hit ใช้ car_ids เดิมทันที, ที่เหลือ (miss) เท่านั้นที่ต้อง scrape
+- scrape จริงใช้เพดานราคา = ขอบบนของช่วง เพื่อให้ run เดียวใช้ได้กับทุกงบในช่วงนั้น
+- hit/miss นับทั้งใน process (stats()) และต่อแถว (scrape_runs.hits) ดูได้ที่ /admin/scraper-pool
+
+TTL / ช่วงราคามาจาก app.config ผ่าน scraper_settings (cache_ttl_sec / cache_price_bucket)
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import select, delete, and_, func
+
+from app.models import CarCache, ScrapeRun
+from app.services import listing_cache
+
+DEFAULT_TTL_SEC = 1800
+DEFAULT_PRICE_BUCKET = 50000
+
+_stats = {"hits": 0, "misses": 0, "recorded": 0}
+_stats_lock = threading.Lock()
+
+
+def normalize_q(q: str) -> str:
+    return " ".join((q or "").lower().split())[:200]
+
+
+def price_bucket(max_price, bucket: int = DEFAULT_PRICE_BUCKET) -> int:
+    """ปัดงบขึ้นเป็นขอบบนของช่วง เช่น 480000 → 500000 (bucket <= 0 = ไม่ปัด)"""
+    p = max(0, int(max_price or 0))
+    if bucket <= 0:
+        return p
+    return -(-p // bucket) * bucket
+
+
+def fingerprint(source: str, q_norm: str, bucket: int, limit: int) -> str:
+    return f"{source}|{q_norm}|{bucket}|{limit}"[:255]
+
+
+class ScrapePlan:
+    """ผลการเช็ค cache ของ session: source ไหน hit (ใช้ run เดิม) / miss (ต้อง scrape)"""
+
+    def __init__(self, q_norm: str, bucket: int, limit: int):
+        self.q_norm = q_norm
+        self.bucket = bucket
+        self.limit = limit
+        self.hits: Dict[str, ScrapeRun] = {}
+        self.misses: List[str] = []
+
+    @property
+    def car_ids(self) -> List[int]:
+        ids: List[int] = []
+        for run in self.hits.values():
+            ids.extend(run.car_ids or [])
+        return ids
+
+
+def plan_scrape(db, params: Dict, settings: dict) -> ScrapePlan:
+    """หา run ที่ใช้แทนการ scrape ได้ของแต่ละ source (caller commit เอง — hits ถูกนับบนแถว)"""
+    plan = ScrapePlan(
+        normalize_q(params.get("q") or ""),
+        price_bucket(params.get("max_budget"), settings.get("cache_price_bucket", DEFAULT_PRICE_BUCKET)),
+        int(params.get("per_source_limit") or 20),
+    )
+    for source in params.get("sources") or []:
+        run = db.execute(
+            select(ScrapeRun)
+            .where(
+                ScrapeRun.source == source,
+                ScrapeRun.q_norm == plan.q_norm,
+                ScrapeRun.price_bucket >= plan.bucket,
+                ScrapeRun.result_limit >= plan.limit,
+                ScrapeRun.expires_at > func.now(),
+            )
+            # ช่วงราคาใกล้ที่สุดก่อน แล้วค่อยเอาอันใหม่สุด
+            .order_by(ScrapeRun.price_bucket.asc(), ScrapeRun.id.desc())
+            .limit(1)
+        ).scalars().first()
+        if run is None:
+            plan.misses.append(source)
+            continue
+        run.hits = (run.hits or 0) + 1
+        run.last_hit_at = func.now()
+        plan.hits[source] = run
+
+    with _stats_lock:
+        _stats["hits"] += len(plan.hits)
+        _stats["misses"] += len(plan.misses)
+    return plan
+
+
+def record_run(db, source: str, plan: ScrapePlan, since: datetime, settings: dict) -> ScrapeRun:
+    """บันทึกผล scrape ที่เพิ่งจบ: รถของ source นี้ที่ถูก upsert ตั้งแต่ `since` และตรงกับ query"""
+    conds = listing_cache.query_conds({"q": plan.q_norm, "max_budget": plan.bucket, "sources": [source]})
+    car_ids = db.execute(
+        select(CarCache.id).where(and_(*conds, CarCache.scraped_at >= since))
+    ).scalars().all()
+
+    # run ต้องไม่อยู่นานกว่าแถวใน car_cache ที่มันชี้ไป
+    ttl = min(settings.get("cache_ttl_sec", DEFAULT_TTL_SEC), listing_cache.CACHE_TTL_SEC)
+    run = ScrapeRun(
+        fingerprint=fingerprint(source, plan.q_norm, plan.bucket, plan.limit),
+        source=source,
+        q_norm=plan.q_norm,
+        price_bucket=plan.bucket,
+        result_limit=plan.limit,
+        car_ids=[int(i) for i in car_ids],
+        expires_at=func.now() + timedelta(seconds=ttl),
+    )
+    db.add(run)
+    with _stats_lock:
+        _stats["recorded"] += 1
+    return run
+
+
+def prune_runs(db) -> int:
+    res = db.execute(
+        delete(ScrapeRun).where(ScrapeRun.expires_at < func.now()).execution_options(synchronize_session=False)
+    )
+    return res.rowcount or 0
+
+
+def stats(db, settings: dict) -> dict:
+    with _stats_lock:
+        s = dict(_stats)
+    lookups = s["hits"] + s["misses"]
+    live, total_hits = db.execute(
+        select(func.count(), func.coalesce(func.sum(ScrapeRun.hits), 0))
+        .where(ScrapeRun.expires_at > func.now())
+    ).one()
+    return {
+        **s,
+        "hit_rate": round(s["hits"] / lookups, 3) if lookups else 0.0,
+        "live_runs": live,
+        "live_runs_hits": int(total_hits),
+        "ttl_sec": settings.get("cache_ttl_sec", DEFAULT_TTL_SEC),
+        "price_bucket": settings.get("cache_price_bucket", DEFAULT_PRICE_BUCKET),
+    }
@@ -0,0 +1,316 @@
+# app/services/scrape_runner.py
+# -*- coding: utf-8 -*-
+"""
+สั่งรัน scraper ของทุกแหล่ง "พร้อมกัน" แทนการรันทีละแหล่ง
+
+- SCRAPER_MODE=worker (ค่าเริ่มต้น): ส่งงานเข้า worker pool ที่อยู่ใน process เดียวกับเว็บ (app/services/scrape_worker.py)
+- SCRAPER_MODE=subprocess: แต่ละแหล่งรันเป็น subprocess แยก (scripts/scrape_*.py) ในเธรดของตัวเอง
+- มี timeout ราย source (SCRAPER_TIMEOUT_SEC / SCRAPER_SOURCE_TIMEOUTS)
+- ยกเลิกได้ผ่าน cancel_event (kill ทุก process ที่ยังค้าง)
+- scraper commit ทีละคัน ดังนั้นถ้าโดน timeout/cancel ข้อมูลที่ upsert ไปแล้วยังอยู่ใน car_cache (partial result)
+- จำกัดจำนวน scraper ของแหล่งเดียวกันที่รันพร้อมกันใน process (SCRAPER_SOURCE_CONCURRENCY) ดู source_slot()
+"""
+import os, sys, time, subprocess, threading
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.scrapers import SOURCES
+
+# โหมด subprocess: CLI บาง ๆ ของแต่ละ source (ตัว scraper อยู่ใน app/scrapers)
+SCRAPER_SCRIPTS = {source: f"scrape_{source}.py" for source in SOURCES}
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "scripts"))
+
+# ตรวจสถานะ process ทุก ๆ กี่วินาที (ใช้เช็ค timeout / cancel)
+POLL_SEC = 0.5
+
+
+def _parse_source_ints(raw: str) -> Dict[str, int]:
+    """'kaidee=300,carsome=240' -> {'kaidee': 300, 'carsome': 240}"""
+    out: Dict[str, int] = {}
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        try:
+            out[k.strip().lower()] = int(v.strip())
+        except ValueError:
+            continue
+    return out
+
+
+def scraper_settings(config) -> dict:
+    """
+    ดึงค่าที่ scraper ต้องใช้ออกจาก app.config ตอนอยู่ใน request
+    (เธรดที่รัน scraper ไม่มี app context ให้ใช้ current_app)
+    """
+    return {
+        "chromedriver": config.get("SCRAPER_CHROMEDRIVER", "") or os.getenv("CHROMEDRIVER_PATH", ""),
+        "headless": config.get("SCRAPER_HEADLESS", True),
+        "debug_dump": config.get("SCRAPER_DEBUG_DUMP", False),
+        "timeout_sec": int(config.get("SCRAPER_TIMEOUT_SEC", 480)),
+        "source_timeouts": _parse_source_ints(config.get("SCRAPER_SOURCE_TIMEOUTS", "")),
+        "source_concurrency": _parse_source_ints(config.get("SCRAPER_SOURCE_CONCURRENCY", "")),
+        "source_concurrency_default": int(config.get("SCRAPER_SOURCE_CONCURRENCY_DEFAULT", 2)),
+        "mode": (config.get("SCRAPER_MODE") or "worker").lower(),
+        "workers": int(config.get("SCRAPER_WORKERS", 4)),
+        "driver_pool_size": int(config.get("SCRAPER_DRIVER_POOL_SIZE", 0)),
+        "driver_pool_max": int(config.get("SCRAPER_DRIVER_POOL_MAX", 4)),
+        "driver_max_uses": int(config.get("SCRAPER_DRIVER_MAX_USES", 20)),
+        "detail_workers": int(config.get("SCRAPER_DETAIL_WORKERS", 1)),
+        "fetch_backend": (config.get("SCRAPER_FETCH_BACKEND") or "auto").lower(),
+        "incremental": bool(config.get("SCRAPER_INCREMENTAL", True)),
+        "cache_ttl_sec": int(config.get("SCRAPE_CACHE_TTL_SEC", 1800)),
+        "cache_price_bucket": int(config.get("SCRAPE_CACHE_PRICE_BUCKET", 50000)),
+    }
+
+
+def build_scraper_args(source: str, q: str, min_price: int, max_price: int, limit: int,
+                       settings: dict) -> Optional[List[str]]:
+    script_name = SCRAPER_SCRIPTS.get(source)
+    if not script_name:
+        return None
+
+    args = [
+        sys.executable, os.path.join(SCRIPTS_DIR, script_name),
+        "--q", q or "",
+        "--min", str(min_price),
+        "--max", str(max_price),
+        "--limit", str(limit),
+    ]
+    if settings.get("chromedriver"):
+        args += ["--chromedriver", settings["chromedriver"]]
+    if settings.get("headless"):
+        args.append("--headless")
+    if settings.get("debug_dump"):
+        args.append("--debug-dump")
+    if int(settings.get("detail_workers", 1)) > 1:
+        args += ["--detail-workers", str(settings["detail_workers"])]
+    if settings.get("fetch_backend") == "selenium":
+        args += ["--fetch-backend", "selenium"]
+    if not settings.get("incremental", True):
+        args.append("--full")
+
+    # เพิ่ม debug พิเศษให้ roddonjai
+    if source == "roddonjai":
+        args.append("--debug-fuel")
+    return args
+
+
+def _timeout_for(source: str, settings: dict) -> int:
+    return int(settings.get("source_timeouts", {}).get(source) or settings.get("timeout_sec") or 480)
+
+
+_slots: Dict[str, threading.BoundedSemaphore] = {}
+_slots_lock = threading.Lock()
+
+
+def source_slot(source: str, settings: dict) -> threading.BoundedSemaphore:
+    """
+    semaphore ต่อ source (ใช้ร่วมกันทุกงานค้นหาใน process) กันยิงเว็บเดียวกันพร้อมกันเกินไป
+    ขนาดมาจาก settings ของครั้งแรกที่เรียก
+    """
+    with _slots_lock:
+        slot = _slots.get(source)
+        if slot is None:
+            n = settings.get("source_concurrency", {}).get(source) or settings.get("source_concurrency_default") or 2
+            slot = _slots[source] = threading.BoundedSemaphore(max(1, int(n)))
+        return slot
+
+
+def _run_one(source: str, args: List[str], timeout_sec: int,
+             cancel_event: threading.Event, slot: Optional[threading.BoundedSemaphore] = None) -> Tuple[bool, str]:
+    if slot is None:
+        return _run_process(source, args, timeout_sec, cancel_event)
+    # รอคิวของ source นี้ (ระหว่างรอยังยกเลิกได้)
+    while not slot.acquire(timeout=POLL_SEC):
+        if cancel_event.is_set():
+            return False, f"[{source}] cancelled before start"
+    try:
+        return _run_process(source, args, timeout_sec, cancel_event)
+    finally:
+        slot.release()
+
+
+def _run_process(source: str, args: List[str], timeout_sec: int,
+                 cancel_event: threading.Event) -> Tuple[bool, str]:
+    print(f"DEBUG run {source} args: {args}")
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    try:
+        proc = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=env,
+        )
+    except Exception as e:
+        print(f"[{source}] EXCEPTION starting scraper: {e}")
+        return False, f"[{source}] exception: {e}"
+
+    started = time.monotonic()
+    reason = ""
+    while True:
+        try:
+            stdout, stderr = proc.communicate(timeout=POLL_SEC)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel_event.is_set():
+                reason = "cancelled"
+            elif time.monotonic() - started > timeout_sec:
+                reason = f"timeout after {timeout_sec}s"
+            else:
+                continue
+            proc.kill()
+            stdout, stderr = proc.communicate()
+            break
+
+    stdout = (stdout or "").strip()
+    stderr = (stderr or "").strip()
+    elapsed = time.monotonic() - started
+
+    if reason:
+        # แถว ๆ ที่ commit ไปก่อนโดน kill ยังอยู่ใน car_cache
+        print(f"[{source}] STOPPED ({reason}, {elapsed:.1f}s) — keeping partial results")
+        if stdout:
+            print(f"[{source}] STDOUT (partial):\n{stdout}")
+        return False, f"[{source}] {reason}\n{stdout[-2000:]}"
+
+    if proc.returncode != 0:
+        # log error ของ source นั้น ๆ ด้วย ถึงแม้ source อื่นจะ ok
+        print(f"[{source}] ERROR exit={proc.returncode} ({elapsed:.1f}s)")
+        if stdout:
+            print(f"[{source}] STDOUT (error case):\n{stdout}")
+        if stderr:
+            print(f"[{source}] STDERR:\n{stderr}")
+        return False, f"[{source}] exit={proc.returncode}\n{stdout}\n{stderr}"
+
+    print(f"[{source}] done in {elapsed:.1f}s")
+    if stdout:
+        print(f"[{source}] STDOUT:\n{stdout}")
+    if stderr:
+        print(f"[{source}] STDERR:\n{stderr}")
+    return True, stdout[-2000:]
+
+
+def run_scrapers_parallel(
+    sources: List[str],
+    q: str,
+    min_price: int,
+    max_price: int,
+    limit: int,
+    settings: dict,
+    cancel_event: Optional[threading.Event] = None,
+    on_result: Optional[Callable[[str, Tuple[bool, str]], None]] = None,
+) -> Dict[str, Tuple[bool, str]]:
+    """
+    รันทุก source พร้อมกัน แล้วคืน {source: (ok, msg)}
+    เวลารวมจะเท่ากับ source ที่ช้าที่สุด (ไม่ใช่ผลรวมของทุก source)
+    on_result(source, (ok, msg)) ถูกเรียกทันทีที่แต่ละ source จบ (ตามลำดับที่เสร็จ)
+    """
+    cancel_event = cancel_event or threading.Event()
+    results = _ResultSink(on_result)
+
+    if settings.get("mode") == "worker":
+        return _run_in_worker_pool(sources, q, min_price, max_price, limit, settings, cancel_event, results)
+
+    jobs = {}
+    for s in sources:
+        args = build_scraper_args(s, q, min_price, max_price, limit, settings)
+        if args is None:
+            results[s] = (False, f"unknown source: {s}")
+            continue
+        jobs[s] = args
+
+    if not jobs:
+        return dict(results)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="scraper") as pool:
+        futures = {
+            pool.submit(_run_one, s, args, _timeout_for(s, settings), cancel_event, source_slot(s, settings)): s
+            for s, args in jobs.items()
+        }
+        try:
+            for fut in as_completed(futures):
+                s = futures[fut]
+                try:
+                    results[s] = fut.result()
+                except Exception as e:
+                    print(f"[{s}] EXCEPTION in run_scrapers_parallel: {e}")
+                    results[s] = (False, f"[{s}] exception: {e}")
+        except BaseException:
+            # เช่น KeyboardInterrupt / worker ถูกปิด → สั่ง kill ทุก process ที่เหลือ
+            cancel_event.set()
+            raise
+
+    ok_sources = [s for s, (ok, _) in results.items() if ok]
+    print(f"DEBUG scrapers finished in {time.monotonic() - started:.1f}s ok={ok_sources}")
+    return dict(results)
+
+
+class _ResultSink(dict):
+    """dict ผลลัพธ์ที่เรียก on_result ทุกครั้งที่มี source จบ (callback พังไม่กระทบ scraper ตัวอื่น)"""
+
+    def __init__(self, on_result=None):
+        super().__init__()
+        self._on_result = on_result
+
+    def __setitem__(self, source, result):
+        super().__setitem__(source, result)
+        if self._on_result:
+            try:
+                self._on_result(source, result)
+            except Exception as e:
+                print(f"[{source}] on_result callback error: {e}")
+
+
+def _run_in_worker_pool(
+    sources: List[str],
+    q: str,
+    min_price: int,
+    max_price: int,
+    limit: int,
+    settings: dict,
+    cancel_event: threading.Event,
+    results: "_ResultSink",
+) -> Dict[str, Tuple[bool, str]]:
+    from app.services.scrape_worker import get_worker_pool
+
+    pool = get_worker_pool(settings.get("workers", 4))
+    jobs = {}
+    for s in sources:
+        if s not in SCRAPER_SCRIPTS:
+            results[s] = (False, f"unknown source: {s}")
+            continue
+        print(f"DEBUG queue {s} q={q!r} max={max_price} limit={limit}")
+        jobs[s] = pool.submit(s, q, min_price, max_price, limit, settings)
+
+    started = time.monotonic()
+    pending = dict(jobs)
+    while pending:
+        wait([j.future for j in pending.values()], timeout=POLL_SEC, return_when=FIRST_COMPLETED)
+        now = time.monotonic()
+        for s, job in list(pending.items()):
+            if job.future.done():
+                results[s] = job.future.result()
+                del pending[s]
+                continue
+            # เวลาที่รอ worker ว่าง / source_slot ไม่นับรวมใน timeout ของ source
+            if cancel_event.is_set():
+                reason = "cancelled"
+            elif job.started_at is not None and now - job.started_at > _timeout_for(s, settings):
+                reason = f"timeout after {_timeout_for(s, settings)}s"
+            else:
+                continue
+            # หยุดแบบ cooperative: scraper จะเลิกหลังประกาศที่กำลังทำอยู่ แถวที่ commit แล้วยังอยู่
+            job.stop_event.set()
+            print(f"[{s}] STOPPED ({reason}) — keeping partial results")
+            results[s] = (False, f"[{s}] {reason}")
+            del pending[s]
+
+    ok_sources = [s for s, (ok, _) in results.items() if ok]
+    print(f"DEBUG scrapers finished in {time.monotonic() - started:.1f}s ok={ok_sources}")
+    return dict(results)
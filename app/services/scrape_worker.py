@@ -0,0 +1,161 @@
+# app/services/scrape_worker.py
+# -*- coding: utf-8 -*-
+"""
+Worker pool ที่อยู่ยาวใน process ของเว็บ แทนการ spawn `python scripts/scrape_*.py` ทุกครั้งที่ค้นหา
+
+- รับงาน (source, q, min, max, limit) ผ่านคิวภายใน (queue.Queue) แล้วเรียก engine กลาง (app/scrapers/engine.py) ตรง ๆ
+- adapter ของแต่ละเว็บ (app/scrapers/<source>.py) ถูก import ครั้งเดียวแล้ว cache ไว้ (SQLAlchemy / Selenium / BeautifulSoup / app.models ไม่ต้องโหลดซ้ำ)
+- ทุกงานใช้ engine + connection pool เดียวกับเว็บ (app.db.SessionLocal)
+- หยุดงานกลางทางได้แบบ cooperative ผ่าน job.stop_event (scraper เช็คก่อนเปิดแต่ละประกาศ)
+- ถ้าเปิด driver pool (SCRAPER_DRIVER_POOL_SIZE > 0) จะยืม Chrome ที่เปิดค้างไว้แทนการเปิดใหม่ทุกงาน
+- source ที่รันครบโควตา (source_slot) แล้ว งานถัดไปของ source นั้นจะถูกวนกลับเข้าคิว ไม่ยึด worker ไว้รอ
+"""
+import time, queue, threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+from app.scrapers import SOURCES, get_adapter
+from app.scrapers.engine import scrape
+from app.services.scrape_runner import POLL_SEC, source_slot
+from app.services.driver_pool import get_driver_pool
+
+
+def load_scraper(source: str):
+    """คลาส adapter ของ source (import app/scrapers/<source>.py ครั้งเดียวต่อ process)"""
+    return get_adapter(source)
+
+
+class ScrapeJob:
+    def __init__(self, source: str, kwargs: dict, settings: dict):
+        self.source = source
+        self.kwargs = kwargs
+        self.settings = settings
+        self.future: Future = Future()
+        self.stop_event = threading.Event()
+        self.submitted_at = time.monotonic()
+        # ตั้งตอน worker ได้ source_slot แล้วเริ่มรันจริง — timeout ราย source นับจากตรงนี้ ไม่ใช่ตอน submit
+        self.started_at: Optional[float] = None
+
+
+class ScraperWorkerPool:
+    def __init__(self, workers: int = 4):
+        self.workers = max(1, int(workers))
+        self._jobs: "queue.Queue[Optional[ScrapeJob]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def start(self, warm_up: bool = False) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._loop, name=f"scrape-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        if warm_up:
+            threading.Thread(target=self.warm_up, name="scrape-warm-up", daemon=True).start()
+
+    def warm_up(self) -> None:
+        """import engine + adapter ทุกเว็บล่วงหน้า งานแรกจะได้ไม่ต้องรอ import"""
+        started = time.monotonic()
+        for source in SOURCES:
+            try:
+                load_scraper(source)
+            except Exception as e:
+                print(f"[scrape-worker] warm-up {source} failed: {e}")
+        print(f"[scrape-worker] warm-up done in {time.monotonic() - started:.1f}s")
+
+    def submit(self, source: str, q: str, min_price: int, max_price: int, limit: int,
+               settings: dict) -> ScrapeJob:
+        self.start()
+        kwargs = {
+            "q": q or "",
+            "min_price": min_price,
+            "max_price": max_price,
+            "limit": limit,
+            "chromedriver": settings.get("chromedriver", ""),
+            "headless": bool(settings.get("headless", True)),
+            "debug_dump": bool(settings.get("debug_dump", False)),
+            "detail_workers": int(settings.get("detail_workers", 1)),
+            "fetch_backend": settings.get("fetch_backend", "auto"),
+            "incremental": bool(settings.get("incremental", True)),
+        }
+        # เพิ่ม debug พิเศษให้ roddonjai (เหมือนโหมด subprocess)
+        if source == "roddonjai":
+            kwargs["debug_fuel"] = True
+        job = ScrapeJob(source, kwargs, settings)
+        self._jobs.put(job)
+        return job
+
+    def queue_size(self) -> int:
+        return self._jobs.qsize()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for _ in self._threads:
+                self._jobs.put(None)
+            self._threads = []
+
+    def _loop(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if job.stop_event.is_set():
+                if job.future.set_running_or_notify_cancel():
+                    job.future.set_result((False, f"[{job.source}] cancelled before start"))
+                continue
+
+            slot = source_slot(job.source, job.settings)
+            if not slot.acquire(blocking=False):
+                # source นี้เต็มโควตา → คืนงานท้ายคิว ให้ worker ไปหยิบงานของ source อื่นก่อน
+                self._jobs.put(job)
+                time.sleep(POLL_SEC)
+                continue
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    job.started_at = time.monotonic()
+                    self._run(job)
+            finally:
+                slot.release()
+
+    def _run(self, job: ScrapeJob) -> None:
+        started = job.started_at or time.monotonic()
+        waited = started - job.submitted_at
+        try:
+            adapter_cls = load_scraper(job.source)
+            if int(job.settings.get("driver_pool_size", 0)) > 0:
+                pool = get_driver_pool(job.settings, adapter_cls.DRIVER_PROFILE)
+                with pool.lease(timeout=job.settings.get("timeout_sec")) as driver:
+                    # driver เสริมสำหรับเปิดหน้าประกาศพร้อมกัน: ถ้า pool เต็มเกิน 5 วิ ก็ทำด้วย driver ที่มีอยู่
+                    stats = scrape(
+                        job.source,
+                        stop_event=job.stop_event,
+                        driver=driver,
+                        extra_driver=lambda: pool.lease(timeout=5),
+                        **job.kwargs,
+                    ) or {}
+            else:
+                stats = scrape(job.source, stop_event=job.stop_event, **job.kwargs) or {}
+            elapsed = time.monotonic() - started
+            print(f"[{job.source}] done in {elapsed:.1f}s (queued {waited:.1f}s) stats={stats}")
+            job.future.set_result((
+                True,
+                f"[{job.source}] links={stats.get('links')} created={stats.get('created')} ({elapsed:.1f}s)",
+            ))
+        except Exception as e:
+            print(f"[{job.source}] EXCEPTION in scrape worker: {type(e).__name__}: {e}")
+            job.future.set_result((False, f"[{job.source}] exception: {e}"))
+
+
+_pool: Optional[ScraperWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool(workers: int = 4) -> ScraperWorkerPool:
+    """pool เดียวต่อ process (สร้างครั้งแรกที่เรียก)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ScraperWorkerPool(workers)
+        return _pool
@@ -1,22 +1,46 @@
-from sqlalchemy import select, func
+import random
+
+from sqlalchemy import select
 from app.models import CarCache
+from app.services.text_search import match_conds, rank
+
+
+def _sample(db, stmt, limit: int):
+    """
+    Random rows of stmt without ORDER BY random() over the whole table: every row has rand_key
+    (random at insert, indexed). Start at a random point r, read up the index from r and wrap
+    around to the start only if that was not enough -> ~limit index reads at any table size.
+    """
+    r = random.random()
+    rows = []
+    for part in (stmt.where(CarCache.rand_key >= r), stmt.where(CarCache.rand_key < r)):
+        rows += db.execute(part.order_by(CarCache.rand_key).limit(limit - len(rows))).all()
+        if len(rows) >= limit:
+            break
+    return rows
+
 
 def pick_cars(db, filters: dict | None, limit: int = 12):
     """
     Pick cars from CarCache in a simple way: filter by budget/brand/year then randomize.
+    With a brand, matches go through the trigram index and the most relevant come first.
     """
-    stmt = select(CarCache)
+    conds = []
+    brand = ""
     if filters:
         budget = (filters.get("budget_max") or "").strip()
         brand = (filters.get("brand") or "").strip()
         min_year = (filters.get("min_year") or "").strip()
 
         if budget.isdigit():
-            stmt = stmt.where(CarCache.price_thb <= int(budget))
+            conds.append(CarCache.price_thb <= int(budget))
         if brand:
-            stmt = stmt.where(CarCache.brand.ilike(f"%{brand}%"))
+            conds += match_conds(brand)
         if min_year.isdigit():
-            stmt = stmt.where(CarCache.year >= int(min_year))
+            conds.append(CarCache.year >= int(min_year))
 
-    stmt = stmt.order_by(func.random()).limit(limit)
-    return db.execute(stmt).scalars().all()
+    cols = [CarCache, rank(brand).label("relevance")] if brand else [CarCache]
+    rows = _sample(db, select(*cols).where(*conds), limit)
+    if brand:
+        rows.sort(key=lambda row: row.relevance or 0, reverse=True)
+    return [row[0] for row in rows]
@@ -0,0 +1,197 @@
+# app/services/search_jobs.py
+# -*- coding: utf-8 -*-
+"""
+ตัวงานค้นหา 1 session (ถูกเรียกโดย worker ของคิวงาน app/services/search_queue.py)
+
+- POST สร้าง SearchSession(status="queued") แล้ว redirect ไปหน้าผลลัพธ์ทันที
+- worker claim งานแล้วสั่ง scraper พร้อมกันเฉพาะ source ที่ไม่มีผล scrape ของ query นี้ใน cache
+  (scrape_runs, app/services/scrape_cache.py) แล้วทุก ATTACH_POLL_SEC วินาทีจะดึงรถที่ scraper
+  upsert แล้วและผ่าน filter มาแนบเข้า session (search_session_cars) → หน้าผลลัพธ์ poll มาแสดงต่อท้าย
+- progress_json เก็บสถานะราย source (cached / running / ok / failed)
+- ตัดเครดิตตอนแนบรถชุดแรก (ค้นแล้วไม่เจอรถ = ไม่เสียเครดิต เหมือนเดิม)
+- จบแล้ว status = done (มีรถ) / empty (ไม่เจอ) / error (ทุก source พัง) / no_credit (เครดิตหมดระหว่างรอ)
+- exception ถูก raise ต่อให้คิวตัดสินว่าจะ retry หรือจบเป็น error
+"""
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, and_, or_, func
+
+from app.db import SessionLocal
+from app.models import CarCache, SearchSession, SearchSessionCar
+from app.services.credits import consume_one_credit
+from app.services.listing_cache import filter_conds, fresh_cond, query_conds
+from app.services.pick_chain import precompute_picks
+from app.services.scrape_cache import ScrapePlan, plan_scrape, record_run
+from app.services.scrape_runner import run_scrapers_parallel
+from app.services.session_cars import session_cars
+
+# แนบรถใหม่เข้า session ทุก ๆ กี่วินาทีระหว่างที่ scraper ยังรันอยู่
+ATTACH_POLL_SEC = 2.0
+
+
+# ----------------------------- filters -----------------------------
+def _candidate_cars(
+    db, params: Dict, plan: ScrapePlan, since, exclude_ids=(), limit: Optional[int] = None,
+) -> List[CarCache]:
+    """
+    รถที่ยังไม่หมดอายุและผ่าน filter ของ session (เรียงราคาต่ำ → สูง) จาก
+    car_ids ของ run ที่ cache hit + รถที่ scraper ของงานนี้ upsert ตั้งแต่ `since`
+    filter ทุกตัวอยู่ใน WHERE แล้ว LIMIT ตัดหลังกรอง (filter แคบก็ยังได้ครบเท่าที่มีรถตรง)
+    """
+    scope = [CarCache.id.in_(plan.car_ids)]
+    if plan.misses:
+        scope.append(and_(
+            *query_conds({**params, "sources": plan.misses}),
+            CarCache.scraped_at >= since,
+        ))
+
+    stmt = (
+        select(CarCache)
+        .where(or_(*scope), fresh_cond(), *filter_conds(params))
+        .order_by(CarCache.price_thb.asc(), CarCache.id.asc())
+    )
+    if exclude_ids:
+        stmt = stmt.where(CarCache.id.notin_(list(exclude_ids)))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return db.execute(stmt).scalars().all()
+
+
+def attach_new_cars(db, ss: SearchSession, plan: ScrapePlan, since) -> int:
+    """แนบรถที่ผ่าน filter แต่ยังไม่อยู่ใน session ต่อท้าย (ไม่เกิน total_limit) คืนจำนวนที่แนบเพิ่ม"""
+    params = ss.params_json or {}
+    display_limit = int(params.get("total_limit") or 20)
+
+    attached = set(db.execute(
+        select(SearchSessionCar.car_id).where(SearchSessionCar.session_id == ss.id)
+    ).scalars().all())
+    room = display_limit - len(attached)
+    if room <= 0:
+        return 0
+
+    new_cars = _candidate_cars(db, params, plan, since, exclude_ids=attached, limit=room)
+    if not new_cars:
+        return 0
+
+    # consume credit only after we have results
+    if not attached and not consume_one_credit(db, ss.user_id):
+        ss.status = "no_credit"
+        return 0
+
+    rank = len(attached)
+    for c in new_cars:
+        rank += 1
+        db.add(SearchSessionCar(session_id=ss.id, car_id=c.id, rank=rank))
+    return len(new_cars)
+
+
+# ----------------------------- job -----------------------------
+def _save_progress(db, ss: SearchSession, progress: Dict[str, str]) -> None:
+    # updated_at = heartbeat ของงาน (คิวใช้ดูว่า worker ยังอยู่ไหม) จึงใช้นาฬิกาของ DB
+    ss.progress_json = dict(progress)
+    ss.updated_at = func.now()
+    db.add(ss)
+
+
+def run_search_job(session_id: int, settings: dict, picks: Optional[dict] = None) -> None:
+    """settings = scraper_settings(config), picks = pick_settings(config) (None = ไม่จัดอันดับรถแนะนำล่วงหน้า)"""
+    db = SessionLocal()
+    try:
+        ss = db.get(SearchSession, session_id)
+        if not ss:
+            return
+        params = ss.params_json or {}
+        sources = params.get("sources") or []
+
+        # cache hit = reuse the cars of a recent run of the same query; scrape only the misses
+        plan = plan_scrape(db, params, settings)
+        to_scrape = plan.misses
+        cached = list(plan.hits)
+        print(f"DEBUG session={ss.id} cache hit={cached} miss={to_scrape}")
+
+        progress = {s: ("running" if s in to_scrape else "cached") for s in sources}
+        _save_progress(db, ss, progress)
+        db.commit()
+        since = db.execute(select(func.now())).scalar_one()
+        recorded = set()
+
+        finished: Dict[str, tuple] = {}
+        lock = threading.Lock()
+
+        def on_result(source, result):
+            with lock:
+                finished[source] = result
+
+        # run every source at once; cars are attached while the slowest source is still running
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"search-{session_id}-scrape") as ex:
+            fut = ex.submit(
+                run_scrapers_parallel,
+                to_scrape, q=params.get("q") or "", min_price=0, max_price=plan.bucket,
+                limit=int(params.get("per_source_limit") or 20), settings=settings, on_result=on_result,
+            )
+            while True:
+                done = fut.done()
+                with lock:
+                    snapshot = dict(finished)
+                for s, (ok, _msg) in snapshot.items():
+                    progress[s] = "ok" if ok else "failed"
+                    # only complete runs are cached; timed-out/failed sources are scraped again next time
+                    if ok and s not in recorded:
+                        run = record_run(db, s, plan, since, settings)
+                        recorded.add(s)
+                        print(f"DEBUG cached scrape run {run.fingerprint} cars={len(run.car_ids)}")
+
+                if ss.status == "running":
+                    added = attach_new_cars(db, ss, plan, since)
+                    if added:
+                        print(f"DEBUG session={ss.id} attached +{added} cars")
+                _save_progress(db, ss, progress)
+                db.commit()
+
+                if done:
+                    break
+                try:
+                    fut.result(timeout=ATTACH_POLL_SEC)
+                except FuturesTimeout:
+                    pass
+                except Exception:
+                    # ให้ fut.result() ด้านล่าง raise ต่อ หลังแนบรถรอบสุดท้ายแล้ว
+                    pass
+            results = fut.result()
+
+        any_ok = bool(cached) or any(ok for ok, _ in results.values())
+        last_msg = "\n".join(msg for ok, msg in results.values() if not ok)
+        if not any_ok and last_msg:
+            # sources that timed out still keep the rows they committed (partial results)
+            print(last_msg)
+
+        rows = session_cars(db, ss.id)
+        cars_by_source = Counter((c.source or "NONE") for c in rows)
+        print(f"DEBUG session={ss.id} cars_by_source:", cars_by_source)
+
+        if ss.status == "running":
+            if rows:
+                ss.status = "done"
+            else:
+                ss.status = "empty" if any_ok else "error"
+        _save_progress(db, ss, progress)
+        db.commit()
+
+        if ss.status == "done" and picks and picks.get("chain_precompute"):
+            # จัดอันดับรถแนะนำจาก AI ล่วงหน้า (หน้า best car อ่านจาก DB) — พังก็ไม่ทำให้งานค้นหาพัง
+            try:
+                n = precompute_picks(db, ss, rows, picks, timeout=picks.get("chain_timeout_sec"))
+                db.commit()
+                print(f"DEBUG session={ss.id} pick chain={n}")
+            except Exception as e:
+                db.rollback()
+                print("precompute_picks error:", e)
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
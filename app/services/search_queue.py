@@ -0,0 +1,280 @@
+# app/services/search_queue.py
+# -*- coding: utf-8 -*-
+"""
+คิวงานค้นหาบน Postgres (ใช้ตาราง search_sessions เป็นคิวเลย) — เว็บแค่ enqueue แล้วอ่านผล
+เธรดของ WSGI ไม่ต้องค้างรอ scraper อีกต่อไป
+
+สถานะใน SearchSession.status:
+    queued → running → done / empty / error / no_credit
+- claim ด้วย SELECT ... FOR UPDATE SKIP LOCKED: worker หลายเธรด/หลาย process หยิบงานพร้อมกันได้โดยไม่ชนกัน
+- งานพัง (exception หรือทุก source ล้มโดยไม่ได้รถ) → กลับเป็น queued พร้อม backoff (run_after)
+  จนครบ SEARCH_JOB_MAX_ATTEMPTS แล้วจบเป็น error (last_error เก็บสาเหตุล่าสุด)
+- worker ตายกลางงาน: run_search_job อัปเดต updated_at ทุก ATTACH_POLL_SEC วินาที (heartbeat)
+  ถ้า running แต่ heartbeat เงียบเกิน SEARCH_JOB_STALE_SEC จะถูก claim ใหม่
+- งานที่แนบรถไปแล้ว (ตัดเครดิตแล้ว) จะไม่ retry ซ้ำ — จบเป็น done กับรถเท่าที่ได้
+- ช่วงว่างงาน worker ลบ listing ที่หมดอายุนานแล้วออกจาก car_cache และ scrape_runs ที่หมดอายุ (ทุก PRUNE_EVERY_SEC)
+
+worker รันได้ 2 แบบ:
+- process แยก: python scripts/search_worker.py (ค่าเริ่มต้น)
+- เธรดใน process เว็บ: SEARCH_INLINE_WORKER=true (ต้องเปิดเอง, สำหรับ dev / เครื่องเดียว)
+"""
+import os, socket, threading, time
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlalchemy import select, or_, and_, func
+
+from app.db import SessionLocal
+from app.models import SearchSession, SearchSessionCar
+from app.services.listing_cache import prune_expired
+from app.services.scrape_cache import prune_runs
+from app.services.llm_select import pick_settings
+from app.services.pick_cache import prune_picks
+from app.services.search_jobs import run_search_job
+
+# ไม่มีงานในคิว → รอกี่วินาทีก่อน claim รอบใหม่
+IDLE_POLL_SEC = 1.0
+PRUNE_EVERY_SEC = 3600
+
+
+def queue_settings(config) -> dict:
+    return {
+        "concurrency": int(config.get("SEARCH_WORKER_CONCURRENCY", 2)),
+        "max_attempts": int(config.get("SEARCH_JOB_MAX_ATTEMPTS", 3)),
+        "retry_backoff_sec": int(config.get("SEARCH_JOB_RETRY_BACKOFF_SEC", 30)),
+        "stale_sec": int(config.get("SEARCH_JOB_STALE_SEC", 300)),
+        "picks": pick_settings(config),
+    }
+
+
+def enqueue_search(db, user_id: int, params: dict) -> SearchSession:
+    """สร้าง session ใหม่ในสถานะ queued (caller commit เอง)"""
+    ss = SearchSession(
+        user_id=user_id, params_json=params, status="queued", attempts=0,
+        progress_json={s: "queued" for s in params.get("sources") or []},
+    )
+    db.add(ss)
+    return ss
+
+
+def claim_next(db, worker_id: str, stale_sec: int, max_attempts: int) -> Optional[SearchSession]:
+    """หยิบงานถัดไป (queued ที่ถึงเวลาแล้ว หรือ running ที่ worker เงียบไป) แล้ว mark เป็น running"""
+    stmt = (
+        select(SearchSession)
+        .where(or_(
+            and_(
+                SearchSession.status == "queued",
+                or_(SearchSession.run_after.is_(None), SearchSession.run_after <= func.now()),
+            ),
+            and_(
+                SearchSession.status == "running",
+                func.coalesce(SearchSession.updated_at, SearchSession.created_at)
+                < func.now() - timedelta(seconds=stale_sec),
+            ),
+        ))
+        .order_by(SearchSession.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    ss = db.execute(stmt).scalars().first()
+    if ss is None:
+        db.rollback()
+        return None
+
+    if ss.status == "running":
+        print(f"[search-queue] session={ss.id} stale (worker {ss.locked_by} silent), reclaiming")
+        if (ss.attempts or 0) >= max_attempts:
+            # worker ตายกับงานนี้ครบทุกครั้งแล้ว (เช่น Chrome ทำ process ล่ม) → เลิก
+            ss.status = "done" if _has_cars(db, ss.id) else "error"
+            ss.last_error = f"worker {ss.locked_by} stopped responding"
+            ss.locked_by = None
+            ss.updated_at = func.now()
+            db.commit()
+            return None
+    ss.status = "running"
+    ss.attempts = (ss.attempts or 0) + 1
+    ss.locked_by = worker_id
+    ss.run_after = None
+    ss.updated_at = func.now()
+    db.commit()
+    return ss
+
+
+def _has_cars(db, session_id: int) -> bool:
+    return db.execute(
+        select(SearchSessionCar.id).where(SearchSessionCar.session_id == session_id).limit(1)
+    ).scalar_one_or_none() is not None
+
+
+def finish_failed(db, session_id: int, error: str, max_attempts: int, backoff_sec: int) -> None:
+    """งานพัง: retry (queued + backoff) ถ้ายังไม่ครบจำนวนครั้ง ไม่งั้นจบเป็น error"""
+    ss = db.get(SearchSession, session_id)
+    if ss is None or ss.status not in ("running", "error"):
+        return
+    ss.last_error = (error or "")[-2000:]
+    ss.locked_by = None
+    ss.updated_at = func.now()
+
+    if _has_cars(db, session_id):
+        # เครดิตถูกตัดไปแล้ว ไม่ค้นซ้ำ
+        ss.status = "done"
+    elif (ss.attempts or 0) < max_attempts:
+        delay = backoff_sec * (2 ** max(0, (ss.attempts or 1) - 1))
+        ss.status = "queued"
+        ss.run_after = func.now() + timedelta(seconds=delay)
+        ss.progress_json = {s: "queued" for s in (ss.params_json or {}).get("sources") or []}
+        print(f"[search-queue] session={session_id} attempt {ss.attempts}/{max_attempts} failed, retry in {delay}s")
+    else:
+        ss.status = "error"
+        print(f"[search-queue] session={session_id} gave up after {ss.attempts} attempts")
+    db.commit()
+
+
+def process_job(session_id: int, scrape_settings: dict, qs: dict) -> None:
+    error = ""
+    try:
+        run_search_job(session_id, scrape_settings, qs.get("picks"))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        print(f"search job {session_id} error:", error)
+
+    db = SessionLocal()
+    try:
+        ss = db.get(SearchSession, session_id)
+        if ss is None:
+            return
+        if error or ss.status == "error":
+            finish_failed(db, session_id, error or "all sources failed", qs["max_attempts"], qs["retry_backoff_sec"])
+        elif ss.locked_by:
+            ss.locked_by = None
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"[search-queue] session={session_id} finish error: {e}")
+    finally:
+        db.close()
+
+
+class SearchWorker:
+    """เธรด `concurrency` ตัว วน claim → run_search_job → claim ต่อ"""
+
+    def __init__(self, scrape_settings: dict, qs: dict, name: str = ""):
+        self.scrape_settings = scrape_settings
+        self.qs = qs
+        self.concurrency = max(1, int(qs.get("concurrency", 2)))
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._processed = 0
+        self._next_prune = time.monotonic()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.concurrency):
+                t = threading.Thread(target=self._loop, args=(i,), name=f"search-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        print(f"[search-queue] worker {self.name} started ({self.concurrency} threads)")
+        self._warm_driver_pool()
+
+    def _warm_driver_pool(self) -> None:
+        """เปิด Chrome ของ driver pool ไว้ล่วงหน้า — process นี้เป็นที่เดียวที่รัน scraper จริง"""
+        settings = self.scrape_settings
+        if settings.get("mode") != "worker" or settings.get("driver_pool_size", 0) <= 0:
+            return
+        from app.services.driver_pool import get_driver_pool
+        pool = get_driver_pool(settings, "normal")
+        threading.Thread(target=pool.warm_up, name="driver-pool-warm-up", daemon=True).start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        for t in list(self._threads):
+            t.join(timeout)
+
+    def join(self) -> None:
+        for t in list(self._threads):
+            while t.is_alive():
+                t.join(1.0)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"name": self.name, "threads": self.concurrency, "busy": self._busy,
+                    "processed": self._processed}
+
+    def _loop(self, n: int) -> None:
+        worker_id = f"{self.name}/{n}"[:64]
+        while not self._stop.is_set():
+            db = SessionLocal()
+            try:
+                ss = claim_next(db, worker_id, self.qs["stale_sec"], self.qs["max_attempts"])
+                session_id = ss.id if ss else None
+            except Exception as e:
+                db.rollback()
+                print(f"[search-queue] claim error: {e}")
+                session_id = None
+            finally:
+                db.close()
+
+            if session_id is None:
+                self._maybe_prune()
+                self._stop.wait(IDLE_POLL_SEC)
+                continue
+
+            with self._lock:
+                self._busy += 1
+            started = time.monotonic()
+            try:
+                print(f"[search-queue] {worker_id} running session={session_id}")
+                process_job(session_id, self.scrape_settings, self.qs)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._processed += 1
+            print(f"[search-queue] {worker_id} session={session_id} finished in {time.monotonic() - started:.1f}s")
+
+
+    def _maybe_prune(self) -> None:
+        with self._lock:
+            if time.monotonic() < self._next_prune:
+                return
+            self._next_prune = time.monotonic() + PRUNE_EVERY_SEC
+        db = SessionLocal()
+        try:
+            n = prune_expired(db)
+            runs = prune_runs(db)
+            picks = prune_picks(db, self.qs["picks"]["pick_cache_max_rows"])
+            db.commit()
+            if n or runs or picks:
+                print(f"[search-queue] pruned {n} expired car_cache rows, {runs} scrape runs, {picks} cached picks")
+        except Exception as e:
+            db.rollback()
+            print(f"[search-queue] prune error: {e}")
+        finally:
+            db.close()
+
+
+def queue_counts(db) -> dict:
+    rows = db.execute(
+        select(SearchSession.status, func.count())
+        .where(SearchSession.status.in_(("queued", "running")))
+        .group_by(SearchSession.status)
+    ).all()
+    return {status: n for status, n in rows}
+
+
+_worker: Optional[SearchWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_search_worker(config=None) -> Optional[SearchWorker]:
+    """worker เดียวต่อ process (ส่ง config ครั้งแรกเพื่อสร้าง, ไม่ส่ง = ขอตัวที่มีอยู่)"""
+    global _worker
+    with _worker_lock:
+        if _worker is None and config is not None:
+            from app.services.scrape_runner import scraper_settings
+            _worker = SearchWorker(scraper_settings(config), queue_settings(config))
+        return _worker
@@ -0,0 +1,126 @@
+# app/services/session_cars.py
+# -*- coding: utf-8 -*-
+"""
+โหลดรถของ search session ตามลำดับ rank ด้วย query เดียว (join search_session_cars → car_cache)
+
+เดิมแต่ละหน้า select SearchSessionCar แล้ว [r.car for r in rows] → lazy load รถทีละคัน (N+1 query)
+โหลดเฉพาะคอลัมน์ที่การ์ด/หน้ารถแนะนำ/LLM ใช้ (CARD_COLUMNS) — คอลัมน์อื่นยังอ่านได้แต่จะ SELECT เพิ่มต่อคัน
+
+หน้าผลลัพธ์เรียงใน SQL (SORTS) และแบ่งหน้าแบบ keyset (page_cars): cursor = (ค่าที่ใช้เรียง, rank) ของคันสุดท้าย
+หน้าถัดไปเริ่ม "หลัง" คันนั้นเลย ไม่ต้อง OFFSET ข้ามแถวที่แสดงไปแล้ว
+"""
+import base64
+import json
+from typing import List, Optional, Tuple
+
+from sqlalchemy import BigInteger, and_, cast, func, or_, select
+from sqlalchemy.orm import load_only
+
+from app.models import CarCache, SearchSessionCar
+
+CARD_COLUMNS = (
+    CarCache.id, CarCache.source, CarCache.title, CarCache.brand, CarCache.model, CarCache.year,
+    CarCache.price_thb, CarCache.mileage_km, CarCache.province, CarCache.url, CarCache.image_url,
+    CarCache.extra, CarCache.body_type, CarCache.fuel_type, CarCache.transmission, CarCache.color,
+)
+
+
+def ranked_cars(db, session_id: int, after_rank: int = 0) -> List[Tuple[int, CarCache]]:
+    """[(rank, car)] ของ session เรียงตาม rank (เฉพาะ rank > after_rank)"""
+    rows = db.execute(
+        select(SearchSessionCar.rank, CarCache)
+        .join(CarCache, CarCache.id == SearchSessionCar.car_id)
+        .where(SearchSessionCar.session_id == session_id, SearchSessionCar.rank > after_rank)
+        .options(load_only(*CARD_COLUMNS))
+        .order_by(SearchSessionCar.rank)
+    ).all()
+    return [(rank, car) for rank, car in rows]
+
+
+def session_cars(db, session_id: int) -> List[CarCache]:
+    return [car for _, car in ranked_cars(db, session_id)]
+
+
+def count_cars(db, session_id: int) -> int:
+    return db.execute(
+        select(func.count()).select_from(SearchSessionCar).where(SearchSessionCar.session_id == session_id)
+    ).scalar_one()
+
+
+PAGE_SIZE = 24
+
+# ค่าแทน NULL เหมือน sort เดิมใน Python: ตัวเลขที่ไม่มีค่าไปท้ายสุด (ขึ้น→ลง) / หน้าสุด (ลง→ขึ้น), ข้อความเป็น ''
+_MISSING_NUM = 10 ** 15
+
+
+def _num(col):
+    return cast(func.coalesce(col, _MISSING_NUM), BigInteger)
+
+
+def _text(col):
+    return func.lower(func.trim(func.coalesce(col, "")))
+
+
+# sort key ของหน้าผลลัพธ์ → (expression, desc, ชนิดค่าใน cursor); ค่าเท่ากันเรียงตาม rank เสมอ
+SORTS = {
+    "price_asc": (_num(CarCache.price_thb), False, int),
+    "price_desc": (_num(CarCache.price_thb), True, int),
+    "year_asc": (_num(CarCache.year), False, int),
+    "year_desc": (_num(CarCache.year), True, int),
+    "mileage_asc": (_num(CarCache.mileage_km), False, int),
+    "mileage_desc": (_num(CarCache.mileage_km), True, int),
+    "brand_az": (_text(CarCache.brand), False, str),
+    "brand_za": (_text(CarCache.brand), True, str),
+    "source": (_text(CarCache.source), False, str),
+}
+
+
+def encode_cursor(value, rank: int) -> str:
+    raw = json.dumps([value, rank], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], value_type=int):
+    """cursor เสีย/ถูกแก้/ไม่ตรงกับ sort → None (เริ่มหน้าแรก)"""
+    if not cursor:
+        return None
+    try:
+        value, rank = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(value, value_type) or not isinstance(rank, int):
+            return None
+        return value, rank
+    except Exception:
+        return None
+
+
+def page_cars(
+    db, session_id: int, sort: str = "", cursor: Optional[str] = None, limit: Optional[int] = PAGE_SIZE,
+) -> Tuple[List[CarCache], Optional[str]]:
+    """
+    รถ 1 หน้าของ session ตาม sort (ไม่รู้จัก sort = ตาม rank) เริ่มหลัง cursor
+    คืน (cars, cursor ของหน้าถัดไป หรือ None ถ้าหมดแล้ว); limit=None = ทั้งหมด
+    """
+    rank = SearchSessionCar.rank
+    expr, desc, value_type = SORTS.get((sort or "").lower(), (rank, False, int))
+
+    stmt = (
+        select(rank, CarCache, expr.label("sort_value"))
+        .join(CarCache, CarCache.id == SearchSessionCar.car_id)
+        .where(SearchSessionCar.session_id == session_id)
+        .options(load_only(*CARD_COLUMNS))
+        .order_by(expr.desc() if desc else expr.asc(), rank.asc())
+    )
+    pos = decode_cursor(cursor, value_type)
+    if pos:
+        value, after_rank = pos
+        beyond = expr < value if desc else expr > value
+        stmt = stmt.where(or_(beyond, and_(expr == value, rank > after_rank)))
+    if limit:
+        stmt = stmt.limit(limit + 1)
+
+    rows = db.execute(stmt).all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].sort_value, rows[-1].rank)
+    return [car for _, car, _ in rows], next_cursor
@@ -0,0 +1,48 @@
+# app/services/text_search.py
+# -*- coding: utf-8 -*-
+"""
+ค้นคำอิสระ (q) บน title / brand / model ของ car_cache ด้วย pg_trgm
+
+- ข้อความค้น = title || ' ' || brand || ' ' || model — expression เดียวกับ GIN index
+  ix_car_cache_search_trgm (migration 6e1f9b3a2c58) ทุกตัวอักษร ไม่งั้น Postgres ไม่ใช้ index
+- ILIKE '%คำ%' บน expression ที่มี gin_trgm_ops ใช้ index ได้ (ต่างจาก ILIKE ทีละคอลัมน์ที่ต้อง seq scan)
+- ภาษาไทยไม่มีช่องว่างระหว่างคำ จึงไม่ตัดคำแบบ full-text แต่ใช้ trigram ซึ่งจับ substring ได้ทุกภาษา
+  คำค้นแยกด้วยช่องว่าง (เช่น "Honda City") ต้องเจอครบทุกคำ อยู่คนละคอลัมน์ก็ได้
+- เรียงความเกี่ยวข้องด้วย word_similarity(q, ข้อความ) — มากสุดก่อน
+"""
+from typing import List
+
+from sqlalchemy import Text, func, literal_column, type_coerce
+
+from app.models import CarCache
+
+
+def search_text():
+    """expression ที่ index ไว้ (ต้องตรงกับ migration — ค่าคงที่ render เป็น literal ไม่ใช่ bind param)"""
+    empty, space = literal_column("''"), literal_column("' '")
+    expr = (
+        func.coalesce(CarCache.title, empty).op("||")(space)
+        .op("||")(func.coalesce(CarCache.brand, empty)).op("||")(space)
+        .op("||")(func.coalesce(CarCache.model, empty))
+    )
+    return type_coerce(expr, Text)
+
+
+def _words(q: str) -> List[str]:
+    return [w for w in (q or "").split() if w][:10]
+
+
+def _like_escape(w: str) -> str:
+    return w.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def match_conds(q: str) -> list:
+    """ทุกคำใน q ต้องอยู่ใน title/brand/model (ไม่สนตัวเล็กใหญ่) — q ว่าง = ไม่มีเงื่อนไข"""
+    text = search_text()
+    return [text.ilike(f"%{_like_escape(w)}%", escape="\\") for w in _words(q)]
+
+
+def rank(q: str):
+    """คะแนนความเกี่ยวข้อง 0..1 ของ q กับ title/brand/model"""
+    return func.word_similarity(" ".join(_words(q)), search_text())
+
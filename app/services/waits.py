@@ -0,0 +1,136 @@
+# app/services/waits.py
+# -*- coding: utf-8 -*-
+"""
+ชุดรอ "จนกว่าหน้าพร้อม" สำหรับ scraper แทน time.sleep แบบตายตัว
+
+ทุกฟังก์ชันคืนทันทีที่เงื่อนไขเป็นจริง (ไม่ต้องรอครบเวลา) และไม่ raise เมื่อหมดเวลา
+— คืนค่าบอกผลแทน ให้ scraper ไปต่อแบบเดิมได้ (เหมือน sleep ที่หมดเวลา)
+
+- wait_dom_quiet:        DOM ไม่เปลี่ยน (MutationObserver) ติดกัน quiet_ms
+- wait_network_idle:     ไม่มี fetch/XHR ค้าง ติดกัน idle_ms และ readyState=complete
+- wait_selector_count:   จำนวน element ตาม CSS ถึง min_count
+- auto_scroll_until_stable: scroll ลงล่างจนจำนวนการ์ดไม่เพิ่มอีก
+"""
+import time
+from typing import Callable, Optional
+
+POLL_SEC = 0.1
+
+_MUTATION_JS = """
+if (!window.__carcomMut) {
+  window.__carcomMut = {last: Date.now()};
+  new MutationObserver(function () { window.__carcomMut.last = Date.now(); })
+    .observe(document.documentElement || document,
+             {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return Date.now() - window.__carcomMut.last;
+"""
+
+_NETWORK_JS = """
+if (!window.__carcomNet) {
+  var n = window.__carcomNet = {inflight: 0, last: Date.now()};
+  var done = function () { n.inflight = Math.max(0, n.inflight - 1); n.last = Date.now(); };
+  if (window.fetch) {
+    var f = window.fetch;
+    window.fetch = function () {
+      n.inflight++; n.last = Date.now();
+      return f.apply(this, arguments).then(function (r) { done(); return r; },
+                                           function (e) { done(); throw e; });
+    };
+  }
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    n.inflight++; n.last = Date.now();
+    this.addEventListener('loadend', done);
+    return send.apply(this, arguments);
+  };
+}
+return [window.__carcomNet.inflight, Date.now() - window.__carcomNet.last, document.readyState];
+"""
+
+_COUNT_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+
+def _poll(check: Callable[[], bool], timeout: float, poll: float = POLL_SEC) -> bool:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if check():
+                return True
+        except Exception:
+            # หน้าอาจกำลังเปลี่ยน (navigation) → ลองใหม่รอบถัดไป
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+def wait_dom_quiet(driver, quiet_ms: int = 400, timeout: float = 5.0) -> bool:
+    """รอจน DOM นิ่ง (ไม่มี mutation) ติดกัน quiet_ms"""
+    return _poll(lambda: driver.execute_script(_MUTATION_JS) >= quiet_ms, timeout)
+
+
+def track_network(driver) -> None:
+    """เริ่มนับ fetch/XHR ของหน้านี้ (เรียกก่อนกดค้นหาใน SPA จะได้เห็น request ที่เกิดหลังจากนั้น)"""
+    try:
+        driver.execute_script(_NETWORK_JS)
+    except Exception:
+        pass
+
+
+def wait_network_idle(driver, idle_ms: int = 500, timeout: float = 10.0) -> bool:
+    """รอจนไม่มี request ค้างติดกัน idle_ms (ถ้ามีการเปลี่ยนหน้า tracker จะติดตั้งใหม่เอง)"""
+    def _idle() -> bool:
+        inflight, since, state = driver.execute_script(_NETWORK_JS)
+        return state == "complete" and inflight == 0 and since >= idle_ms
+    return _poll(_idle, timeout)
+
+
+def count_selector(driver, css: str) -> int:
+    try:
+        return int(driver.execute_script(_COUNT_JS, css) or 0)
+    except Exception:
+        return 0
+
+
+def wait_selector_count(driver, css: str, min_count: int = 1, timeout: float = 10.0) -> int:
+    """รอจนมี element ตาม css อย่างน้อย min_count แล้วคืนจำนวนล่าสุด (หมดเวลาก็คืนเท่าที่มี)"""
+    box = {"n": 0}
+
+    def _enough() -> bool:
+        box["n"] = count_selector(driver, css)
+        return box["n"] >= min_count
+
+    _poll(_enough, timeout)
+    return box["n"]
+
+
+def auto_scroll_until_stable(
+    driver,
+    count_fn: Optional[Callable[[], int]] = None,
+    css: str = "",
+    settle_timeout: float = 2.5,
+    stable_ticks: int = 1,
+    max_rounds: int = 60,
+) -> int:
+    """
+    scroll ลงล่างสุดทีละรอบ แล้วรอให้จำนวนการ์ดเพิ่ม (ไม่เกิน settle_timeout)
+    - เพิ่มเมื่อไร scroll รอบต่อไปทันที
+    - ไม่เพิ่มติดกัน stable_ticks รอบ = โหลดหมดแล้ว หยุด
+    นับด้วย count_fn() หรือจำนวน element ตาม css
+    """
+    count = count_fn or (lambda: count_selector(driver, css))
+    last = count()
+    same = 0
+    for _ in range(max_rounds):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        grew = _poll(lambda: count() > last, settle_timeout)
+        if grew:
+            last = count()
+            same = 0
+            continue
+        same += 1
+        if same >= stable_ticks:
+            break
+    driver.execute_script("window.scrollTo(0, 0);")
+    return last
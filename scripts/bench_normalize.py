@@ -0,0 +1,105 @@
+# scripts/bench_normalize.py
+# -*- coding: utf-8 -*-
+"""
+micro-benchmark: normalize_* แบบ Matcher (Aho-Corasick, compile ตอน import) เทียบกับการวน
+`key in text` ทีละ key แบบเดิม บนข้อความตัวอย่างจากหน้าประกาศ + ตรวจว่าผลตรงกันทุกข้อความ
+
+    python scripts/bench_normalize.py [--rounds 2000]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.scrapers import normalize as n
+
+SAMPLES = {
+    "color": ["สีขาว", "บรอนซ์เงิน", "เทา", "ดำ มุก", "น้ำตาล", "โรสโกลด์", "ไม่ระบุ"],
+    "fuel": ["เบนซิน", "ดีเซล", "ไฮบริด", "ปลั๊กอิน ไฮบริด", "EV/ไฟฟ้า", "LPG/NGV", "Diesel", "ไม่ระบุ"],
+    "transmission": ["เกียร์อัตโนมัติ", "เกียร์ธรรมดา", "AT", "MT", "Automatic", "ไม่ระบุ"],
+    "body_type": ["รถเก๋ง 4 ประตู", "รถเก๋ง 5 ประตู", "รถกระบะ 4 ประตู", "รถ SUV", "รถตู้", "Sedan 5 ประตู", "อื่น ๆ"],
+    "province": ["บางกรวย นนทบุรี", "เขตบางนา กรุงเทพมหานคร", "เมืองอุบลราชธานี อุบลราชธานี",
+                 "หาดใหญ่ สงขลา", "อ.เมือง จ.สตูล", "ไม่ระบุ"],
+}
+
+
+# ---------------- แบบเดิม: วนทุก key ต่อข้อความ ----------------
+def _scan(table, t, fold):
+    for k, v in table:
+        if fold(k) in t:
+            return v
+    return ""
+
+
+def legacy_color(s):
+    return _scan(n.COLOR_MAP_TH_EN.items(), re.sub(r"\s+", "", s), lambda k: k.replace(" ", "")) if s else ""
+
+
+def legacy_fuel(s):
+    return _scan(n.FUEL_MATCHER.pairs, s.replace(" ", "").lower(), lambda k: k.replace(" ", "").lower()) if s else ""
+
+
+def legacy_transmission(s):
+    return _scan(n.TRANSMISSION_MATCHER.pairs, s.lower().replace(" ", ""), lambda k: k.lower().replace(" ", "")) if s else ""
+
+
+def legacy_body_type(s):
+    if not s:
+        return ""
+    z = re.sub(r"\s+", "", s)
+    if "รถเก๋ง5ประตู" in z or ("Sedan" in s and "5" in s and "ประตู" in s):
+        return "Hatchback"
+    if "รถเก๋ง4ประตู" in z or ("Sedan" in s and "4" in s and "ประตู" in s):
+        return "Sedan"
+    for k, v in n._BODY_TYPE_RULES[2:9]:
+        if k in z:
+            return v
+    for k, v, r in (("รถSUV", "SUV", n._SUV_RE), ("รถPPV", "PPV", n._PPV_RE), ("รถMPV", "MPV", n._MPV_RE)):
+        if k in z or r.search(s):
+            return v
+    return _scan(n.BODY_TYPE_MAP_TH_EN.items(), s.replace(" ", ""), lambda k: k.replace(" ", ""))
+
+
+def legacy_province(s):
+    for th, en in n.PROVINCE_MAP_TH_EN.items():
+        if th in s:
+            return en, th
+    return "", ""
+
+
+# (แบบเดิม, automaton ล้วนไม่ผ่าน lru_cache, ตัวที่ scraper/filter เรียกจริง)
+CASES = {
+    "color": (legacy_color, n.normalize_color_th_to_en.__wrapped__, n.normalize_color_th_to_en),
+    "fuel": (legacy_fuel, n._fuel_en.__wrapped__, n.normalize_fuel_th_to_en),
+    "transmission": (legacy_transmission, n.normalize_transmission_th_to_en.__wrapped__,
+                     n.normalize_transmission_th_to_en),
+    "body_type": (legacy_body_type, n.normalize_body_type_th_to_en.__wrapped__, n.normalize_body_type_th_to_en),
+    "province": (legacy_province, n.normalize_province_from_location.__wrapped__,
+                 n.normalize_province_from_location),
+}
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--rounds", type=int, default=2000)
+    args = p.parse_args()
+
+    print(f"{'field':<14}{'legacy us':>12}{'matcher us':>12}{'cached us':>12}{'speedup':>10}")
+    for field, (legacy, matcher, cached) in CASES.items():
+        texts = SAMPLES[field]
+        for t in texts:
+            assert legacy(t) == matcher(t) == cached(t), (field, t, legacy(t), matcher(t))
+
+        per = args.rounds * len(texts) / 1e6
+        t_old, t_matcher, t_cached = (
+            timeit.timeit(lambda: [fn(t) for t in texts], number=args.rounds) / per
+            for fn in (legacy, matcher, cached)
+        )
+        print(f"{field:<14}{t_old:>12.2f}{t_matcher:>12.2f}{t_cached:>12.2f}{t_old / t_cached:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
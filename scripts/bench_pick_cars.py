@@ -0,0 +1,102 @@
+# scripts/bench_pick_cars.py
+# -*- coding: utf-8 -*-
+"""
+benchmark การสุ่มรถของ pick_cars บน Postgres จริง (DATABASE_URL) ที่ 10k / 100k / 1M แถว
+
+เทียบ 3 แบบบนตาราง TEMP ที่หน้าตาเหมือน car_cache (price_thb, year, rand_key + index):
+- order_by_random : WHERE ... ORDER BY random() LIMIT n       (แบบเดิม — sort ทุกแถวที่ผ่าน filter)
+- rand_key        : WHERE ... AND rand_key >= r ORDER BY rand_key LIMIT n (+ วนกลับ)  (app/services/search.py)
+- tablesample     : TABLESAMPLE BERNOULLI(p) WHERE ... LIMIT n (อ้างอิง — ยังอ่านทั้งตาราง และได้แถวไม่ครบเมื่อ filter แคบ)
+
+    python scripts/bench_pick_cars.py [--sizes 10000,100000,1000000] [--repeat 20] [--limit 12]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+
+from app.db import engine
+
+BUDGET = 500_000  # ราวครึ่งตารางผ่าน filter
+
+SETUP = """
+DROP TABLE IF EXISTS bench_pick_cars;
+CREATE TEMP TABLE bench_pick_cars AS
+SELECT g AS id,
+       (random() * 1000000)::numeric(12, 2) AS price_thb,
+       2000 + (random() * 25)::int AS year,
+       random() AS rand_key
+FROM generate_series(1, :n) AS g;
+CREATE INDEX ON bench_pick_cars (rand_key);
+ANALYZE bench_pick_cars;
+"""
+
+
+def order_by_random(conn, limit):
+    return conn.execute(text(
+        "SELECT id FROM bench_pick_cars WHERE price_thb <= :b AND year >= 2010 ORDER BY random() LIMIT :n"
+    ), {"b": BUDGET, "n": limit}).all()
+
+
+def rand_key(conn, limit):
+    r = random.random()
+    rows = conn.execute(text(
+        "SELECT id FROM bench_pick_cars WHERE price_thb <= :b AND year >= 2010 AND rand_key >= :r "
+        "ORDER BY rand_key LIMIT :n"
+    ), {"b": BUDGET, "r": r, "n": limit}).all()
+    if len(rows) < limit:
+        rows += conn.execute(text(
+            "SELECT id FROM bench_pick_cars WHERE price_thb <= :b AND year >= 2010 AND rand_key < :r "
+            "ORDER BY rand_key LIMIT :n"
+        ), {"b": BUDGET, "r": r, "n": limit - len(rows)}).all()
+    return rows
+
+
+def tablesample(conn, limit, size):
+    pct = min(100.0, 100.0 * limit * 10 / size)
+    return conn.execute(text(
+        f"SELECT id FROM bench_pick_cars TABLESAMPLE BERNOULLI ({pct:.6f}) "
+        "WHERE price_thb <= :b AND year >= 2010 LIMIT :n"
+    ), {"b": BUDGET, "n": limit}).all()
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    got = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        got = len(fn())
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, got
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", default="10000,100000,1000000")
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--limit", type=int, default=12)
+    args = p.parse_args()
+
+    print(f"{'rows':>10}  {'order_by_random ms':>20}  {'rand_key ms':>12}  {'tablesample ms':>15}")
+    with engine.connect() as conn:
+        for size in (int(s) for s in args.sizes.split(",")):
+            for stmt in SETUP.strip().split(";"):
+                if stmt.strip():
+                    conn.execute(text(stmt), {"n": size})
+            res = [
+                timed(lambda: order_by_random(conn, args.limit), args.repeat),
+                timed(lambda: rand_key(conn, args.limit), args.repeat),
+                timed(lambda: tablesample(conn, args.limit, size), args.repeat),
+            ]
+            cells = [f"{ms:.2f} ({got})" for ms, got in res]
+            print(f"{size:>10}  {cells[0]:>20}  {cells[1]:>12}  {cells[2]:>15}")
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
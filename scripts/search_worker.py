@@ -0,0 +1,44 @@
+# scripts/search_worker.py
+# -*- coding: utf-8 -*-
+"""
+worker ของคิวงานค้นหา (แยก process จากเว็บ)
+
+    python scripts/search_worker.py --concurrency 4
+
+รันหลายตัว/หลายเครื่องได้ (claim ด้วย SKIP LOCKED) — ค่าเริ่มต้นเว็บไม่รัน worker เอง (SEARCH_INLINE_WORKER=false)
+"""
+import os, sys, argparse
+
+# ให้ Python เห็นโฟลเดอร์ app/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# process นี้คือ worker เอง ไม่ต้องให้ create_app สร้าง inline worker ซ้ำ
+os.environ["SEARCH_INLINE_WORKER"] = "false"
+
+from app import create_app
+from app.services.scrape_runner import scraper_settings
+from app.services.search_queue import SearchWorker, queue_settings
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--concurrency", type=int, default=0, help="จำนวนงานค้นหาพร้อมกัน (default: SEARCH_WORKER_CONCURRENCY)")
+    ap.add_argument("--name", default="", help="ชื่อ worker (default: host:pid)")
+    args = ap.parse_args()
+
+    app = create_app()
+    qs = queue_settings(app.config)
+    if args.concurrency > 0:
+        qs["concurrency"] = args.concurrency
+
+    worker = SearchWorker(scraper_settings(app.config), qs, name=args.name)
+    worker.start()
+    try:
+        worker.join()
+    except KeyboardInterrupt:
+        print("stopping search worker (waiting for running jobs) ...")
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# tests/conftest.py — ให้ `import app` ได้เมื่อรัน pytest จากรากโปรเจกต์
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
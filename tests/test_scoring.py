@@ -0,0 +1,91 @@
+# tests/test_scoring.py
+# -*- coding: utf-8 -*-
+"""
+คะแนนรถในเครื่อง (app/services/scoring.py): ลำดับในงบก่อน, ค่ากลางเมื่อไม่มีข้อมูล, ความชอบเทียบค่ามาตรฐานในคอลัมน์,
+best_pick กับ exclude_ids — logic ล้วน ใช้ object ปลอมแทน CarCache ไม่ต้องมี DB
+(import ผ่าน app.services.listing_cache → app.db จึงยังต้องมี flask / sqlalchemy / psycopg2 แต่ไม่ได้ต่อ DB จริง)
+"""
+import os
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("psycopg2")
+pytest.importorskip("sqlalchemy")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")  # create_engine ไม่ต่อจนกว่าจะใช้
+
+from app.services.scoring import MISSING, MISSING_PRICE, best_pick, rank_scored, score_cars  # noqa: E402
+
+THIS_YEAR = date.today().year
+
+
+def _car(id, price=None, year=None, km=None, **cols):
+    return SimpleNamespace(
+        id=id, price_thb=price, year=year, mileage_km=km, extra={},
+        body_type=cols.get("body_type"), fuel_type=cols.get("fuel_type"), transmission=cols.get("transmission"),
+    )
+
+
+def test_in_budget_cars_rank_before_better_scoring_over_budget_cars():
+    cars = [
+        _car(1, price=520_000, year=THIS_YEAR, km=5_000),        # ใหม่ ไมล์น้อย แต่เกินงบ
+        _car(2, price=480_000, year=THIS_YEAR - 12, km=180_000),
+        _car(3, price=None, year=THIS_YEAR - 3, km=40_000),      # ไม่รู้ราคา = ไม่นับว่าเกินงบ
+    ]
+    ranked = rank_scored(cars, {"max_budget": "500,000"})
+
+    assert [s.car.id for s in ranked][-1] == 1
+    assert ranked[-1].over_budget and not any(s.over_budget for s in ranked[:-1])
+    assert ranked[-1].score > min(s.score for s in ranked[:-1])
+
+
+def test_missing_price_year_mileage_get_neutral_values():
+    cars = [_car(1), _car(2, price=300_000, year=THIS_YEAR - 5, km=50_000)]
+
+    for params in ({"max_budget": 500_000}, {}):
+        unknown = score_cars(cars, params)[0]
+        assert unknown.parts["budget"] == MISSING_PRICE
+        assert unknown.parts["age"] == MISSING
+        assert unknown.parts["mileage"] == MISSING
+        assert not unknown.over_budget
+
+
+@pytest.mark.parametrize("param, col, wanted", [
+    ("fuel_type", "fuel_type", "Diesel"),
+    ("fuel_type", "fuel_type", "ดีเซล"),
+    ("gear_type", "transmission", "อัตโนมัติ"),
+])
+def test_preferences_match_lowercase_canonical_column_values(param, col, wanted):
+    canonical = {"fuel_type": ("diesel", "benzine"), "transmission": ("automatic", "manual")}[col]
+    cars = [_car(1, **{col: canonical[0]}), _car(2, **{col: canonical[1]}), _car(3)]
+    key = {"fuel_type": "fuel", "gear_type": "gear"}[param]
+
+    parts = [s.parts[key] for s in score_cars(cars, {param: wanted})]
+
+    assert parts == [1.0, 0.0, MISSING]
+
+
+def test_unselected_preference_is_not_scored():
+    scored = score_cars([_car(1, fuel_type="diesel")], {})
+    assert "fuel" not in scored[0].parts
+
+
+def test_best_pick_skips_excluded_ids():
+    cars = [
+        _car(1, price=450_000, year=THIS_YEAR - 2, km=20_000),
+        _car(2, price=400_000, year=THIS_YEAR - 8, km=120_000),
+        _car(3, price=700_000, year=THIS_YEAR - 1, km=10_000),
+    ]
+    params = {"max_budget": 500_000}
+    order = [s.car.id for s in rank_scored(cars, params)]
+
+    best, _ = best_pick(cars, params)
+    assert best.id == order[0]
+
+    second, reason = best_pick(cars, params, exclude_ids=[order[0]])
+    assert second.id == order[1]
+    assert "#2 of 3" in reason
+
+    assert best_pick(cars, params, exclude_ids=order) == (None, "")
@@ -0,0 +1,105 @@
+# tests/test_session_cars.py
+# -*- coding: utf-8 -*-
+"""
+Query-count regression: โหลดรถของ session + render การ์ดทุกคันต้องเป็น SELECT เดียวเสมอ ไม่ว่ามีกี่คัน
+(ลืมใส่คอลัมน์ใน CARD_COLUMNS หรือเทมเพลตอ่าน field ใหม่ → lazy load ต่อคัน → N+1 กลับมา)
+
+ต้องมี Postgres จริง (JSONB) ที่ DATABASE_URL — ทุกอย่างรันใน transaction แล้ว rollback
+"""
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("flask_login")
+sa = pytest.importorskip("sqlalchemy")
+jinja2 = pytest.importorskip("jinja2")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db import Base, engine  # noqa: E402
+from app.models import CarCache, SearchSession, SearchSessionCar, User  # noqa: E402
+from app.services.session_cars import page_cars, ranked_cars, session_cars  # noqa: E402
+
+TEMPLATES = Path(__file__).resolve().parents[1] / "app" / "templates"
+
+
+@pytest.fixture
+def conn():
+    try:
+        connection = engine.connect()
+    except sa.exc.OperationalError as e:
+        pytest.skip(f"no database: {e}")
+    tx = connection.begin()
+    Base.metadata.create_all(connection)
+    try:
+        yield connection
+    finally:
+        tx.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def card():
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader(str(TEMPLATES)), autoescape=True)
+    return env.get_template("shop/_car_card.html")
+
+
+def _seed(connection, n: int) -> int:
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as db:
+        user = User(username=f"n1-test-{n}", password_hash="x")
+        db.add(user)
+        db.flush()
+        ss = SearchSession(user_id=user.id, params_json={}, status="done")
+        db.add(ss)
+        db.flush()
+        for i in range(n):
+            car = CarCache(
+                source="kaidee", title=f"Toyota Vios {i}", brand="Toyota", model="Vios",
+                year=2015 + i % 8, price_thb=300000 + i * 1000, mileage_km=50000 + i,
+                province="กรุงเทพมหานคร", url=f"https://example.test/n1/{n}/{i}",
+                image_url=f"https://img.example.test/{i}.jpg",
+                extra={"ประเภทรถ": "เก๋ง", "เชื้อเพลิง": "เบนซิน", "เกียร์": "อัตโนมัติ", "สี": "ขาว"},
+                body_type="sedan", fuel_type="benzine", transmission="automatic", color="white",
+            )
+            db.add(car)
+            db.flush()
+            db.add(SearchSessionCar(session_id=ss.id, car_id=car.id, rank=i + 1))
+        db.commit()
+        return ss.id
+
+
+def _count_statements(connection, fn) -> int:
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", on_execute)
+    try:
+        fn()
+    finally:
+        event.remove(connection, "before_cursor_execute", on_execute)
+    return len(statements)
+
+
+@pytest.mark.parametrize("n", [1, 5, 30])
+@pytest.mark.parametrize("load", [
+    lambda db, sid: [car for _, car in ranked_cars(db, sid)],
+    lambda db, sid: session_cars(db, sid),
+    lambda db, sid: page_cars(db, sid, "price_desc")[0],
+], ids=["ranked_cars", "session_cars", "page_cars"])
+def test_session_cards_render_with_one_query(conn, card, n, load):
+    session_id = _seed(conn, n)
+
+    # session ใหม่ = identity map ว่าง → field ที่ขาดจาก CARD_COLUMNS จะโผล่เป็น SELECT เพิ่ม
+    with Session(bind=conn, join_transaction_mode="create_savepoint") as db:
+        rendered = []
+
+        def run():
+            cars = load(db, session_id)
+            rendered.extend(card.render(c=car) for car in cars)
+
+        assert _count_statements(conn, run) == 1
+        assert len(rendered) == n